@@ -1,338 +1,53 @@
-import streamlit as st
-import pandas as pd
-from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-import json
-
-
-# ============= CORE CLASSES (Same as before) =============
-
-class CourseSystemException(Exception):
-    """Base exception for course system errors."""
-    pass
-
-
-class EnrollmentException(CourseSystemException):
-    """Exception raised for enrollment-related errors."""
-    pass
-
-
-class SectionNotFoundException(CourseSystemException):
-    """Exception raised when a section is not found."""
-    pass
-
-
-class Course:
-    def __init__(self, courseNo: str, courseName: str, credits: int):
-        if not courseNo or not courseName:  # Dùng raise valueError để chặn dữ liệu sai
-            raise ValueError("Course number and course name cannot be empty")
-        if credits <= 0:
-            raise ValueError("Credits cannot be less than zero")
-
-        self.__courseNo = courseNo
-        self.__courseName = courseName
-        self.__credits = credits
-        self.__prerequisites: List['Course'] = []
-        self.__sections: List['Section'] = []
-
-    def scheduleOfSection(self, sectionNo: str, dayOfWeek: str, timeOfDay: str, room: str,
-                          seatingCapacity: int) -> 'Section':
-        if seatingCapacity <= 0:
-            raise ValueError("Seating capacity must be positive")
-
-        section = Section(sectionNo, dayOfWeek, timeOfDay, room, seatingCapacity)
-        section.setCourse(self)
-        self.__sections.append(section)
-        return section
-
-    def addPrerequisites(self, prerequisite: 'Course'):
-        if prerequisite not in self.__prerequisites:
-            self.__prerequisites.append(prerequisite)
-
-    def hasPrerequisites(self) -> bool:
-        return len(self.__prerequisites) > 0
-
-    # getter
-    def getPrerequisites(self) -> List['Course']:
-        return self.__prerequisites.copy()
-
-    def getCourseNo(self) -> str:
-        return self.__courseNo
-
-    def getCourseName(self) -> str:
-        return self.__courseName
-
-    def getCredits(self) -> int:
-        return self.__credits
-
-    def getSections(self) -> List['Section']:  
-        return self.__sections.copy()
-
-    # display dùng str cho streamlit sau này
-    def __str__(self) -> str:
-        return f"{self.__courseNo} - {self.__courseName} ({self.__credits} credits)"  
-
-
-class Section:
-    def __init__(self, sectionNo: str, dayOfWeek: str, timeOfDay: str, room: str, seatingCapacity: int):
-        if not sectionNo or not room:
-            raise ValueError("Section number and room cannot be empty")
-        if seatingCapacity <= 0:
-            raise ValueError("Seating capacity must be positive")
-
-        self.__sectionNo = sectionNo
-        self.__dayOfWeek = dayOfWeek
-        self.__timeOfDay = timeOfDay
-        self.__room = room
-        self.__seatingCapacity = seatingCapacity
-
-        self.__course: Optional['Course'] = None
-        self.__students: List['Student'] = []
-        self.__professor: Optional['Professor'] = None
-
-    def postGrade(self, student: 'Student', grade: str):
-        if student not in self.__students:
-            raise ValueError("Student not in the section")
-        transcript = student.getTranscript()
-        transcript.addEntry(self, grade)
-
-    def confirmSeatAvailability(self) -> bool:
-        return len(self.__students) < self.__seatingCapacity
-
-    def enroll(self, student: 'Student') -> tuple[bool, str]:
-        """Returns (success, message)"""
-        try:
-            if not self.confirmSeatAvailability():
-                return False, "Section is full"
-            if self.__course and self.__course.hasPrerequisites():
-                prerequisites = self.__course.getPrerequisites()
-                transcript = student.getTranscript()
-                for course in prerequisites:
-                    grade = transcript.getGrade(course.getCourseNo())
-                    if grade is None:
-                        return False, f"Missing prerequisite: {course.getCourseNo()}"  
-                    if float(grade) < 5.0:
-                        return False, f"Low grade for prerequisite {course.getCourseNo()}: {grade}" 
-
-            self.__students.append(student)
-            student.attendSection(self)
-            return True, "Enrollment successful"
-
-        except Exception as e:
-            return False, str(e)
-
-    # getter & setter
-    def getSectionNo(self):
-        return self.__sectionNo
-
-    def getDayOfWeek(self):
-        return self.__dayOfWeek
-
-    def getTimeOfDay(self):
-        return self.__timeOfDay
-
-    def getRoom(self):
-        return self.__room
-
-    def getCourse(self):
-        return self.__course
-
-    def getCapacity(self):
-        return self.__seatingCapacity
-
-    def setCourse(self, course):
-        self.__course = course
-
-    def getStudents(self):
-        return self.__students.copy()
-
-    def setProfessor(self, professor):
-        self.__professor = professor
-
-    def getProfessor(self):
-        return self.__professor
-
-    def getEnrolledCount(self) -> int:  
-        return len(self.__students)
-
-    def __str__(self) -> str:
-        course_name = self.__course.getCourseName() if self.__course else "Unknown"
-        return f"{self.__sectionNo} - {course_name}"
-
-
-class Person(ABC):
-    def __init__(self, name: str, ssn: str):
-        if not name or not ssn:
-            raise ValueError("Person name and SSN cannot be empty")
-        self.name = name
-        self.ssn = ssn
+import os
 
-    @abstractmethod
-    def display(self):
-        pass
-
-
-class Student(Person):
-    def __init__(self, name: str, ssn: str, major: str, degree: str):
-        super().__init__(name, ssn)
-        if not major or not degree:
-            raise ValueError("Student name and major and degree cannot be empty")
-        self.__major = major
-        self.__degree = degree
-        self.__sections: List['Section'] = []
-        self.__Transcript = Transcript()
-
-    # getter & seter
-    def getMajor(self) -> str:
-        return self.__major
-
-    def getDegree(self) -> str:
-        return self.__degree
-
-    def getSections(self) -> List['Section']:
-        return self.__sections.copy()
-
-    def setMajor(self, major):
-        self.__major = major
-
-    def setDegree(self, degree):
-        self.__degree = degree
-
-    def getTranscript(self):
-        return self.__Transcript
-
-    def attendSection(self, section: 'Section'):
-        if section not in self.__sections:
-            self.__sections.append(section)
-
-    def dropSection(self, section):
-        if section in self.__sections:
-            self.__sections.remove(section)
-            return True
-        return False
-
-    def display(self):
-        pass
-
-    def __str__(self) -> str:
-        return f"{self.name} ({self.ssn}) - {self.__major}, {self.__degree}"
-
-
-class Professor(Person):
-    def __init__(self, name: str, ssn: str, title: str, department: str):
-        super().__init__(name, ssn)
-        if not title or not department:
-            raise ValueError("Professor name and department cannot be empty")
-        self.__title = title
-        self.__department = department
-        self.__sections: List['Section'] = []
-
-    # getter & setter
-    def getTitle(self):
-        return self.__title
-
-    def setTitle(self, title):
-        self.__title = title
-
-    def getDepartment(self):
-        return self.__department
-
-    def setDepartment(self, department):
-        self.__department = department
-
-    def getSections(self):
-        return self.__sections.copy()
-
-    def agreeToTeach(self, section):
-        if section not in self.__sections:
-            self.__sections.append(section)
-            section.setProfessor(self)
-
-    def display(self) -> None:
-        pass
-
-    def __str__(self) -> str:
-        return f"{self.__title} {self.name} - {self.__department}"
-
-
-class TranscriptEntry:
-    def __init__(self, section: 'Section', grade: str):
-        self.__section = section
-        self.__grade = grade
+import streamlit as st
 
-    # getter & setter
-    def getGrade(self):
-        return self.__grade
+from srs import (DAYS_OF_WEEK, TIMES_OF_DAY, AdmissionController, CourseSystemException, IntegrityAuditor,
+                 SectionScheduler, RegistrationWindow, ScheduleArchive, WebhookDispatcher, sampleRegistry)
 
-    def getSection(self):
-        return self.__section
+# past semesters are written here when a semester is closed
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
 
-    def setGrade(self, grade):
-        self.__grade = grade
 
-    def setSection(self, section):
-        self.__section = section
+def _dataframe(data):
+    # pandas is only loaded by the pages that actually render a table
+    import pandas as pd
+    return pd.DataFrame(data)
 
 
-class Transcript:
-    """Manager a student's academic transcript."""
+def _show_tabs(key, tabs):
+    # Unlike st.tabs, only the selected tab's function runs, so hidden tabs never build
+    # their tables. Each tab function is an st.fragment: its forms and buttons rerun that
+    # tab alone instead of the whole page.
+    selected = st.radio("View", list(tabs), horizontal=True, key=key, label_visibility="collapsed")
+    tabs[selected]()
 
-    def __init__(self):
-        self.__entries: Dict[str, TranscriptEntry] = {}
 
-    def addEntry(self, section, grade: str):
-        entry = TranscriptEntry(section, grade)
-        course = section.getCourse()
-        if course:
-            courseNo = course.getCourseNo()
-            self.__entries[courseNo] = entry
+# ================ STREAMLIT APPLICATION =================
+def initialize_system():
+    if 'registry' not in st.session_state:
+        registry = sampleRegistry()
+        registry.archive = ScheduleArchive(ARCHIVE_DIR)
+        st.session_state.registry = registry
 
-    def getGrade(self, courseNo):
-        te = self.__entries.get(courseNo)
-        if te is None:
-            return None
-        return te.getGrade()
+        # the pages read the registry's dicts directly; every change goes through the registry
+        st.session_state.courses = registry.courses
+        st.session_state.sections = registry.sections
+        st.session_state.students = registry.students
+        st.session_state.professors = registry.professors
+        st.session_state.eligibility = registry.eligibility
 
-    def getEntries(self):
-        return self.__entries.copy()
+    if 'registration_window' not in st.session_state:
+        st.session_state.registration_window = RegistrationWindow()
 
+    if 'auditor' not in st.session_state:
+        st.session_state.auditor = IntegrityAuditor(st.session_state.registry)
 
-# ================ STREAMLIT APPLICATION =================
-def initialize_system():
-    if 'courses' not in st.session_state:
-        st.session_state.courses = {}
-        st.session_state.sections = {}
-        st.session_state.students = {}
-        st.session_state.professors = {}
-
-        # Create sample courses
-        fp = Course("CS101", "Functional Programming", 4)
-        oop = Course("CS201", "Object-Oriented Programming", 4)
-        oop.addPrerequisites(fp)
-
-        # Create sections
-        fp_section = fp.scheduleOfSection("CS101-A", "Monday", "9:00 AM", "Room 101", 30)
-        oop_section1 = oop.scheduleOfSection("CS201-A", "Tuesday", "10:00 AM", "Room 102", 25)
-        oop_section2 = oop.scheduleOfSection("CS201-B", "Wednesday", "2:00 PM", "Room 103", 25)
-
-        # Create professor
-        prof = Professor("Dr. Smith", "P001", "Professor", "Computer Science")
-        prof.agreeToTeach(fp_section)
-        prof.agreeToTeach(oop_section1)
-        prof.agreeToTeach(oop_section2)
-
-        # store in section state
-        st.session_state.courses = {
-            "CS101": fp,
-            "CS201": oop
-        }
-
-        st.session_state.sections = {
-            "CS101-A": fp_section,
-            "CS201-A": oop_section1,
-            "CS201-B": oop_section2
-        }
-        st.session_state.professors = {"P001": prof}
+    if 'admission' not in st.session_state:
+        # enroll requests queue here, and are answered "try again" when the queue cannot meet its target
+        admission = AdmissionController(st.session_state.registry)
+        admission.start()
+        st.session_state.admission = admission
 
 
 # cac ham chuc nang
@@ -352,7 +67,7 @@ def main():
     st.sidebar.title("Navigation")
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["Dashboard", "Student Management", "Course Management", "Enrollment", "Reports"]
+        ["Dashboard", "Student Management", "Course Management", "Professor Management", "Enrollment", "Reports"]
     )
 
     if page == "Dashboard":
@@ -361,6 +76,8 @@ def main():
         show_student_management()
     elif page == "Course Management":
         show_course_management()
+    elif page == "Professor Management":
+        show_professor_management()
     elif page == "Enrollment":
         show_enrollment()
     elif page == "Reports":
@@ -369,6 +86,7 @@ def main():
 
 def show_dashboard():
     st.header("System Dashboard")
+    st.caption(f"Active semester: {st.session_state.registry.schedule.getSemester()}")
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
@@ -395,396 +113,670 @@ def show_dashboard():
                 "Prerequisites": len(course.getPrerequisites())
             })
 
-        df = pd.DataFrame(course_data)
+        df = _dataframe(course_data)
         st.dataframe(df, use_container_width=True)
     else:
         st.info("No courses available.")
 
+    with st.expander("📡 Event Feed"):
+        _event_feed()
+
+    with st.expander("🩺 Integrity Check"):
+        _integrity_check()
+
+    with st.expander("🗓️ Close Semester"):
+        _close_semester()
+
+
+def _close_semester():
+    registry = st.session_state.registry
+    st.warning("⚠️ Closing the semester archives all current sections and rosters and starts an empty schedule. "
+               "Grades stay on the students' transcripts.")
+
+    with st.form("close_semester_form"):
+        new_semester = st.text_input("New semester*")
+        confirm = st.checkbox(f"I want to close {registry.schedule.getSemester()}")
+        submit = st.form_submit_button("Close Semester")
+
+        if submit:
+            if new_semester and confirm:
+                try:
+                    registry.closeSemester(new_semester)
+                    st.success(f"{new_semester} is now the active semester!")
+                    st.rerun()
+                except (CourseSystemException, ValueError) as e:
+                    st.error(str(e))
+            else:
+                st.error("Please enter the new semester and confirm!")
+
+
+@st.fragment
+def _integrity_check():
+    auditor = st.session_state.auditor
+    col1, col2 = st.columns(2)
+    if col1.button("Check Recent Changes"):
+        st.session_state.audit_issues = auditor.auditIncremental()
+    if col2.button("Full Scan"):
+        st.session_state.audit_issues = auditor.auditFull()
+
+    issues = st.session_state.get("audit_issues")
+    if issues is None:
+        return
+    if not issues:
+        st.success("No integrity issues found.")
+        return
+
+    st.dataframe(_dataframe([{"Kind": issue.kind, "Subject": issue.subject, "Problem": issue.message,
+                              "Repairable": issue.canRepair()} for issue in issues]),
+                 use_container_width=True)
+    if st.button("Repair"):
+        repaired = auditor.repair(issues)
+        st.session_state.audit_issues = auditor.auditFull()
+        st.success(f"{repaired} issues repaired.")
+
+
+@st.fragment
+def _event_feed():
+    registry = st.session_state.registry
+    dispatcher = st.session_state.get("dispatcher")
+    st.write(f"Events waiting in the outbox: {len(registry.outbox)}")
+
+    if dispatcher is not None:
+        stats = [{"Endpoint": url, **endpoint_stats} for url, endpoint_stats in dispatcher.getStats().items()]
+        st.dataframe(_dataframe(stats), use_container_width=True)
+        if st.button("Stop Delivery"):
+            dispatcher.stop()
+            del st.session_state.dispatcher
+            st.rerun(scope="fragment")
+    else:
+        endpoints = st.text_area("Webhook endpoints (one URL per line)", key="webhook_endpoints")
+        if st.button("Start Delivery"):
+            urls = [line.strip() for line in endpoints.splitlines() if line.strip()]
+            if urls:
+                dispatcher = WebhookDispatcher(registry.outbox, urls)
+                dispatcher.start(fromSeq=0)
+                st.session_state.dispatcher = dispatcher
+                st.rerun(scope="fragment")
+            else:
+                st.error("Please enter at least one endpoint!")
+
 
 def show_student_management():
     st.header("Student Management")
-    tab1, tab2, tab3 = st.tabs(["Add Student", "View Students", "Delete Student"])
 
-    with tab1:
-        st.subheader("Add New Student")
-        with st.form("add_student_form"):
-            col1, col2 = st.columns(2)
+    _show_tabs("student_page_tab", {
+        "Add Student": _student_add,
+        "View Students": _student_list,
+        "Delete Student": _student_delete,
+    })
 
-            with col1:
-                name = st.text_input("Student Name*")
-                ssn = st.text_input("Student ID*")
 
-            with col2:
-                major = st.text_input("Major*")
-                degree = st.selectbox("Degree", ["BSc", "MSc", "PhD"])
+@st.fragment
+def _student_add():
+    st.subheader("Add New Student")
+    with st.form("add_student_form"):
+        col1, col2 = st.columns(2)
 
-            submit = st.form_submit_button("Add Student")
+        with col1:
+            name = st.text_input("Student Name*")
+            ssn = st.text_input("Student ID*")
 
-            if submit:
-                if name and ssn and major:
-                    try:
-                        if ssn not in st.session_state.students:
-                            student = Student(name, ssn, major, degree)
-                            st.session_state.students[ssn] = student
-                            st.success(f"Student {name} added successfully!")
-                        else:
-                            st.error(f"Student ID {ssn} already exists!")
+        with col2:
+            major = st.text_input("Major*")
+            degree = st.selectbox("Degree", ["BSc", "MSc", "PhD"])
+
+        submit = st.form_submit_button("Add Student")
+
+        if submit:
+            if name and ssn and major:
+                try:
+                    st.session_state.registry.addStudent(name, ssn, major, degree)
+                    st.success(f"Student {name} added successfully!")
+                except CourseSystemException as e:
+                    st.error(str(e))
+                except Exception as e:
+                    st.error(f"Error: {e}")
+            else:
+                st.error("Please fill in all required fields!")
+
+
+@st.fragment
+def _student_list():
+    st.subheader("Current Students")
+    if st.session_state.students:
+        student_data = []
+        for student in st.session_state.students.values():
+            student_data.append({
+                "Name": student.name,
+                "Student ID": student.ssn,
+                "Major": student.getMajor(),
+                "Degree": student.getDegree(),
+                "Enrolled Sections": len(student.getSections())
+            })
+        df = _dataframe(student_data)
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No students registered yet.")
 
-                    except Exception as e:
-                        st.error(f"Error: {e}")
-                else:
-                    st.error("Please fill in all required fields!")
 
-    with tab2:
-        st.subheader("Current Students")
-        if st.session_state.students:
-            student_data = []
-            for student in st.session_state.students.values():
-                student_data.append({
-                    "Name": student.name,
-                    "Student ID": student.ssn,
-                    "Major": student.getMajor(),
-                    "Degree": student.getDegree(),
-                    "Enrolled Sections": len(student.getSections())
-                })
-            df = pd.DataFrame(student_data)
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.info("No students registered yet.")
+@st.fragment
+def _student_delete():
+    st.subheader("Delete Student")
 
-    with tab3:
-        st.subheader("Delete Student")
+    if st.session_state.students:
+        st.warning("⚠️ Warning: Deleting a student will remove them from all enrolled sections!")
 
-        if st.session_state.students:
-            st.warning("⚠️ Warning: Deleting a student will remove them from all enrolled sections!")
+        # Select student to delete
+        student_to_delete = st.selectbox(
+            "Select Student to Delete",
+            options=list(st.session_state.students.keys()),
+            format_func=lambda
+                x: f"{st.session_state.students[x].name} ({x}) - {st.session_state.students[x].getMajor()}",
+            key="delete_student_select"
+        )
 
-            # Select student to delete
-            student_to_delete = st.selectbox(
-                "Select Student to Delete",
-                options=list(st.session_state.students.keys()),
-                format_func=lambda
-                    x: f"{st.session_state.students[x].name} ({x}) - {st.session_state.students[x].getMajor()}",
-                key="delete_student_select"
-            )
+        if student_to_delete:
+            student = st.session_state.students[student_to_delete]
+            enrolled_sections = student.getSections()
 
-            if student_to_delete:
-                student = st.session_state.students[student_to_delete]
-                enrolled_sections = student.getSections()
-
-                # Show student details
-                st.write(f"Student: {student.name}")
-                st.write(f"Student ID: {student.ssn}")
-                st.write(f"Major: {student.getMajor()}")
-                st.write(f"Degree: {student.getDegree()}")
-                st.write(f"Enrolled Sections: {len(enrolled_sections)}")
-
-                # Show enrolled sections
-                if enrolled_sections:
-                    st.write("**Currently Enrolled In:**")
-                    for section in enrolled_sections:
-                        course = section.getCourse()
-                        st.write(f"- {section.getSectionNo()} - {course.getCourseName() if course else 'Unknown'}")
-
-                # Confirmation checkbox
-                confirm_delete = st.checkbox(
-                    f"I understand the consequences and want to delete student {student.name}",
-                    key="confirm_delete_student"
-                )
+            # Show student details
+            st.write(f"Student: {student.name}")
+            st.write(f"Student ID: {student.ssn}")
+            st.write(f"Major: {student.getMajor()}")
+            st.write(f"Degree: {student.getDegree()}")
+            st.write(f"Enrolled Sections: {len(enrolled_sections)}")
 
-                col1, col2 = st.columns([1, 4])
-                with col1:
-                    if st.button("🗑️ Delete Student", type="primary", disabled=not confirm_delete):
-                        try:
-                            # Remove student from all enrolled sections
-                            for section in enrolled_sections:
-                                section_students = section.getStudents()
-                                if student in section_students:
-                                    section._Section__students.remove(student)
+            # Show enrolled sections
+            if enrolled_sections:
+                st.write("**Currently Enrolled In:**")
+                for section in enrolled_sections:
+                    course = section.getCourse()
+                    st.write(f"- {section.getSectionNo()} - {course.getCourseName() if course else 'Unknown'}")
 
-                            # Remove student from session state
-                            del st.session_state.students[student_to_delete]
+            # Confirmation checkbox
+            confirm_delete = st.checkbox(
+                f"I understand the consequences and want to delete student {student.name}",
+                key="confirm_delete_student"
+            )
 
-                            st.success(f"Student {student.name} has been deleted successfully!")
-                            st.rerun()
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                if st.button("🗑️ Delete Student", type="primary", disabled=not confirm_delete):
+                    try:
+                        # Drops the student from all enrolled sections, then removes them
+                        st.session_state.registry.deleteStudent(student_to_delete)
 
-                        except Exception as e:
-                            st.error(f"Error deleting student: {e}")
+                        st.success(f"Student {student.name} has been deleted successfully!")
+                        st.rerun()
 
-                with col2:
-                    if st.button("Cancel", key="cancel_delete_student"):
-                        st.info("Delete operation cancelled.")
-        else:
-            st.info("No students available to delete.")
+                    except Exception as e:
+                        st.error(f"Error deleting student: {e}")
+
+            with col2:
+                if st.button("Cancel", key="cancel_delete_student"):
+                    st.info("Delete operation cancelled.")
+    else:
+        st.info("No students available to delete.")
 
 
 def show_course_management():
     st.header("Course Management")
 
-    tab1, tab2, tab3, tab4 = st.tabs(["Add Course", "View Courses & Sections", "Delete Course", "Delete Section"])
+    _show_tabs("course_page_tab", {
+        "Add Course": _course_add,
+        "View Courses & Sections": _course_list,
+        "Delete Course": _course_delete,
+        "Delete Section": _section_delete,
+        "Auto Schedule": _section_schedule,
+    })
+
+
+@st.fragment
+def _course_add():
+    st.subheader("Add New Course")
+
+    with st.form("add_course_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            courseNo = st.text_input("Course Code*")
+            courseName = st.text_input("Course Name*")
+            credits = st.number_input("Credits", min_value=1, max_value=6, value=3)
+
+        with col2:
+            prerequisites = st.multiselect(
+                "Prerequisites",
+                options=list(st.session_state.courses.keys()),
+                format_func=lambda x: f"{x} - {st.session_state.courses[x].getCourseName()}"
+            )
+
+        submit = st.form_submit_button("Add Course")
+
+        if submit:
+            if courseNo and courseName:
+                try:
+                    st.session_state.registry.addCourse(courseNo, courseName, credits, prerequisites)
+                    st.success(f"Course {courseName} added successfully!")
+                except CourseSystemException as e:
+                    st.error(str(e))
+                except Exception as e:
+                    st.error(f"Error: {e}")
+            else:
+                st.error("Please fill in all required fields!")
 
-    with tab1:
-        st.subheader("Add New Course")
+    st.subheader("Add Section to Course")
 
-        with st.form("add_course_form"):
+    if st.session_state.courses:
+        with st.form("add_section_form"):
             col1, col2 = st.columns(2)
 
             with col1:
-                courseNo = st.text_input("Course Code*")
-                courseName = st.text_input("Course Name*")
-                credits = st.number_input("Credits", min_value=1, max_value=6, value=3)
-
-            with col2:
-                prerequisites = st.multiselect(
-                    "Prerequisites",
+                selected_course = st.selectbox(
+                    "Select Course",
                     options=list(st.session_state.courses.keys()),
                     format_func=lambda x: f"{x} - {st.session_state.courses[x].getCourseName()}"
                 )
+                sectionNo = st.text_input("Section Number*")
+                capacity = st.number_input("Seating Capacity", min_value=1, max_value=100, value=30)
+
+            with col2:
+                day = st.selectbox("Day of Week", DAYS_OF_WEEK)
+                time_of_day = st.selectbox("Time", TIMES_OF_DAY)
+                room = st.text_input("Room*")
 
-            submit = st.form_submit_button("Add Course")
+            submit_section = st.form_submit_button("Add Section")
 
-            if submit:
-                if courseNo and courseName:
+            if submit_section:
+                if sectionNo and room and selected_course:
                     try:
-                        if courseNo not in st.session_state.courses:
-                            course = Course(courseNo, courseName, credits)
-
-                            # Add prerequisites
-                            for prereq_code in prerequisites:
-                                prereq_course = st.session_state.courses[prereq_code]
-                                course.addPrerequisites(prereq_course)
-
-                            st.session_state.courses[courseNo] = course
-                            st.success(f"Course {courseName} added successfully!")
-                        else:
-                            st.error("Course code already exists!")
+                        st.session_state.registry.addSection(selected_course, sectionNo, day, time_of_day,
+                                                             room, capacity)
+                        st.success(f"Section {sectionNo} added successfully!")
+                    except CourseSystemException as e:
+                        st.error(str(e))
                     except Exception as e:
                         st.error(f"Error: {e}")
                 else:
                     st.error("Please fill in all required fields!")
 
-        st.subheader("Add Section to Course")
 
-        if st.session_state.courses:
-            with st.form("add_section_form"):
-                col1, col2 = st.columns(2)
+@st.fragment
+def _course_list():
+    st.subheader("Course and Section Details")
+
+    if st.session_state.sections:
+        section_data = []
+        for section in st.session_state.sections.values():
+            course = section.getCourse()
+            professor = section.getProfessor()
+
+            section_data.append({
+                "Section": section.getSectionNo(),
+                "Course": f"{course.getCourseNo()} - {course.getCourseName()}" if course else "Unknown",
+                "Day": section.getDayOfWeek(),
+                "Time": section.getTimeOfDay(),
+                "Room": section.getRoom(),
+                "Capacity": section.getCapacity(),
+                "Enrolled": section.getEnrolledCount(),
+                "Available": section.getCapacity() - section.getEnrolledCount(),
+                "Professor": professor.name if professor else "Not Assigned"
+            })
 
-                with col1:
-                    selected_course = st.selectbox(
-                        "Select Course",
-                        options=list(st.session_state.courses.keys()),
-                        format_func=lambda x: f"{x} - {st.session_state.courses[x].getCourseName()}"
-                    )
-                    sectionNo = st.text_input("Section Number*")
-                    capacity = st.number_input("Seating Capacity", min_value=1, max_value=100, value=30)
+        df = _dataframe(section_data)
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No sections available yet.")
 
-                with col2:
-                    day = st.selectbox("Day of Week",
-                                       ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
-                    time = st.selectbox("Time",
-                                        ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM",
-                                         "1:00 PM", "2:00 PM", "3:00 PM", "4:00 PM"])
-                    room = st.text_input("Room*")
 
-                submit_section = st.form_submit_button("Add Section")
+@st.fragment
+def _course_delete():
+    st.subheader("Delete Course")
 
-                if submit_section:
-                    if sectionNo and room and selected_course:
-                        try:
-                            if sectionNo not in st.session_state.sections:
-                                course = st.session_state.courses[selected_course]
-                                section = course.scheduleOfSection(sectionNo, day, time, room, capacity)
-                                st.session_state.sections[sectionNo] = section
-                                st.success(f"Section {sectionNo} added successfully!")
-                            else:
-                                st.error("Section number already exists!")
-                        except Exception as e:
-                            st.error(f"Error: {e}")
-                    else:
-                        st.error("Please fill in all required fields!")
+    if st.session_state.courses:
+        st.warning(
+            "⚠️ Warning: Deleting a course will also remove all its sections and may affect student enrollments!")
+
+        # Select course to delete
+        course_to_delete = st.selectbox(
+            "Select Course to Delete",
+            options=list(st.session_state.courses.keys()),
+            format_func=lambda x: f"{x} - {st.session_state.courses[x].getCourseName()}",
+            key="delete_course_select"
+        )
+
+        if course_to_delete:
+            course = st.session_state.courses[course_to_delete]
+            sections = course.getSections()
+
+            # Show course details
+            st.write(f"**Course:** {course.getCourseNo()} - {course.getCourseName()}")
+            st.write(f"**Credits:** {course.getCredits()}")
+            st.write(f"**Sections:** {len(sections)}")
+
+            # Check if course is a prerequisite for other courses
+            dependent_courses = []
+            for other_course_code, other_course in st.session_state.courses.items():
+                if other_course_code != course_to_delete:
+                    prerequisites = other_course.getPrerequisites()
+                    if course in prerequisites:
+                        dependent_courses.append(other_course_code)
+
+            if dependent_courses:
+                st.error(f"⚠️ Cannot delete this course! It is a prerequisite for: {', '.join(dependent_courses)}")
+                st.info("Please remove this course as a prerequisite from other courses first.")
+                can_delete = False
+            else:
+                can_delete = True
 
-    with tab2:
-        st.subheader("Course and Section Details")
+                # Show affected students if any
+                affected_students = []
+                for section in sections:
+                    students = section.getStudents()
+                    for student in students:
+                        if student.ssn not in [s.ssn for s in affected_students]:
+                            affected_students.append(student)
 
-        if st.session_state.sections:
-            section_data = []
-            for section in st.session_state.sections.values():
-                course = section.getCourse()
-                professor = section.getProfessor()
+                if affected_students:
+                    st.warning(f"This will affect {len(affected_students)} enrolled students:")
+                    for student in affected_students:
+                        st.write(f"- {student.name} ({student.ssn})")
 
-                section_data.append({
-                    "Section": section.getSectionNo(),
-                    "Course": f"{course.getCourseNo()} - {course.getCourseName()}" if course else "Unknown",
-                    "Day": section.getDayOfWeek(),
-                    "Time": section.getTimeOfDay(),
-                    "Room": section.getRoom(),
-                    "Capacity": section.getCapacity(),
-                    "Enrolled": section.getEnrolledCount(),
-                    "Available": section.getCapacity() - section.getEnrolledCount(),
-                    "Professor": professor.name if professor else "Not Assigned"
-                })
+            # Confirmation checkbox
+            if can_delete:
+                confirm_delete = st.checkbox(
+                    f"I understand the consequences and want to delete {course_to_delete}",
+                    key="confirm_delete_course"
+                )
 
-            df = pd.DataFrame(section_data)
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.info("No sections available yet.")
+                col1, col2 = st.columns([1, 4])
+                with col1:
+                    if st.button("🗑️ Delete Course", type="primary", disabled=not confirm_delete):
+                        try:
+                            # Deletes every section (dropping its students) and then the course
+                            st.session_state.registry.deleteCourse(course_to_delete)
 
-    with tab3:
-        st.subheader("Delete Course")
+                            st.success(
+                                f"Course {course_to_delete} and all its sections have been deleted successfully!")
+                            st.rerun()
 
-        if st.session_state.courses:
-            st.warning(
-                "⚠️ Warning: Deleting a course will also remove all its sections and may affect student enrollments!")
+                        except Exception as e:
+                            st.error(f"Error deleting course: {e}")
 
-            # Select course to delete
-            course_to_delete = st.selectbox(
-                "Select Course to Delete",
-                options=list(st.session_state.courses.keys()),
-                format_func=lambda x: f"{x} - {st.session_state.courses[x].getCourseName()}",
-                key="delete_course_select"
+                with col2:
+                    if st.button("Cancel", key="cancel_delete_course"):
+                        st.info("Delete operation cancelled.")
+    else:
+        st.info("No courses available to delete.")
+
+
+@st.fragment
+def _section_delete():
+    st.subheader("Delete Section")
+
+    if st.session_state.sections:
+        st.warning("⚠️ Warning: Deleting a section will remove all enrolled students from it!")
+
+        # Select section to delete
+        section_to_delete = st.selectbox(
+            "Select Section to Delete",
+            options=list(st.session_state.sections.keys()),
+            format_func=lambda
+                x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName() if st.session_state.sections[x].getCourse() else 'Unknown'}",
+            key="delete_section_select"
+        )
+
+        if section_to_delete:
+            section = st.session_state.sections[section_to_delete]
+            course = section.getCourse()
+            students = section.getStudents()
+
+            # Show section details
+            st.write(f"**Section:** {section.getSectionNo()}")
+            st.write(f"**Course:** {course.getCourseName() if course else 'Unknown'}")
+            st.write(f"**Schedule:** {section.getDayOfWeek()} {section.getTimeOfDay()}")
+            st.write(f"**Room:** {section.getRoom()}")
+            st.write(f"**Enrolled Students:** {len(students)}")
+
+            # Show enrolled students
+            if students:
+                st.write("**Students to be removed:**")
+                for student in students:
+                    st.write(f"- {student.name} ({student.ssn})")
+
+            # Confirmation checkbox
+            confirm_delete = st.checkbox(
+                f"I understand the consequences and want to delete section {section.getSectionNo()}",
+                key="confirm_delete_section"
             )
 
-            if course_to_delete:
-                course = st.session_state.courses[course_to_delete]
-                sections = course.getSections()
-
-                # Show course details
-                st.write(f"**Course:** {course.getCourseNo()} - {course.getCourseName()}")
-                st.write(f"**Credits:** {course.getCredits()}")
-                st.write(f"**Sections:** {len(sections)}")
-
-                # Check if course is a prerequisite for other courses
-                dependent_courses = []
-                for other_course_code, other_course in st.session_state.courses.items():
-                    if other_course_code != course_to_delete:
-                        prerequisites = other_course.getPrerequisites()
-                        if course in prerequisites:
-                            dependent_courses.append(other_course_code)
-
-                if dependent_courses:
-                    st.error(f"⚠️ Cannot delete this course! It is a prerequisite for: {', '.join(dependent_courses)}")
-                    st.info("Please remove this course as a prerequisite from other courses first.")
-                    can_delete = False
-                else:
-                    can_delete = True
-
-                    # Show affected students if any
-                    affected_students = []
-                    for section in sections:
-                        students = section.getStudents()
-                        for student in students:
-                            if student.ssn not in [s.ssn for s in affected_students]:
-                                affected_students.append(student)
-
-                    if affected_students:
-                        st.warning(f"This will affect {len(affected_students)} enrolled students:")
-                        for student in affected_students:
-                            st.write(f"- {student.name} ({student.ssn})")
-
-                # Confirmation checkbox
-                if can_delete:
-                    confirm_delete = st.checkbox(
-                        f"I understand the consequences and want to delete {course_to_delete}",
-                        key="confirm_delete_course"
-                    )
-
-                    col1, col2 = st.columns([1, 4])
-                    with col1:
-                        if st.button("🗑️ Delete Course", type="primary", disabled=not confirm_delete):
-                            try:
-                                # Remove students from sections and update their records
-                                for section in sections:
-                                    students_to_remove = section.getStudents().copy()
-                                    for student in students_to_remove:
-                                        student.dropSection(section)
-
-                                # Remove sections from session state
-                                sections_to_remove = [s.getSectionNo() for s in sections]
-                                for section_no in sections_to_remove:
-                                    if section_no in st.session_state.sections:
-                                        del st.session_state.sections[section_no]
-
-                                # Remove course from session state
-                                del st.session_state.courses[course_to_delete]
-
-                                st.success(
-                                    f"Course {course_to_delete} and all its sections have been deleted successfully!")
-                                st.rerun()
-
-                            except Exception as e:
-                                st.error(f"Error deleting course: {e}")
-
-                    with col2:
-                        if st.button("Cancel", key="cancel_delete_course"):
-                            st.info("Delete operation cancelled.")
-        else:
-            st.info("No courses available to delete.")
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                if st.button("🗑️ Delete Section", type="primary", disabled=not confirm_delete):
+                    try:
+                        # Drops its students and detaches it from the course
+                        st.session_state.registry.deleteSection(section_to_delete)
 
-    with tab4:
-        st.subheader("Delete Section")
+                        st.success(f"Section {section.getSectionNo()} has been deleted successfully!")
+                        st.rerun()
 
-        if st.session_state.sections:
-            st.warning("⚠️ Warning: Deleting a section will remove all enrolled students from it!")
+                    except Exception as e:
+                        st.error(f"Error deleting section: {e}")
 
-            # Select section to delete
-            section_to_delete = st.selectbox(
-                "Select Section to Delete",
-                options=list(st.session_state.sections.keys()),
-                format_func=lambda
-                    x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName() if st.session_state.sections[x].getCourse() else 'Unknown'}",
-                key="delete_section_select"
+            with col2:
+                if st.button("Cancel", key="cancel_delete_section"):
+                    st.info("Delete operation cancelled.")
+    else:
+        st.info("No sections available to delete.")
+
+
+@st.fragment
+def _section_schedule():
+    st.subheader("Automatic Section Scheduling")
+
+    if st.session_state.sections:
+        # Default room list: every room in use, sized by its largest section
+        default_rooms = {}
+        for section in st.session_state.sections.values():
+            room = section.getRoom()
+            default_rooms[room] = max(default_rooms.get(room, 0), section.getCapacity())
+
+        with st.form("auto_schedule_form"):
+            rooms_text = st.text_area(
+                "Rooms (one per line, `Room: capacity`)",
+                value="\n".join(f"{room}: {capacity}" for room, capacity in default_rooms.items())
+            )
+            to_schedule = st.multiselect(
+                "Sections to (re)schedule - leave empty for all",
+                options=list(st.session_state.sections.keys())
             )
+            time_budget = st.number_input("Time budget (seconds)", min_value=0.1, max_value=60.0, value=2.0)
+            avoid_student_clashes = st.checkbox("Keep sections that share students in different timeslots")
+
+            submit_schedule = st.form_submit_button("Run Scheduler")
+
+            if submit_schedule:
+                try:
+                    rooms = {}
+                    for line in rooms_text.splitlines():
+                        if line.strip():
+                            room, capacity = line.rsplit(":", 1)
+                            rooms[room.strip()] = int(capacity)
+
+                    all_sections = list(st.session_state.sections.values())
+                    if to_schedule:
+                        movable = [st.session_state.sections[x] for x in to_schedule]
+                        fixed = [s for s in all_sections if s.getSectionNo() not in to_schedule]
+                    else:
+                        movable, fixed = all_sections, []
+
+                    conflicts = None
+                    if avoid_student_clashes:
+                        conflicts = st.session_state.registry.enrollment.conflictGraph()
+
+                    scheduler = SectionScheduler(rooms)
+                    placements, unplaced = scheduler.solve(movable, fixed, timeBudget=time_budget,
+                                                           conflicts=conflicts)
+                    st.session_state.registry.applySchedule(placements)
+
+                    st.success(f"Scheduled {len(placements)} sections without clashes.")
+                    if unplaced:
+                        st.error(f"Could not place without clashes: {', '.join(unplaced)}")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+    else:
+        st.info("No sections available to schedule.")
 
-            if section_to_delete:
-                section = st.session_state.sections[section_to_delete]
-                course = section.getCourse()
-                students = section.getStudents()
 
-                # Show section details
-                st.write(f"**Section:** {section.getSectionNo()}")
-                st.write(f"**Course:** {course.getCourseName() if course else 'Unknown'}")
-                st.write(f"**Schedule:** {section.getDayOfWeek()} {section.getTimeOfDay()}")
-                st.write(f"**Room:** {section.getRoom()}")
-                st.write(f"**Enrolled Students:** {len(students)}")
+def show_professor_management():
+    st.header("Professor Management")
 
-                # Show enrolled students
-                if students:
-                    st.write("**Students to be removed:**")
-                    for student in students:
-                        st.write(f"- {student.name} ({student.ssn})")
+    _show_tabs("professor_page_tab", {
+        "Add Professor": _professor_add,
+        "Assign Sections": _professor_assign,
+        "Teaching Load": _professor_load,
+        "Departments": _professor_departments,
+    })
 
-                # Confirmation checkbox
-                confirm_delete = st.checkbox(
-                    f"I understand the consequences and want to delete section {section.getSectionNo()}",
-                    key="confirm_delete_section"
-                )
 
-                col1, col2 = st.columns([1, 4])
-                with col1:
-                    if st.button("🗑️ Delete Section", type="primary", disabled=not confirm_delete):
-                        try:
-                            # Remove students from section
-                            students_to_remove = students.copy()
-                            for student in students_to_remove:
-                                student.dropSection(section)
+@st.fragment
+def _professor_add():
+    registry = st.session_state.registry
+    st.subheader("Add New Professor")
+    with st.form("add_professor_form"):
+        col1, col2 = st.columns(2)
 
-                            # Remove section from course
-                            if course:
-                                course._Course__sections.remove(section)
+        with col1:
+            name = st.text_input("Professor Name*")
+            ssn = st.text_input("Professor ID*")
 
-                            # Remove section from session state
-                            del st.session_state.sections[section_to_delete]
+        with col2:
+            title = st.selectbox("Title", ["Lecturer", "Assistant Professor", "Associate Professor", "Professor"])
+            department = st.text_input("Department*")
+
+        submit = st.form_submit_button("Add Professor")
+
+        if submit:
+            if name and ssn and department:
+                try:
+                    registry.addProfessor(name, ssn, title, department)
+                    st.success(f"Professor {name} added successfully!")
+                except CourseSystemException as e:
+                    st.error(str(e))
+                except Exception as e:
+                    st.error(f"Error: {e}")
+            else:
+                st.error("Please fill in all required fields!")
 
-                            st.success(f"Section {section.getSectionNo()} has been deleted successfully!")
-                            st.rerun()
 
-                        except Exception as e:
-                            st.error(f"Error deleting section: {e}")
+@st.fragment
+def _professor_assign():
+    registry = st.session_state.registry
+    teaching = registry.teaching
+    st.subheader("Assign Professor to Section")
 
-                with col2:
-                    if st.button("Cancel", key="cancel_delete_section"):
-                        st.info("Delete operation cancelled.")
+    if st.session_state.professors and st.session_state.sections:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            selected_professor = st.selectbox(
+                "Select Professor",
+                options=list(st.session_state.professors.keys()),
+                format_func=lambda x: str(st.session_state.professors[x]),
+                key="assign_professor"
+            )
+
+        with col2:
+            selected_section = st.selectbox(
+                "Select Section",
+                options=list(st.session_state.sections.keys()),
+                format_func=lambda x: str(st.session_state.sections[x]),
+                key="assign_section"
+            )
+
+        if st.button("Assign"):
+            registry.assignProfessor(selected_professor, selected_section)
+            st.success(f"{st.session_state.professors[selected_professor].name} now teaches {selected_section}!")
+
+        unstaffed = teaching.unstaffedSections()
+        st.subheader(f"Unstaffed Sections ({len(unstaffed)})")
+        if unstaffed:
+            st.dataframe(_dataframe([{
+                "Section": section.getSectionNo(),
+                "Course": section.getCourse().getCourseName() if section.getCourse() else "Unknown",
+                "Day": section.getDayOfWeek(),
+                "Time": section.getTimeOfDay()
+            } for section in unstaffed]), use_container_width=True)
         else:
-            st.info("No sections available to delete.")
+            st.info("Every section has a professor.")
+    else:
+        st.info("Add professors and sections first.")
+
+
+@st.fragment
+def _professor_load():
+    registry = st.session_state.registry
+    teaching = registry.teaching
+    st.subheader("Teaching Load")
+
+    if st.session_state.professors:
+        load_data = []
+        for ssn, (section_count, credits) in teaching.teachingLoads().items():
+            professor = st.session_state.professors[ssn]
+            load_data.append({
+                "Professor": f"{professor.getTitle()} {professor.name} ({ssn})",
+                "Department": professor.getDepartment(),
+                "Sections": section_count,
+                "Credits": credits
+            })
+        st.dataframe(_dataframe(load_data), use_container_width=True)
+
+        selected_professor_load = st.selectbox(
+            "Sections taught by",
+            options=list(st.session_state.professors.keys()),
+            format_func=lambda x: str(st.session_state.professors[x]),
+            key="load_professor"
+        )
+        professor = st.session_state.professors[selected_professor_load]
+        for section in teaching.sectionsOfProfessor(professor):
+            st.write(f"- {section} ({section.getDayOfWeek()} {section.getTimeOfDay()}, {section.getRoom()})")
+
+        # Confirmation checkbox
+        confirm_delete = st.checkbox(
+            f"I understand the consequences and want to delete professor {professor.name}",
+            key="confirm_delete_professor"
+        )
+
+        if st.button("🗑️ Delete Professor", key="delete_professor", type="primary", disabled=not confirm_delete):
+            try:
+                # Unassigns them from their sections, then removes them
+                registry.deleteProfessor(selected_professor_load)
+
+                st.success(f"Professor {professor.name} has been deleted; their sections are now unstaffed.")
+                st.rerun()
+
+            except Exception as e:
+                st.error(f"Error deleting professor: {e}")
+    else:
+        st.info("No professors available.")
+
+
+@st.fragment
+def _professor_departments():
+    teaching = st.session_state.registry.teaching
+    st.subheader("Sections by Department")
+
+    departments = teaching.departments()
+    if departments:
+        selected_department = st.selectbox("Department", options=departments)
+        st.dataframe(_dataframe([{
+            "Section": section.getSectionNo(),
+            "Course": section.getCourse().getCourseName() if section.getCourse() else "Unknown",
+            "Professor": section.getProfessor().name,
+            "Enrolled": section.getEnrolledCount(),
+            "Capacity": section.getCapacity()
+        } for section in teaching.sectionsOfDepartment(selected_department)]), use_container_width=True)
+    else:
+        st.info("No sections are assigned to a department yet.")
 
 
 def show_enrollment():
@@ -798,249 +790,387 @@ def show_enrollment():
         st.warning("No sections available. Please add sections first.")
         return
 
-    tab1, tab2, tab3 = st.tabs(["Enroll Student", "Post Grades", "Drop Section"])
+    _show_tabs("enrollment_page_tab", {
+        "Enroll Student": _enrollment_enroll,
+        "Post Grades": _enrollment_grades,
+        "Drop Section": _enrollment_drop,
+        "Registration Window": _enrollment_window,
+        "Registration Cart": _enrollment_cart,
+    })
 
-    with tab1:
-        st.subheader("Enroll Student in Section")
 
-        col1, col2 = st.columns(2)
+@st.fragment
+def _enrollment_enroll():
+    st.subheader("Enroll Student in Section")
 
-        with col1:
-            selected_student = st.selectbox(
-                "Select Student",
-                options=list(st.session_state.students.keys()),
-                format_func=lambda x: f"{st.session_state.students[x].name} ({x})"
-            )
+    col1, col2 = st.columns(2)
 
-        with col2:
-            available_sections = []
-            for section_no, section in st.session_state.sections.items():
-                if section.confirmSeatAvailability():
-                    course = section.getCourse()
+    with col1:
+        selected_student = st.selectbox(
+            "Select Student",
+            options=list(st.session_state.students.keys()),
+            format_func=lambda x: f"{st.session_state.students[x].name} ({x})"
+        )
+
+    with col2:
+        student = st.session_state.students[selected_student]
+        eligibility = st.session_state.eligibility
+
+        # Only offer sections with free seats whose prerequisites the student meets
+        available_sections = []
+        for section_no, section in st.session_state.sections.items():
+            if section.confirmSeatAvailability():
+                course = section.getCourse()
+                if course is None or eligibility.isEligible(student, course):
                     available_sections.append(section_no)
 
-            if available_sections:
-                selected_section = st.selectbox(
-                    "Select Section",
-                    options=available_sections,
-                    format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}"
-                )
-            else:
-                st.error("No sections with available seats!")
-                selected_section = None
+        if available_sections:
+            selected_section = st.selectbox(
+                "Select Section",
+                options=available_sections,
+                format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}"
+            )
+        else:
+            st.error("No sections with available seats that this student is eligible for!")
+            selected_section = None
 
-        if st.button("Enroll Student", disabled=not selected_section):
-            student = st.session_state.students[selected_student]
-            section = st.session_state.sections[selected_section]
+    if st.button("Enroll Student", disabled=not selected_section):
+        _show_ticket(st.session_state.admission.submit(selected_student, selected_section))
 
-            success, message = section.enroll(student)
 
-            if success:
-                st.success(message)
-            else:
-                st.error(message)
+def _show_ticket(ticket):
+    """Waits briefly for an admission ticket; one still queued is shown as pending, not as a failure."""
+    ticket.wait(timeout=5)
+    if not ticket.isDone():
+        st.info("The request is queued and will be processed shortly. Check back in a moment.")
+        return
+    success, message = ticket.wait()
+    if success:
+        st.success(message)
+    else:
+        st.error(message)
 
-    with tab2:
-        st.subheader("Post Grades")
 
-        col1, col2, col3 = st.columns(3)
+@st.fragment
+def _enrollment_grades():
+    st.subheader("Post Grades")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        selected_student_grade = st.selectbox(
+            "Select Student",
+            options=list(st.session_state.students.keys()),
+            format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
+            key="grade_student"
+        )
+
+    with col2:
+        student = st.session_state.students[selected_student_grade]
+        enrolled_sections = [s.getSectionNo() for s in student.getSections()]
+
+        if enrolled_sections:
+            selected_section_grade = st.selectbox(
+                "Select Section",
+                options=enrolled_sections,
+                format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}",
+                key="grade_section"
+            )
+        else:
+            st.info("Student is not enrolled in any sections.")
+            selected_section_grade = None
+
+    with col3:
+        grade = st.number_input("Grade", min_value=0.0, max_value=10.0, step=0.1, value=5.0)
+
+    if st.button("Post Grade", disabled=not selected_section_grade):
+        st.session_state.registry.postGrade(selected_student_grade, selected_section_grade, str(grade))
+        st.success(f"Grade {grade} posted for {student.name}!")
+
+
+@st.fragment
+def _enrollment_drop():
+    st.subheader("Drop Section")
+
+    if st.session_state.students:
+        col1, col2 = st.columns(2)
 
         with col1:
-            selected_student_grade = st.selectbox(
+            selected_student_drop = st.selectbox(
                 "Select Student",
                 options=list(st.session_state.students.keys()),
                 format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
-                key="grade_student"
+                key="drop_student"
             )
 
         with col2:
-            student = st.session_state.students[selected_student_grade]
-            enrolled_sections = [s.getSectionNo() for s in student.getSections()]
+            student = st.session_state.students[selected_student_drop]
+            enrolled_sections = student.getSections()
 
             if enrolled_sections:
-                selected_section_grade = st.selectbox(
-                    "Select Section",
-                    options=enrolled_sections,
+                section_options = [s.getSectionNo() for s in enrolled_sections]
+                selected_section_drop = st.selectbox(
+                    "Select Section to Drop",
+                    options=section_options,
                     format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}",
-                    key="grade_section"
+                    key="drop_section"
                 )
             else:
                 st.info("Student is not enrolled in any sections.")
-                selected_section_grade = None
+                selected_section_drop = None
 
-        with col3:
-            grade = st.number_input("Grade", min_value=0.0, max_value=10.0, step=0.1, value=5.0)
+        if st.button("Drop Section", disabled=not selected_section_drop):
+            section = st.session_state.sections[selected_section_drop]
 
-        if st.button("Post Grade", disabled=not selected_section_grade):
-            section = st.session_state.sections[selected_section_grade]
-            section.postGrade(student, str(grade))
-            st.success(f"Grade {grade} posted for {student.name}!")
+            # Remove student from section and section from student
+            st.session_state.registry.drop(selected_student_drop, selected_section_drop)
 
-    with tab3:
-        st.subheader("Drop Section")
+            st.success(f"{student.name} has been dropped from {section.getSectionNo()}!")
+    else:
+        st.info("No students available.")
+
+
+@st.fragment
+def _enrollment_window():
+    st.subheader("Registration Window")
+    window = st.session_state.registration_window
+
+    with st.form("submit_preferences_form"):
+        selected_student_pref = st.selectbox(
+            "Select Student",
+            options=list(st.session_state.students.keys()),
+            format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
+            key="preference_student"
+        )
+        ranked_sections = st.multiselect(
+            "Section preferences (in order of preference)",
+            options=list(st.session_state.sections.keys()),
+            format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}",
+            key="preference_sections"
+        )
+
+        submit_preferences = st.form_submit_button("Submit Preferences")
+
+        if submit_preferences:
+            try:
+                student = st.session_state.students[selected_student_pref]
+                window.submitPreferences(student, [st.session_state.sections[x] for x in ranked_sections])
+                st.success(f"Preferences queued for {student.name}!")
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+    if len(window):
+        queue_data = []
+        for ssn, sections in window.getPreferences().items():
+            queue_data.append({
+                "Student": f"{st.session_state.students[ssn].name} ({ssn})",
+                "Preferences": ", ".join(s.getSectionNo() for s in sections)
+            })
+        st.dataframe(_dataframe(queue_data), use_container_width=True)
 
-        if st.session_state.students:
-            col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
+        with col1:
+            lottery_seed = st.number_input("Lottery seed", min_value=0, value=0, step=1)
+        with col2:
+            by_degree = st.checkbox("Priority by degree (PhD > MSc > BSc)")
 
-            with col1:
-                selected_student_drop = st.selectbox(
-                    "Select Student",
-                    options=list(st.session_state.students.keys()),
-                    format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
-                    key="drop_student"
-                )
+        if st.button("Run Allocation", type="primary"):
+            degree_rank = {"PhD": 2, "MSc": 1, "BSc": 0}
+            priority = (lambda s: degree_rank.get(s.getDegree(), 0)) if by_degree else None
+            _show_ticket(st.session_state.admission.submitAllocation(window, seed=int(lottery_seed),
+                                                                     priority=priority))
+    else:
+        st.info("No preferences submitted yet.")
 
-            with col2:
-                student = st.session_state.students[selected_student_drop]
-                enrolled_sections = student.getSections()
-
-                if enrolled_sections:
-                    section_options = [s.getSectionNo() for s in enrolled_sections]
-                    selected_section_drop = st.selectbox(
-                        "Select Section to Drop",
-                        options=section_options,
-                        format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()}",
-                        key="drop_section"
-                    )
-                else:
-                    st.info("Student is not enrolled in any sections.")
-                    selected_section_drop = None
 
-            if st.button("Drop Section", disabled=not selected_section_drop):
-                section = st.session_state.sections[selected_section_drop]
+@st.fragment
+def _enrollment_cart():
+    st.subheader("Enroll in Several Sections at Once")
+    st.caption("The student is enrolled in all selected sections, or in none of them.")
 
-                # Remove student from section
-                section._Section__students.remove(student)
-                # Remove section from student
-                student.dropSection(section)
+    with st.form("registration_cart_form"):
+        selected_student_cart = st.selectbox(
+            "Select Student",
+            options=list(st.session_state.students.keys()),
+            format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
+            key="cart_student"
+        )
+        cart_sections = st.multiselect(
+            "Sections",
+            options=list(st.session_state.sections.keys()),
+            format_func=lambda x: f"{x} - {st.session_state.sections[x].getCourse().getCourseName()} "
+                                  f"({st.session_state.sections[x].getDayOfWeek()} "
+                                  f"{st.session_state.sections[x].getTimeOfDay()})",
+            key="cart_sections"
+        )
 
-                st.success(f"{student.name} has been dropped from {section.getSectionNo()}!")
-        else:
-            st.info("No students available.")
+        submit_cart = st.form_submit_button("Enroll in All")
+
+        if submit_cart:
+            _show_ticket(st.session_state.admission.submitCart(selected_student_cart, cart_sections))
 
 
 def show_reports():
     st.header("Reports & Analytics")
 
-    tab1, tab2, tab3 = st.tabs(["Student Transcripts", "Section Enrollment", "Course Statistics"])
+    _show_tabs("reports_page_tab", {
+        "Student Transcripts": _report_transcripts,
+        "Section Enrollment": _report_sections,
+        "Course Statistics": _report_courses,
+        "Past Semesters": _report_archive,
+    })
 
-    with tab1:
-        st.subheader("Student Transcripts")
 
-        if st.session_state.students:
-            selected_student = st.selectbox(
-                "Select Student",
-                options=list(st.session_state.students.keys()),
-                format_func=lambda x: f"{st.session_state.students[x].name} ({x})",
-                key="transcript_student"
-            )
+@st.fragment
+def _report_transcripts():
+    st.subheader("Student Transcripts")
+    snapshot = st.session_state.registry.snapshot()
 
-            student = st.session_state.students[selected_student]
+    if snapshot.students:
+        selected_student = st.selectbox(
+            "Select Student",
+            options=list(snapshot.students.keys()),
+            format_func=lambda x: f"{snapshot.students[x].name} ({x})",
+            key="transcript_student"
+        )
 
-            st.write(f"**Student:** {student.name}")
-            st.write(f"**Student ID:** {student.ssn}")
-            st.write(f"**Major:** {student.getMajor()}")
-            st.write(f"**Degree:** {student.getDegree()}")
+        student = snapshot.students[selected_student]
 
-            st.subheader("Academic Record")
+        st.write(f"**Student:** {student.name}")
+        st.write(f"**Student ID:** {student.ssn}")
+        st.write(f"**Major:** {student.getMajor()}")
+        st.write(f"**Degree:** {student.getDegree()}")
 
-            transcript = student.getTranscript()
-            entries = transcript.getEntries()
+        st.subheader("Academic Record")
 
-            if entries:
-                transcript_data = []
-                for course_no, entry in entries.items():
-                    section = entry.getSection()
-                    course = section.getCourse()
+        entries = student.getEntries()
+
+        if entries:
+            transcript_data = []
+            for course_no, entry in entries.items():
+                section = entry.getSection()
+                course = section.getCourse()
 
-                    transcript_data.append({
-                        "Course Code": course_no,
-                        "Course Name": course.getCourseName() if course else "Unknown",
-                        "Section": section.getSectionNo(),
-                        "Credits": course.getCredits() if course else 0,
-                        "Grade": entry.getGrade()
-                    })
+                transcript_data.append({
+                    "Course Code": course_no,
+                    "Course Name": course.getCourseName() if course else "Unknown",
+                    "Section": section.getSectionNo(),
+                    "Credits": course.getCredits() if course else 0,
+                    "Grade": entry.getGrade()
+                })
 
-                df = pd.DataFrame(transcript_data)
-                st.dataframe(df, use_container_width=True)
+            df = _dataframe(transcript_data)
+            st.dataframe(df, use_container_width=True)
 
-                # Calculate GPA
-                total_points = sum(float(row["Grade"]) * row["Credits"] for _, row in df.iterrows())
-                total_credits = sum(row["Credits"] for _, row in df.iterrows())
-                gpa = total_points / total_credits if total_credits > 0 else 0
+            # Calculate GPA
+            total_points = sum(float(row["Grade"]) * row["Credits"] for row in transcript_data)
+            total_credits = sum(row["Credits"] for row in transcript_data)
+            gpa = total_points / total_credits if total_credits > 0 else 0
 
-                st.metric("GPA", f"{gpa:.2f}")
-            else:
-                st.info("No grades recorded yet.")
+            st.metric("GPA", f"{gpa:.2f}")
         else:
-            st.info("No students available.")
+            st.info("No grades recorded yet.")
+    else:
+        st.info("No students available.")
 
-    with tab2:
-        st.subheader("Section Enrollment Details")
 
-        if st.session_state.sections:
-            for section_no, section in st.session_state.sections.items():
-                with st.expander(f"Section {section_no}"):
-                    course = section.getCourse()
-                    professor = section.getProfessor()
+@st.fragment
+def _report_sections():
+    st.subheader("Section Enrollment Details")
+    snapshot = st.session_state.registry.snapshot()
 
-                    col1, col2 = st.columns(2)
+    if snapshot.sections:
+        for section_no, section in snapshot.sections.items():
+            with st.expander(f"Section {section_no}"):
+                course = section.getCourse()
+                professor = section.getProfessor()
 
-                    with col1:
-                        st.write(f"**Course:** {course}")
-                        st.write(f"**Schedule:** {section.getDayOfWeek()} {section.getTimeOfDay()}")
-                        st.write(f"**Room:** {section.getRoom()}")
+                col1, col2 = st.columns(2)
 
-                    with col2:
-                        st.write(f"**Professor:** {professor.name if professor else 'Not Assigned'}")
-                        st.write(f"**Capacity:** {section.getCapacity()}")
-                        st.write(f"**Enrolled:** {section.getEnrolledCount()}")
+                with col1:
+                    st.write(f"**Course:** {course}")
+                    st.write(f"**Schedule:** {section.getDayOfWeek()} {section.getTimeOfDay()}")
+                    st.write(f"**Room:** {section.getRoom()}")
 
-                    students = section.getStudents()
-                    if students:
-                        st.write("**Enrolled Students:**")
-                        for student in students:
-                            st.write(f"- {student.name} ({student.ssn})")
-                    else:
-                        st.write("No students enrolled yet.")
-        else:
-            st.info("No sections available.")
-
-    with tab3:
-        st.subheader("Course Statistics")
-
-        if st.session_state.courses:
-            stats_data = []
-            for course in st.session_state.courses.values():
-                sections = course.getSections()
-                total_capacity = sum(s.getCapacity() for s in sections)
-                total_enrolled = sum(s.getEnrolledCount() for s in sections)
-
-                stats_data.append({
-                    "Course": f"{course.getCourseNo()} - {course.getCourseName()}",
-                    "Sections": len(sections),
-                    "Total Capacity": total_capacity,
-                    "Total Enrolled": total_enrolled,
-                    "Utilization %": f"{(total_enrolled / total_capacity * 100):.1f}%" if total_capacity > 0 else "0%",
-                    "Prerequisites": len(course.getPrerequisites())
-                })
+                with col2:
+                    st.write(f"**Professor:** {professor.name if professor else 'Not Assigned'}")
+                    st.write(f"**Capacity:** {section.getCapacity()}")
+                    st.write(f"**Enrolled:** {section.getEnrolledCount()}")
 
-            df = pd.DataFrame(stats_data)
-            st.dataframe(df, use_container_width=True)
+                students = section.getStudents()
+                if students:
+                    st.write("**Enrolled Students:**")
+                    for student in students:
+                        st.write(f"- {student.name} ({student.ssn})")
+                else:
+                    st.write("No students enrolled yet.")
+    else:
+        st.info("No sections available.")
+
+
+@st.fragment
+def _report_courses():
+    st.subheader("Course Statistics")
+    snapshot = st.session_state.registry.snapshot()
+
+    if snapshot.courses:
+        stats_data = []
+        for course in snapshot.courses.values():
+            sections = course.getSections()
+            total_capacity = sum(s.getCapacity() for s in sections)
+            total_enrolled = sum(s.getEnrolledCount() for s in sections)
+
+            stats_data.append({
+                "Course": f"{course.getCourseNo()} - {course.getCourseName()}",
+                "Sections": len(sections),
+                "Total Capacity": total_capacity,
+                "Total Enrolled": total_enrolled,
+                "Utilization %": f"{(total_enrolled / total_capacity * 100):.1f}%" if total_capacity > 0 else "0%",
+                "Eligible Students": course.getEligibleCount(),
+                "Prerequisites": len(course.getPrerequisites())
+            })
 
-            # Visualization
-            if len(stats_data) > 0:
-                st.subheader("Enrollment Visualization")
+        df = _dataframe(stats_data)
+        st.dataframe(df, use_container_width=True)
 
-                chart_data = pd.DataFrame({
-                    'Course': [row['Course'] for row in stats_data],
-                    'Enrolled': [int(row['Total Enrolled']) for row in stats_data],
-                    'Capacity': [int(row['Total Capacity']) for row in stats_data]
-                })
+        # Visualization
+        if len(stats_data) > 0:
+            st.subheader("Enrollment Visualization")
 
-                st.bar_chart(chart_data.set_index('Course'))
-        else:
-            st.info("No courses available.")
+            chart_data = _dataframe({
+                'Course': [row['Course'] for row in stats_data],
+                'Enrolled': [int(row['Total Enrolled']) for row in stats_data],
+                'Capacity': [int(row['Total Capacity']) for row in stats_data]
+            })
+
+            st.bar_chart(chart_data.set_index('Course'))
+    else:
+        st.info("No courses available.")
+
+
+
+@st.fragment
+def _report_archive():
+    st.subheader("Past Semesters")
+    archive = st.session_state.registry.archive
+
+    semesters = archive.semesters() if archive else []
+    if semesters:
+        selected_semester = st.selectbox("Semester", options=semesters, key="archive_semester")
+        # loads this one term from disk; other terms stay on disk
+        term = archive.load(selected_semester)
+
+        st.dataframe(_dataframe([{
+            "Section": section.getSectionNo(),
+            "Course": str(section.getCourse()) if section.getCourse() else "Unknown",
+            "Schedule": f"{section.getDayOfWeek()} {section.getTimeOfDay()}",
+            "Room": section.getRoom(),
+            "Professor": section.getProfessor().name if section.getProfessor() else "Not Assigned",
+            "Enrolled": len(term.getRoster(section.getSectionNo())),
+            "Capacity": section.getCapacity()
+        } for section in term.getSections()]), use_container_width=True)
+    else:
+        st.info("No semesters have been archived yet.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""Core of the student registration system.
+
+Importing this package only loads the standard library: no Streamlit and no
+pandas, so batch jobs can use the domain model directly.
+"""
+from .exceptions import CourseSystemException, EnrollmentException, SectionNotFoundException
+from .models import (DAYS_OF_WEEK, TIMES_OF_DAY, Course, Section, Person, Student, Professor,
+                     TranscriptEntry, Transcript, ScheduleOfClasses)
+from .archive import ArchivedCourse, ArchivedSection, ArchivedTerm, ScheduleArchive
+from .eligibility import EligibilityMatrix
+from .scheduler import SectionScheduler
+from .registration import RegistrationWindow
+from .cart import RegistrationCart
+from .sharding import ShardedEnrollment
+from .indexes import TeachingIndex
+from .matrix import EnrollmentMatrix
+from .events import DomainEvent, Outbox
+from .webhooks import WebhookDispatcher, LocalReceiver
+from .snapshot import RegistrySnapshot
+from .registry import Registry, sampleRegistry
+from .admission import AdmissionController, Ticket
+from .auditor import IntegrityAuditor, IntegrityIssue
+from .storage import dumpRegistry, loadRegistry
+
+__all__ = [
+    "CourseSystemException", "EnrollmentException", "SectionNotFoundException",
+    "DAYS_OF_WEEK", "TIMES_OF_DAY", "Course", "Section", "Person", "Student", "Professor",
+    "TranscriptEntry", "Transcript", "ScheduleOfClasses",
+    "ArchivedCourse", "ArchivedSection", "ArchivedTerm", "ScheduleArchive",
+    "EligibilityMatrix", "SectionScheduler", "RegistrationWindow", "RegistrationCart", "ShardedEnrollment",
+    "TeachingIndex", "EnrollmentMatrix", "DomainEvent", "Outbox", "WebhookDispatcher", "LocalReceiver",
+    "RegistrySnapshot", "Registry", "sampleRegistry", "AdmissionController", "Ticket",
+    "IntegrityAuditor", "IntegrityIssue", "dumpRegistry", "loadRegistry",
+]
@@ -0,0 +1,220 @@
+"""Admission control and fair queuing in front of enrollment."""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+from .registration import RegistrationWindow
+from .registry import Registry
+
+BUSY_MESSAGE = "Registration is busy right now, please try again in a moment"
+_ALLOCATION = ""     # queue of window allocations, which belong to no section
+
+
+class Ticket:
+    """Handle for one admitted (or shed) enrollment request.
+
+    `action` runs the request; without one it is a single Registry.enroll.
+    """
+
+    def __init__(self, ssn: Optional[str], sectionNo: str, action: Optional[Callable[[], tuple]] = None):
+        self.ssn = ssn
+        self.sectionNo = sectionNo
+        self.action = action
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # held until resolve(); a bare lock, unlike threading.Event, adds nothing for the collector to scan
+        self.__done = threading.Lock()
+        self.__done.acquire()
+        self.__result: tuple[bool, str] = (False, "Pending")
+
+    def resolve(self, success: bool, message: str):
+        self.finished = time.perf_counter()
+        self.__result = (success, message)
+        self.__done.release()
+
+    def isDone(self) -> bool:
+        return self.finished is not None
+
+    def wait(self, timeout: Optional[float] = None) -> tuple[bool, str]:
+        """Returns (success, message) once the request has been served."""
+        if not self.__done.acquire(timeout=-1 if timeout is None else timeout):
+            return False, "Still waiting"
+        self.__done.release()
+        return self.__result
+
+
+class AdmissionController:
+    """Bounded queue with per-section round robin and load shedding.
+
+    Requests wait in one FIFO per section. The server thread takes one
+    request from each section in turn, so a hot section cannot starve the
+    others. Each student may have only `maxPerStudent` requests queued at a
+    time. A new request is shed with a "try again" answer when the queue is
+    full, or when either its estimated wait (queue depth x mean time between
+    completions while busy) or the age of the oldest waiting request exceeds
+    `latencyTarget`. Latency therefore
+    stays near the target no matter how much load is offered. The estimate
+    starts from the first measured completion; until then only the observed
+    age counts, so a cold start does not shed on a guess. Requests are
+    served one at a time, as Registry writes hold its write lock anyway.
+
+    Cart checkouts (submitCart) wait in the queue of their first section
+    and count against the student's limit like single requests. Window
+    allocations (submitAllocation) have a queue of their own; they take
+    their turn like any section, but are left out of the time estimate.
+    """
+
+    def __init__(self, registry: Registry, maxQueue: int = 1000, maxPerStudent: int = 1,
+                 latencyTarget: float = 0.5, window: int = 1000):
+        self.__registry = registry
+        self.__maxQueue = maxQueue
+        self.__maxPerStudent = maxPerStudent
+        self.__latencyTarget = latencyTarget
+
+        self.__lock = threading.Condition()
+        self.__queues: "OrderedDict[str, deque]" = OrderedDict()
+        self.__depth = 0
+        self.__arrivals = deque()       # admitted tickets in arrival order, to find the oldest waiting one
+        self.__perStudent: Dict[str, int] = {}
+        self.__serviceTime: Optional[float] = None   # mean time between completions, seconds
+        self.__intervals = deque(maxlen=window)      # the last `window` of those times, for the mean
+        self.__intervalTotal = 0.0
+        self.__lastFinished: Optional[float] = None
+        self.__waits = deque(maxlen=window)
+        self.__latencies = deque(maxlen=window)
+        self.__counts = {"admitted": 0, "shed": 0, "completed": 0}
+        self.__thread: Optional[threading.Thread] = None
+        self.__running = False
+
+    def start(self):
+        if self.__thread is None:
+            self.__running = True
+            self.__thread = threading.Thread(target=self.__serve, daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """Stops after the queued requests have been served."""
+        if self.__thread is None:
+            return
+        with self.__lock:
+            self.__running = False
+            self.__lock.notify()
+        self.__thread.join()
+        self.__thread = None
+
+    def submit(self, ssn: str, sectionNo: str) -> Ticket:
+        return self.__admit(Ticket(ssn, sectionNo))
+
+    def submitCart(self, ssn: str, sectionNos: List[str]) -> Ticket:
+        """Registry.enrollAll through the queue: all of the sections or none."""
+        sectionNos = list(sectionNos)
+        return self.__admit(Ticket(ssn, sectionNos[0] if sectionNos else _ALLOCATION,
+                                   lambda: self.__registry.enrollAll(ssn, sectionNos)))
+
+    def submitAllocation(self, window: RegistrationWindow, seed: Optional[int] = None,
+                         priority: Optional[Callable] = None) -> Ticket:
+        """Registry.allocate through the queue, so it does not jump ahead of waiting students."""
+        def allocate():
+            result = self.__registry.allocate(window, seed=seed, priority=priority)
+            seats = sum(len(sections) for sections in result.values())
+            return True, f"Allocated {seats} seats to {len(result)} students."
+        return self.__admit(Ticket(None, _ALLOCATION, allocate))
+
+    def __admit(self, ticket: Ticket) -> Ticket:
+        ssn = ticket.ssn
+        with self.__lock:
+            if ssn is not None and self.__perStudent.get(ssn, 0) >= self.__maxPerStudent:
+                ticket.resolve(False, "You already have a registration request in progress")
+                return ticket
+            while self.__arrivals and self.__arrivals[0].started is not None:
+                self.__arrivals.popleft()
+            oldestAge = ticket.submitted - self.__arrivals[0].submitted if self.__arrivals else 0.0
+            estimatedWait = (self.__depth + 1) * self.__serviceTime if self.__serviceTime is not None else 0.0
+            if self.__depth >= self.__maxQueue or max(estimatedWait, oldestAge) > self.__latencyTarget:
+                self.__counts["shed"] += 1
+                ticket.resolve(False, BUSY_MESSAGE)
+                return ticket
+
+            self.__queues.setdefault(ticket.sectionNo, deque()).append(ticket)
+            self.__depth += 1
+            self.__arrivals.append(ticket)
+            if ssn is not None:
+                self.__perStudent[ssn] = self.__perStudent.get(ssn, 0) + 1
+            self.__counts["admitted"] += 1
+            self.__lock.notify()
+        return ticket
+
+    def getMetrics(self) -> Dict:
+        with self.__lock:
+            return {
+                "queueDepth": self.__depth,
+                "sectionsWaiting": len(self.__queues),
+                **self.__counts,
+                "waitP50": _percentile(self.__waits, 0.50),
+                "waitP99": _percentile(self.__waits, 0.99),
+                "latencyP99": _percentile(self.__latencies, 0.99),
+                "serviceTime": self.__serviceTime,
+            }
+
+    def __next(self) -> Optional[Ticket]:
+        # round robin: take the head of the first section's queue, then move that section to the back
+        sectionNo, queue = next(iter(self.__queues.items()))
+        ticket = queue.popleft()
+        if queue:
+            self.__queues.move_to_end(sectionNo)
+        else:
+            del self.__queues[sectionNo]
+        self.__depth -= 1
+        return ticket
+
+    def __serve(self):
+        while True:
+            with self.__lock:
+                while not self.__queues and self.__running:
+                    self.__lock.wait()
+                if not self.__queues:
+                    return
+                ticket = self.__next()
+
+            ticket.started = time.perf_counter()
+            try:
+                if ticket.action is not None:
+                    success, message = ticket.action()
+                else:
+                    success, message = self.__registry.enroll(ticket.ssn, ticket.sectionNo)
+            except Exception as e:
+                success, message = False, str(e)
+            ticket.resolve(success, message)
+
+            with self.__lock:
+                self.__counts["completed"] += 1
+                if ticket.ssn is None:
+                    # an allocation is one long write, not a sample of per-request service time
+                    self.__lastFinished = ticket.finished
+                    continue
+                remaining = self.__perStudent[ticket.ssn] - 1
+                if remaining:
+                    self.__perStudent[ticket.ssn] = remaining
+                else:
+                    del self.__perStudent[ticket.ssn]
+                # while busy, measure from the previous completion so GIL contention is included
+                busy = self.__lastFinished is not None and ticket.submitted < self.__lastFinished
+                interval = ticket.finished - (self.__lastFinished if busy else ticket.started)
+                # a plain mean over the window: an exponential average forgets the stalls too fast
+                if len(self.__intervals) == self.__intervals.maxlen:
+                    self.__intervalTotal -= self.__intervals[0]
+                self.__intervals.append(interval)
+                self.__intervalTotal += interval
+                self.__serviceTime = self.__intervalTotal / len(self.__intervals)
+                self.__lastFinished = ticket.finished
+                self.__waits.append(ticket.started - ticket.submitted)
+                self.__latencies.append(ticket.finished - ticket.submitted)
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
@@ -0,0 +1,211 @@
+"""Read-only partitions of past semesters, stored one file per term.
+
+Only the active ScheduleOfClasses lives in memory. Closing a semester writes
+its sections and rosters to `<directory>/<semester>.jsonl`. Transcript
+entries then point at small ArchivedSection stubs that carry what a
+transcript needs (course number, name, credits). A whole term is read back
+only when someone asks for its sections or rosters, and only a few terms are
+kept loaded at a time.
+"""
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .models import ScheduleOfClasses
+
+
+class ArchivedCourse:
+    def __init__(self, courseNo: str, courseName: str, credits: int):
+        self.__courseNo = courseNo
+        self.__courseName = courseName
+        self.__credits = credits
+
+    def getCourseNo(self) -> str:
+        return self.__courseNo
+
+    def getCourseName(self) -> str:
+        return self.__courseName
+
+    def getCredits(self) -> int:
+        return self.__credits
+
+    def getPrerequisites(self) -> tuple:
+        return ()
+
+    def __str__(self) -> str:
+        return f"{self.__courseNo} - {self.__courseName} ({self.__credits} credits)"
+
+
+class ArchivedProfessor:
+    def __init__(self, name: str, ssn: str, department: str):
+        self.name = name
+        self.ssn = ssn
+        self.__department = department
+
+    def getDepartment(self) -> str:
+        return self.__department
+
+
+class ArchivedSection:
+    """Read-only stand-in for a Section of a closed semester."""
+
+    def __init__(self, semester: str, sectionNo: str, course: Optional[ArchivedCourse], dayOfWeek: str,
+                 timeOfDay: str, room: str, seatingCapacity: int,
+                 professor: Optional[ArchivedProfessor] = None):
+        self.__semester = semester
+        self.__sectionNo = sectionNo
+        self.__course = course
+        self.__dayOfWeek = dayOfWeek
+        self.__timeOfDay = timeOfDay
+        self.__room = room
+        self.__seatingCapacity = seatingCapacity
+        self.__professor = professor
+
+    @classmethod
+    def fromSection(cls, semester: str, section) -> 'ArchivedSection':
+        course = section.getCourse()
+        professor = section.getProfessor()
+        return cls(semester, section.getSectionNo(),
+                   ArchivedCourse(course.getCourseNo(), course.getCourseName(), course.getCredits()) if course else None,
+                   section.getDayOfWeek(), section.getTimeOfDay(), section.getRoom(), section.getCapacity(),
+                   ArchivedProfessor(professor.name, professor.ssn, professor.getDepartment()) if professor else None)
+
+    @classmethod
+    def fromDict(cls, record: Dict) -> 'ArchivedSection':
+        course = record.get("course")
+        professor = record.get("professor")
+        return cls(record["semester"], record["sectionNo"],
+                   ArchivedCourse(course["courseNo"], course["courseName"], course["credits"]) if course else None,
+                   record["dayOfWeek"], record["timeOfDay"], record["room"], record["capacity"],
+                   ArchivedProfessor(professor["name"], professor["ssn"], professor["department"])
+                   if professor else None)
+
+    def toDict(self) -> Dict:
+        course, professor = self.__course, self.__professor
+        return {"semester": self.__semester, "sectionNo": self.__sectionNo,
+                "course": {"courseNo": course.getCourseNo(), "courseName": course.getCourseName(),
+                           "credits": course.getCredits()} if course else None,
+                "dayOfWeek": self.__dayOfWeek, "timeOfDay": self.__timeOfDay, "room": self.__room,
+                "capacity": self.__seatingCapacity,
+                "professor": {"name": professor.name, "ssn": professor.ssn,
+                              "department": professor.getDepartment()} if professor else None}
+
+    def getSemester(self) -> str:
+        return self.__semester
+
+    def getSectionNo(self):
+        return self.__sectionNo
+
+    def getDayOfWeek(self):
+        return self.__dayOfWeek
+
+    def getTimeOfDay(self):
+        return self.__timeOfDay
+
+    def getRoom(self):
+        return self.__room
+
+    def getCourse(self):
+        return self.__course
+
+    def getCapacity(self):
+        return self.__seatingCapacity
+
+    def getProfessor(self):
+        return self.__professor
+
+    def __str__(self) -> str:
+        course_name = self.__course.getCourseName() if self.__course else "Unknown"
+        return f"{self.__sectionNo} - {course_name} ({self.__semester})"
+
+
+class ArchivedTerm:
+    """One loaded partition: the sections of a past semester and their rosters."""
+
+    def __init__(self, semester: str):
+        self.__semester = semester
+        self.__sections: Dict[str, ArchivedSection] = {}
+        self.__rosters: Dict[str, List[str]] = {}
+
+    def add(self, section: ArchivedSection, roster: List[str]):
+        self.__sections[section.getSectionNo()] = section
+        self.__rosters[section.getSectionNo()] = roster
+
+    def getSemester(self) -> str:
+        return self.__semester
+
+    def getSection(self, sectionNo: str) -> Optional[ArchivedSection]:
+        return self.__sections.get(sectionNo)
+
+    def getSections(self) -> List[ArchivedSection]:
+        return list(self.__sections.values())
+
+    def getRoster(self, sectionNo: str) -> List[str]:
+        """Student IDs that were enrolled in the section."""
+        return list(self.__rosters.get(sectionNo, ()))
+
+
+class ScheduleArchive:
+    def __init__(self, directory: str, maxLoaded: int = 2):
+        self.__directory = directory
+        self.__maxLoaded = maxLoaded
+        self.__loaded: "OrderedDict[str, ArchivedTerm]" = OrderedDict()
+
+    def getDirectory(self) -> str:
+        return self.__directory
+
+    def __path(self, semester: str) -> str:
+        return os.path.join(self.__directory, re.sub(r"[^\w.-]", "_", semester) + ".jsonl")
+
+    def archive(self, schedule: ScheduleOfClasses) -> Dict[str, ArchivedSection]:
+        """Writes the schedule's partition and returns the stubs by sectionNo."""
+        semester = schedule.getSemester()
+        path = self.__path(semester)
+        if os.path.exists(path):
+            raise ValueError(f"Semester {semester} is already archived")
+        os.makedirs(self.__directory, exist_ok=True)
+
+        stubs = {}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(json.dumps({"semester": semester}) + "\n")
+            for section in schedule.getSections():
+                stub = ArchivedSection.fromSection(semester, section)
+                stubs[section.getSectionNo()] = stub
+                fp.write(json.dumps({**stub.toDict(),
+                                     "roster": [student.ssn for student in section.getStudents()]}) + "\n")
+        os.replace(tmp, path)
+        return stubs
+
+    def semesters(self) -> List[str]:
+        if not os.path.isdir(self.__directory):
+            return []
+        result = []
+        for name in sorted(os.listdir(self.__directory)):
+            if name.endswith(".jsonl"):
+                with open(os.path.join(self.__directory, name), encoding="utf-8") as fp:
+                    result.append(json.loads(fp.readline())["semester"])
+        return result
+
+    def load(self, semester: str) -> ArchivedTerm:
+        """Returns the term's partition, reading it from disk if it is not loaded."""
+        if semester in self.__loaded:
+            self.__loaded.move_to_end(semester)
+            return self.__loaded[semester]
+
+        path = self.__path(semester)
+        if not os.path.exists(path):
+            raise KeyError(f"Semester {semester} is not archived")
+        term = ArchivedTerm(semester)
+        with open(path, encoding="utf-8") as fp:
+            fp.readline()
+            for line in fp:
+                record = json.loads(line)
+                term.add(ArchivedSection.fromDict(record), record["roster"])
+
+        self.__loaded[semester] = term
+        while len(self.__loaded) > self.__maxLoaded:
+            self.__loaded.popitem(last=False)
+        return term
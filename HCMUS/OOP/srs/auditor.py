@@ -0,0 +1,159 @@
+"""Integrity checks for the links the model stores twice.
+
+Enrollment lives both in Section's roster and in Student's section list.
+Sections also belong to a course and to a professor, and transcript entries
+point at sections. The auditor checks those links and section capacities,
+and can repair the drift it knows how to fix.
+"""
+from typing import Callable, Iterable, List, Optional, Set
+
+from .archive import ArchivedSection
+from .models import ChangeTracker, Course, Professor, Section, Student, Transcript
+from .registry import Registry
+
+
+class IntegrityIssue:
+    def __init__(self, kind: str, subject: str, message: str, repair: Optional[Callable[[], None]] = None):
+        self.kind = kind
+        self.subject = subject      # ssn or sectionNo the issue was found on
+        self.message = message
+        self.__repair = repair
+
+    def canRepair(self) -> bool:
+        return self.__repair is not None
+
+    def repair(self):
+        if self.__repair is not None:
+            self.__repair()
+
+    def __str__(self) -> str:
+        return f"[{self.kind}] {self.subject}: {self.message}"
+
+
+class IntegrityAuditor:
+    """Checks only what changed since the last run, or everything on request.
+
+    The incremental mode checks the students and sections that were written
+    since its last run, as collected by a models.ChangeTracker. The tracker
+    sees every write to the model, including the ones that bypass the
+    Registry, which are where drift comes from. Its cost follows the amount
+    of change, not the size of the catalog. Call close() to stop tracking.
+    """
+
+    def __init__(self, registry: Registry):
+        self.__registry = registry
+        self.__tracker = ChangeTracker()
+
+    def close(self):
+        self.__tracker.close()
+
+    def auditIncremental(self) -> List[IntegrityIssue]:
+        students: Set[str] = set()
+        sections: Set[str] = set()
+        for owner in self.__tracker.drain():
+            if isinstance(owner, Transcript):
+                owner = owner.getStudent()
+            if isinstance(owner, Student):
+                students.add(owner.ssn)
+            elif isinstance(owner, Section):
+                sections.add(owner.getSectionNo())
+            elif isinstance(owner, (Course, Professor)):
+                # their links are checked from the sections' side
+                sections.update(section.getSectionNo() for section in owner.getSections())
+
+        issues = []
+        for ssn in students:
+            issues.extend(self.checkStudent(ssn))
+        for sectionNo in sections:
+            issues.extend(self.checkSection(sectionNo))
+        return issues
+
+    def auditFull(self) -> List[IntegrityIssue]:
+        """Checks every student and section in one pass."""
+        registry = self.__registry
+        self.__tracker.drain()
+        issues = []
+        for ssn in list(registry.students):
+            issues.extend(self.checkStudent(ssn))
+        for sectionNo in list(registry.sections):
+            issues.extend(self.checkSection(sectionNo))
+        return issues
+
+    @staticmethod
+    def repair(issues: Iterable[IntegrityIssue]) -> int:
+        repaired = 0
+        for issue in issues:
+            if issue.canRepair():
+                issue.repair()
+                repaired += 1
+        return repaired
+
+    def checkStudent(self, ssn: str) -> List[IntegrityIssue]:
+        registry = self.__registry
+        student = registry.students.get(ssn)
+        if student is None:
+            # deleted: the sections it was dropped from are checked on their own
+            return []
+
+        issues = []
+        for section in student.getSections():
+            sectionNo = section.getSectionNo()
+            if registry.sections.get(sectionNo) is not section:
+                issues.append(IntegrityIssue(
+                    "stale_enrollment", ssn, f"enrolled in {sectionNo}, which is not in the active schedule",
+                    lambda s=section: student.dropSection(s)))
+            elif student not in section.getStudents():
+                issues.append(IntegrityIssue(
+                    "one_sided_enrollment", ssn, f"lists {sectionNo} but is not on its roster",
+                    lambda s=section: student.dropSection(s)))
+
+        semester = registry.schedule.getSemester()
+        for courseNo, entry in student.getTranscript().getEntries().items():
+            section = entry.getSection()
+            if isinstance(section, ArchivedSection):
+                continue
+            if registry.sections.get(section.getSectionNo()) is not section:
+                issues.append(IntegrityIssue(
+                    "stale_transcript_reference", ssn,
+                    f"grade for {courseNo} points at deleted section {section.getSectionNo()}",
+                    lambda e=entry, s=section: student.getTranscript().addEntry(
+                        ArchivedSection.fromSection(semester, s), e.getGrade())))
+        return issues
+
+    def checkSection(self, sectionNo: str) -> List[IntegrityIssue]:
+        registry = self.__registry
+        section = registry.sections.get(sectionNo)
+        if section is None:
+            return []
+
+        issues = []
+        course = section.getCourse()
+        if course is None or registry.courses.get(course.getCourseNo()) is not course:
+            issues.append(IntegrityIssue("orphan_section", sectionNo, "its course is not in the catalog"))
+        elif section not in course.getSections():
+            issues.append(IntegrityIssue("orphan_section", sectionNo,
+                                         f"not listed in {course.getCourseNo()}'s sections"))
+
+        professor = section.getProfessor()
+        if professor is not None and section not in professor.getSections():
+            issues.append(IntegrityIssue(
+                "one_sided_assignment", sectionNo, f"taught by {professor.ssn}, who does not list it",
+                lambda: professor.agreeToTeach(section)))
+
+        roster = section.getStudents()
+        if len(roster) > section.getCapacity():
+            issues.append(IntegrityIssue("over_capacity", sectionNo,
+                                         f"{len(roster)} students for {section.getCapacity()} seats"))
+        if len({student.ssn for student in roster}) != len(roster):
+            issues.append(IntegrityIssue("duplicate_enrollment", sectionNo, "a student is on the roster twice"))
+
+        for student in roster:
+            if registry.students.get(student.ssn) is not student:
+                issues.append(IntegrityIssue(
+                    "deleted_student_on_roster", sectionNo, f"{student.ssn} is no longer a student",
+                    lambda s=student: section.drop(s)))
+            elif section not in student.getSections():
+                issues.append(IntegrityIssue(
+                    "one_sided_enrollment", sectionNo, f"{student.ssn} is on the roster but does not list it",
+                    lambda s=student: s.attendSection(section)))
+        return issues
@@ -0,0 +1,338 @@
+"""Benchmarks on generated catalogs.
+
+    python -m srs.benchmarks scheduler --sections 1200 --rooms 40
+    python -m srs.benchmarks sharding --workers 1 2 4
+    python -m srs.benchmarks snapshot
+    python -m srs.benchmarks admission --rates 1000 20000
+    python -m srs.benchmarks import
+    python -m srs.benchmarks webhooks
+    python -m srs.benchmarks matrix
+
+Each subcommand builds its own synthetic registry with a fixed seed and
+prints one timing per line. Setup is not timed.
+"""
+import argparse
+import gc
+import os
+import random
+import time
+
+from .registry import Registry
+
+
+def _report(label: str, seconds: float, extra: str = ""):
+    print(f"{label:<44} {seconds:8.3f}s {extra}".rstrip())
+
+
+def generateRegistry(students: int, sections: int, seed: int = 0, capacity: int = 60) -> Registry:
+    """A catalog of sections // 3 courses, the second half requiring the first, and students with two grades each."""
+    rng = random.Random(seed)
+    registry = Registry()
+    courses = max(2, sections // 3)
+    for i in range(courses):
+        prerequisites = [f"C{i - courses // 2:04d}"] if i >= courses // 2 else []
+        registry.addCourse(f"C{i:04d}", f"Course {i}", 3, prerequisites)
+    for i in range(sections):
+        registry.addSection(f"C{i % courses:04d}", f"S{i:05d}", "Monday", "8:00 AM", "R1", capacity)
+    for i in range(students):
+        student = registry.addStudent(f"Student {i}", f"{i:06d}", "CS", "BS")
+        for j in rng.sample(range(courses // 2), min(2, courses // 2)):
+            student.getTranscript().addEntry(registry.sections[f"S{j:05d}"], str(rng.choice([4, 7, 9])))
+    return registry
+
+
+def _requests(registry: Registry, count: int, seed: int):
+    rng = random.Random(seed)
+    sections = list(registry.sections.values())
+    students = list(registry.students.values())
+    return [("enroll" if rng.random() < 0.9 else "drop", rng.choice(students), rng.choice(sections))
+            for _ in range(count)]
+
+
+def benchSharding(args):
+    registry = generateRegistry(args.students, args.sections, args.seed)
+    batch = _requests(registry, args.requests, args.seed)
+    gc.collect()
+    gc.freeze()     # the same for every path: the generated registry stays out of the collector's passes
+    start = time.perf_counter()
+    for op, student, section in batch:
+        section.enroll(student) if op == "enroll" else section.drop(student)
+    _report("direct Section.enroll/drop", time.perf_counter() - start)
+
+    # the path the sharded pool replaces: validation, both sides of the model, matrix and events
+    registry = generateRegistry(args.students, args.sections, args.seed)
+    batch = [(op, student.ssn, section.getSectionNo())
+             for op, student, section in _requests(registry, args.requests, args.seed)]
+    gc.collect()
+    gc.freeze()
+    start = time.perf_counter()
+    for op, ssn, sectionNo in batch:
+        registry.enroll(ssn, sectionNo) if op == "enroll" else registry.drop(ssn, sectionNo)
+    _report("direct Registry.enroll/drop", time.perf_counter() - start)
+
+    for workers in args.workers:
+        registry = generateRegistry(args.students, args.sections, args.seed)
+        batch = [(op, student.ssn, section.getSectionNo())
+                 for op, student, section in _requests(registry, args.requests, args.seed)]
+        chunks = [[list(column) for column in zip(*batch[i:i + args.batch_size])]
+                  for i in range(0, len(batch), args.batch_size)]
+        gc.collect()
+        gc.freeze()
+        with registry.shardedEnrollment(workers) as pool:
+            start, cpu = time.perf_counter(), time.process_time()
+            for ops, ssns, sectionNos in chunks:
+                pool.submit(ops, ssns, sectionNos)
+            submitCpu = time.process_time() - cpu
+            pool.sync()
+            elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu
+        # the coordinator's own CPU time is the part that cannot be spread over more workers
+        _report(f"sharded, {workers} workers", elapsed,
+                f"(coordinator CPU {cpu:.3f}s: submit {submitCpu:.3f}s, sync {cpu - submitCpu:.3f}s)")
+    print(f"{os.cpu_count()} CPUs; starting the pool and loading the shards is not timed")
+
+
+def benchSnapshot(args):
+    registry = generateRegistry(args.students, args.sections, args.seed)
+    start = time.perf_counter()
+    registry.snapshot()
+    _report("first snapshot", time.perf_counter() - start)
+    start = time.perf_counter()
+    registry.snapshot()
+    _report("snapshot, nothing changed", time.perf_counter() - start)
+
+    rng = random.Random(args.seed)
+    ssns, sectionNos = list(registry.students), list(registry.sections)
+    for _ in range(args.changes):
+        registry.enroll(rng.choice(ssns), rng.choice(sectionNos))
+    start = time.perf_counter()
+    registry.snapshot()
+    _report(f"snapshot after {args.changes} enrollments", time.perf_counter() - start)
+
+
+def benchAdmission(args):
+    from .admission import AdmissionController
+
+    registry = generateRegistry(args.students, args.sections, args.seed, capacity=10 ** 6)
+    ssns, sectionNos = list(registry.students), list(registry.sections)
+    rng = random.Random(args.seed)
+    for rate in args.rates:
+        gc.collect()
+        gc.freeze()     # keep the registry out of the collector's passes, as a long-running server would
+        controller = AdmissionController(registry, latencyTarget=args.target)
+        controller.start()
+        tickets = []
+        # open loop: submit in 1 ms bursts at the offered rate, whatever the server keeps up with
+        start = time.perf_counter()
+        sent = 0
+        while (now := time.perf_counter()) - start < args.duration:
+            due = int((now - start) * rate)
+            for _ in range(due - sent):
+                tickets.append(controller.submit(rng.choice(ssns), rng.choice(sectionNos)))
+            sent = due
+            time.sleep(0.001)
+        controller.stop()
+        elapsed = time.perf_counter() - start
+        metrics = controller.getMetrics()
+        latencies = sorted(t.finished - t.submitted for t in tickets if t.started is not None)
+        p99 = latencies[min(int(0.99 * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+        _report(f"offered {rate}/s for {args.duration}s", elapsed,
+                f"served {metrics['completed'] / elapsed:.0f}/s, shed {metrics['shed'] / max(sent, 1):.1%}, "
+                f"latency p99 {p99 * 1000:.1f} ms")
+
+
+def benchImport(args):
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    totals, modules = [], {}
+    for _ in range(args.runs):
+        # -X importtime writes "self | cumulative | name" per module to stderr, in microseconds
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import srs"], cwd=root,
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines()[1:]:
+            _, cumulative, name = line.split("|")
+            if name.strip().startswith("srs"):
+                modules.setdefault(name.strip(), []).append(int(cumulative) / 1e6)
+        totals.append(modules["srs"][-1])
+    _report(f"cold import srs, median of {args.runs}", sorted(totals)[len(totals) // 2])
+    slowest = sorted(modules.items(), key=lambda item: -sorted(item[1])[len(item[1]) // 2])
+    for name, times in slowest[1:args.top + 1]:
+        _report(f"  {name} (cumulative)", sorted(times)[len(times) // 2])
+
+
+def benchScheduler(args):
+    from .scheduler import SectionScheduler
+
+    rng = random.Random(args.seed)
+    registry = Registry()
+    courses = max(1, args.sections // 3)
+    for i in range(courses):
+        registry.addCourse(f"C{i:04d}", f"Course {i}", 3)
+    for i in range(args.professors):
+        registry.addProfessor(f"Professor {i}", f"P{i:04d}", "Lecturer", "CS")
+    for i in range(args.sections):
+        sectionNo = f"S{i:05d}"
+        registry.addSection(f"C{i % courses:04d}", sectionNo, "Monday", "8:00 AM", "TBA", rng.choice([30, 60, 120]))
+        registry.assignProfessor(f"P{rng.randrange(args.professors):04d}", sectionNo)
+    # room sizes in the same mix as the sections, with some slack
+    rooms = {f"R{i:03d}": (30, 60, 120)[i % 3] for i in range(args.rooms)}
+    sections = list(registry.sections.values())
+
+    scheduler = SectionScheduler(rooms, seed=args.seed)
+    start = time.perf_counter()
+    placements, unplaced = scheduler.solve(sections, timeBudget=args.time_budget)
+    _report(f"solve {len(sections)} sections, {len(rooms)} rooms", time.perf_counter() - start,
+            f"({len(unplaced)} unplaced)")
+    SectionScheduler.apply(registry.sections, placements)
+
+    placed = [s for s in sections if s.getSectionNo() in placements]
+    moved = rng.sample(placed, min(args.resolve, len(placed)))
+    fixed = [s for s in placed if s not in moved]
+    start = time.perf_counter()
+    _, unplaced = scheduler.solve(moved, fixed, timeBudget=args.time_budget)
+    _report(f"re-solve {len(moved)} sections, rest fixed", time.perf_counter() - start, f"({len(unplaced)} unplaced)")
+
+
+def benchWebhooks(args):
+    from .events import Outbox
+    from .webhooks import LocalReceiver, WebhookDispatcher
+
+    for batchSize in args.batch_sizes:
+        outbox = Outbox()
+        receiver = LocalReceiver()
+        url = receiver.start()
+        dispatcher = WebhookDispatcher(outbox, [url], batchSize=batchSize, pollInterval=0.01)
+        dispatcher.start()
+        start = time.perf_counter()
+        for i in range(args.events):
+            outbox.record("enrolled", f"{i % 1000:06d}", sectionNo=f"S{i % 300:05d}")
+        recorded = time.perf_counter() - start
+        dispatcher.stop(timeout=60)
+        elapsed = time.perf_counter() - start
+        receiver.stop()
+        _report(f"deliver {args.events} events, batches of {batchSize}", elapsed,
+                f"({receiver.batches} POSTs, recording took {recorded:.3f}s)")
+
+
+def benchMatrix(args):
+    from itertools import combinations
+
+    from .matrix import EnrollmentMatrix
+    from .models import Course, Student
+
+    rng = random.Random(args.seed)
+    catalog = [Course(f"C{i:04d}", f"Course {i}", 3) for i in range(args.courses)]
+    allSections = [catalog[i % args.courses].scheduleOfSection(f"S{i:05d}", "Monday", "8:00 AM", "R1", 10 ** 6)
+                   for i in range(args.sections)]
+    people = [Student(f"Student {i}", f"{i:06d}", "CS", "BS") for i in range(args.students)]
+    plan = [(student, rng.sample(allSections, args.per_student)) for student in people]
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        result = fn()
+        _report(label, time.perf_counter() - start)
+        return result
+
+    try:
+        matrix = EnrollmentMatrix.build(people, allSections)
+
+        def enrollAll():
+            for student, chosen in plan:
+                for section in chosen:
+                    matrix.enrolled(student, section)
+
+        timed(f"{args.students * args.per_student} incremental enrolls", enrollAll)
+        timed("CSR build", matrix.toCsr)
+        _, overlaps = timed("section overlaps (A.T @ A)", matrix.sectionOverlaps)
+        timed("course overlaps", matrix.courseOverlaps)
+        timed("top 10 course pairs", lambda: matrix.topPairs(10))
+        graph = timed("conflict graph", matrix.conflictGraph)
+    except ImportError as e:
+        raise SystemExit(str(e))
+    print(f"{'nonzero section pairs':<44} {overlaps.nnz:8d}")
+    print(f"{'sections with a conflict':<44} {len(graph):8d}")
+
+    # the nested-loop way, on one pair of courses
+    a, b = catalog[0].getCourseNo(), catalog[1].getCourseNo()
+    rosters = {section.getSectionNo(): [] for section in allSections}
+    for student, chosen in plan:
+        for section in chosen:
+            rosters[section.getSectionNo()].append(student)
+
+    def nestedLoops():
+        shared = 0
+        for student, chosen in plan:
+            taken = {section.getCourse().getCourseNo() for section in chosen}
+            shared += a in taken and b in taken
+        return shared
+
+    def nestedPairs():
+        # pairwise roster intersection, the conflict graph without the matrix
+        members = {sectionNo: {s.ssn for s in roster} for sectionNo, roster in rosters.items()}
+        return sum(1 for x, y in combinations(list(members)[:500], 2) if members[x] & members[y])
+
+    loops = timed(f"{a}/{b} co-enrollment, nested loops", nestedLoops)
+    sparseCount = timed(f"{a}/{b} co-enrollment, sparse", lambda: matrix.coEnrollment(a, b))
+    assert loops == sparseCount, (loops, sparseCount)
+    timed("pairwise rosters, first 500 sections", nestedPairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m srs.benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("sharding", help="direct vs sharded enroll/drop throughput")
+    command.add_argument("--students", type=int, default=100000)
+    command.add_argument("--sections", type=int, default=3000)
+    command.add_argument("--requests", type=int, default=100000)
+    command.add_argument("--batch-size", type=int, default=10000)
+    command.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    command.set_defaults(handler=benchSharding)
+
+    command = commands.add_parser("snapshot", help="first and incremental Registry.snapshot()")
+    command.add_argument("--students", type=int, default=100000)
+    command.add_argument("--sections", type=int, default=3000)
+    command.add_argument("--changes", type=int, default=100)
+    command.set_defaults(handler=benchSnapshot)
+
+    command = commands.add_parser("admission", help="open-loop load test of AdmissionController")
+    command.add_argument("--students", type=int, default=10000)
+    command.add_argument("--sections", type=int, default=300)
+    command.add_argument("--rates", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    command.add_argument("--duration", type=float, default=2.0)
+    command.add_argument("--target", type=float, default=0.05, help="latency target, seconds")
+    command.set_defaults(handler=benchAdmission)
+
+    command = commands.add_parser("import", help="cold `import srs` time, in fresh interpreters")
+    command.add_argument("--runs", type=int, default=9)
+    command.add_argument("--top", type=int, default=5, help="slowest srs modules to list")
+    command.set_defaults(handler=benchImport)
+
+    command = commands.add_parser("scheduler", help="SectionScheduler full solve and incremental re-solve")
+    command.add_argument("--sections", type=int, default=1200)
+    command.add_argument("--rooms", type=int, default=40)
+    command.add_argument("--professors", type=int, default=300)
+    command.add_argument("--resolve", type=int, default=20, help="sections moved in the incremental re-solve")
+    command.add_argument("--time-budget", type=float, default=10.0)
+    command.set_defaults(handler=benchScheduler)
+
+    command = commands.add_parser("webhooks", help="outbox to LocalReceiver delivery throughput")
+    command.add_argument("--events", type=int, default=20000)
+    command.add_argument("--batch-sizes", type=int, nargs="+", default=[50, 500])
+    command.set_defaults(handler=benchWebhooks)
+
+    command = commands.add_parser("matrix", help="EnrollmentMatrix analytics vs nested loops (needs scipy)")
+    command.add_argument("--students", type=int, default=100000)
+    command.add_argument("--sections", type=int, default=5000)
+    command.add_argument("--per-student", type=int, default=5)
+    command.add_argument("--courses", type=int, default=1500)
+    command.set_defaults(handler=benchMatrix)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
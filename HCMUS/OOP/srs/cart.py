@@ -0,0 +1,93 @@
+"""All-or-nothing registration in several sections at once."""
+from contextlib import ExitStack
+from typing import List
+
+from .models import Section, Student
+
+
+class RegistrationCart:
+    """Sections a student wants to join together.
+
+    Everything that only depends on the student (prerequisites, timeslot
+    clashes, one section per course) is validated before any lock is taken.
+    Checkout then locks just the cart's sections, in sectionNo order to avoid
+    deadlocks, re-checks the seats and enrolls in all of them or in none.
+    Section.enroll and Section.drop take the same locks, so a single enroll
+    cannot take a seat between the re-check and the enrollment.
+    """
+
+    def __init__(self, student: Student):
+        self.__student = student
+        self.__sections: List[Section] = []
+
+    def add(self, section: Section):
+        if section not in self.__sections:
+            self.__sections.append(section)
+
+    def remove(self, section: Section):
+        if section in self.__sections:
+            self.__sections.remove(section)
+
+    def clear(self):
+        self.__sections.clear()
+
+    def getSections(self) -> List[Section]:
+        return self.__sections.copy()
+
+    def validate(self) -> List[str]:
+        """Problems that would make checkout fail; empty when the cart is valid."""
+        problems = []
+        student = self.__student
+        enrolled = student.getSections()
+        taken = {(s.getDayOfWeek(), s.getTimeOfDay()): s for s in enrolled}
+        courses = {s.getCourse().getCourseNo(): s for s in enrolled if s.getCourse()}
+
+        for section in self.__sections:
+            sectionNo = section.getSectionNo()
+            if section in enrolled:
+                problems.append(f"{sectionNo}: already enrolled")
+                continue
+            course = section.getCourse()
+            if course:
+                other = courses.get(course.getCourseNo())
+                if other is not None:
+                    problems.append(f"{sectionNo}: already taking {course.getCourseNo()} in {other.getSectionNo()}")
+                courses[course.getCourseNo()] = section
+                satisfied, message = course.checkPrerequisites(student)
+                if not satisfied:
+                    problems.append(f"{sectionNo}: {message}")
+            slot = (section.getDayOfWeek(), section.getTimeOfDay())
+            if slot in taken:
+                problems.append(f"{sectionNo}: timeslot clash with {taken[slot].getSectionNo()}")
+            taken[slot] = section
+            if not section.confirmSeatAvailability():
+                problems.append(f"{sectionNo}: Section is full")
+        return problems
+
+    def checkout(self) -> tuple[bool, str]:
+        """Returns (success, message) and empties the cart on success."""
+        if not self.__sections:
+            return False, "Cart is empty"
+        problems = self.validate()
+        if problems:
+            return False, "; ".join(problems)
+
+        ordered = sorted(self.__sections, key=lambda s: s.getSectionNo())
+        with ExitStack() as stack:
+            for section in ordered:
+                stack.enter_context(section.getLock())
+            full = [s.getSectionNo() for s in ordered if not s.confirmSeatAvailability()]
+            if full:
+                return False, f"Section is full: {', '.join(full)}"
+            done = []
+            for section in ordered:
+                success, message = section.enroll(self.__student)
+                if not success:
+                    for enrolled in done:
+                        enrolled.drop(self.__student)
+                    return False, f"{section.getSectionNo()}: {message}"
+                done.append(section)
+
+        count = len(self.__sections)
+        self.__sections.clear()
+        return True, f"Enrolled in {count} sections"
@@ -0,0 +1,347 @@
+"""Headless command line for bulk registrar operations.
+
+    python -m srs --state term.jsonl import-courses courses.csv
+    python -m srs --state term.jsonl enroll requests.csv --workers 4 > results.csv
+    python -m srs --state term.jsonl report courses
+    python -m srs --state term.jsonl deliver https://example.edu/hooks/srs
+
+Inputs are CSV files read row by row, and results are written to stdout as
+they are produced. The state file is a registry dump (see storage.py). It is
+loaded before the command runs and written back when the command changed it,
+along with the events the command recorded until `deliver` sends them.
+"""
+import argparse
+import csv
+import os
+import sys
+from typing import Iterable, Iterator, List
+
+from .exceptions import CourseSystemException, SectionNotFoundException
+from .export import (FORMATS, ROSTER_FIELDS, TRANSCRIPT_FIELDS, chunked, exportRows, iterRosterRows,
+                     iterTranscriptRows)
+from .archive import ScheduleArchive
+from .auditor import IntegrityAuditor
+from .registry import Registry, sampleRegistry
+from .scheduler import SectionScheduler
+from .storage import dumpRegistry, loadRegistry
+from .webhooks import WebhookDispatcher
+
+
+def _rows(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as fp:
+        yield from csv.DictReader(fp)
+
+
+def _writer(fieldnames: List[str]) -> csv.DictWriter:
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+    writer.writeheader()
+    return writer
+
+
+def _apply(rows: Iterable[dict], operation) -> tuple[int, int]:
+    """Runs `operation(row)` per row, reporting failures on stderr."""
+    ok = failed = 0
+    for line, row in enumerate(rows, start=2):
+        try:
+            operation(row)
+            ok += 1
+        except (CourseSystemException, ValueError, KeyError) as e:
+            failed += 1
+            print(f"line {line}: {e}", file=sys.stderr)
+    return ok, failed
+
+
+# commands: each returns True when the registry changed
+def cmd_import_courses(registry: Registry, args) -> bool:
+    ok, failed = _apply(_rows(args.file), lambda row: registry.addCourse(
+        row["courseNo"], row["courseName"], int(row["credits"]),
+        [code for code in (row.get("prerequisites") or "").split(";") if code]))
+    print(f"{ok} courses imported, {failed} failed", file=sys.stderr)
+    return ok > 0
+
+
+def cmd_import_sections(registry: Registry, args) -> bool:
+    def addSection(row):
+        registry.addSection(row["courseNo"], row["sectionNo"], row["dayOfWeek"], row["timeOfDay"],
+                            row["room"], int(row["capacity"]))
+        if row.get("professor"):
+            registry.assignProfessor(row["professor"], row["sectionNo"])
+
+    ok, failed = _apply(_rows(args.file), addSection)
+    print(f"{ok} sections imported, {failed} failed", file=sys.stderr)
+    return ok > 0
+
+
+def cmd_import_students(registry: Registry, args) -> bool:
+    ok, failed = _apply(_rows(args.file), lambda row: registry.addStudent(
+        row["name"], row["ssn"], row["major"], row["degree"]))
+    print(f"{ok} students imported, {failed} failed", file=sys.stderr)
+    return ok > 0
+
+
+def cmd_import_professors(registry: Registry, args) -> bool:
+    ok, failed = _apply(_rows(args.file), lambda row: registry.addProfessor(
+        row["name"], row["ssn"], row["title"], row["department"]))
+    print(f"{ok} professors imported, {failed} failed", file=sys.stderr)
+    return ok > 0
+
+
+def cmd_schedule(registry: Registry, args) -> bool:
+    try:
+        rooms = {row["room"]: int(row["capacity"]) for row in _rows(args.rooms)}
+    except KeyError as e:
+        raise SystemExit(f"{args.rooms}: missing column {e}")
+    except ValueError as e:
+        raise SystemExit(f"{args.rooms}: {e}")
+    sections = list(registry.sections.values())
+    if args.sections:
+        try:
+            movable = [registry.getSection(sectionNo) for sectionNo in args.sections]
+        except SectionNotFoundException as e:
+            raise SystemExit(str(e))
+        fixed = [s for s in sections if s.getSectionNo() not in args.sections]
+    else:
+        movable, fixed = sections, []
+
+    try:
+        conflicts = registry.enrollment.conflictGraph() if args.avoid_student_clashes else None
+    except ImportError as e:
+        raise SystemExit(str(e))
+    placements, unplaced = SectionScheduler(rooms, seed=args.seed).solve(movable, fixed, args.time_budget,
+                                                                         conflicts)
+    registry.applySchedule(placements)
+
+    writer = _writer(["sectionNo", "dayOfWeek", "timeOfDay", "room"])
+    for sectionNo, (day, tod, room) in placements.items():
+        writer.writerow({"sectionNo": sectionNo, "dayOfWeek": day, "timeOfDay": tod, "room": room})
+    if unplaced:
+        print(f"could not place: {', '.join(unplaced)}", file=sys.stderr)
+    return bool(placements)
+
+
+def cmd_enroll(registry: Registry, args) -> bool:
+    """Rows are `ssn,sectionNo[,op]` with op "enroll" (default) or "drop"."""
+    writer = _writer(["ssn", "sectionNo", "op", "success", "message"])
+    changed = False
+
+    def apply(op, ssn, sectionNo):
+        # the section, then the student, then the operation: the order the shards check them in
+        try:
+            if op == "enroll":
+                return registry.enroll(ssn, sectionNo)
+            if op == "drop":
+                return (True, "Drop successful") if registry.drop(ssn, sectionNo) else \
+                    (False, "Student not in the section")
+            registry.getSection(sectionNo)
+            registry.getStudent(ssn)
+            return False, f"Unknown operation: {op}"
+        except CourseSystemException as e:
+            return False, str(e)
+
+    def emit(results):
+        nonlocal changed
+        for row, op, success, message in results:
+            changed = changed or success
+            writer.writerow({"ssn": row["ssn"], "sectionNo": row["sectionNo"], "op": op,
+                             "success": success, "message": message})
+
+    if args.workers > 1:
+        # the shards validate students and sections themselves; rows go to them as columns
+        messages = {"enroll": "Enrollment successful", "drop": "Drop successful"}
+        with registry.shardedEnrollment(args.workers) as pool:
+            for chunk in chunked(_rows(args.file), args.batch_size):
+                ops = [row.get("op") or "enroll" for row in chunk]
+                rejected = pool.submit(ops, [row["ssn"] for row in chunk], [row["sectionNo"] for row in chunk])
+                emit([(row, op, False, rejected[i]) if i in rejected else (row, op, True, messages[op])
+                      for i, (row, op) in enumerate(zip(chunk, ops))])
+    else:
+        for chunk in chunked(_rows(args.file), args.batch_size):
+            ops = [row.get("op") or "enroll" for row in chunk]
+            emit([(row, op, *apply(op, row["ssn"], row["sectionNo"])) for row, op in zip(chunk, ops)])
+    return changed
+
+
+def cmd_grades(registry: Registry, args) -> bool:
+    ok, failed = _apply(_rows(args.file), lambda row: registry.postGrade(row["ssn"], row["sectionNo"], row["grade"]))
+    print(f"{ok} grades posted, {failed} failed", file=sys.stderr)
+    return ok > 0
+
+
+def cmd_report(registry: Registry, args) -> bool:
+    if args.kind == "courses":
+        writer = _writer(["courseNo", "courseName", "sections", "capacity", "enrolled", "eligible"])
+        for course in registry.courses.values():
+            sections = course.getSections()
+            writer.writerow({"courseNo": course.getCourseNo(), "courseName": course.getCourseName(),
+                             "sections": len(sections), "capacity": sum(s.getCapacity() for s in sections),
+                             "enrolled": sum(s.getEnrolledCount() for s in sections),
+                             "eligible": registry.eligibility.countEligible(course)})
+    elif args.kind == "co-enrollment":
+        try:
+            pairs = registry.enrollment.topPairs(args.limit)
+        except ImportError as e:
+            raise SystemExit(str(e))
+        writer = _writer(["courseA", "courseB", "students"])
+        for courseA, courseB, students in pairs:
+            writer.writerow({"courseA": courseA, "courseB": courseB, "students": students})
+    else:
+        writer = _writer(["sectionNo", "courseNo", "dayOfWeek", "timeOfDay", "room", "capacity", "enrolled",
+                          "professor"])
+        for section in registry.sections.values():
+            course, professor = section.getCourse(), section.getProfessor()
+            writer.writerow({"sectionNo": section.getSectionNo(), "courseNo": course.getCourseNo() if course else "",
+                             "dayOfWeek": section.getDayOfWeek(), "timeOfDay": section.getTimeOfDay(),
+                             "room": section.getRoom(), "capacity": section.getCapacity(),
+                             "enrolled": section.getEnrolledCount(),
+                             "professor": professor.ssn if professor else ""})
+    return False
+
+
+def cmd_export(registry: Registry, args) -> bool:
+    if args.kind == "transcripts":
+        rows, fields = iterTranscriptRows(registry.students.values(), args.department), TRANSCRIPT_FIELDS
+    else:
+        rows, fields = iterRosterRows(registry.sections.values(), args.department), ROSTER_FIELDS
+    try:
+        count = exportRows(rows, fields, args.file, args.format, args.chunk_size)
+    except ImportError as e:
+        raise SystemExit(str(e))
+    print(f"{count} rows written to {args.file}", file=sys.stderr)
+    return False
+
+
+def cmd_close_semester(registry: Registry, args) -> bool:
+    if args.archive:
+        registry.archive = ScheduleArchive(args.archive)
+    closed = registry.schedule.getSemester()
+    registry.closeSemester(args.semester)
+    print(f"{closed} archived, {args.semester} is now active", file=sys.stderr)
+    return True
+
+
+def cmd_audit(registry: Registry, args) -> bool:
+    auditor = IntegrityAuditor(registry)
+    issues = auditor.auditFull()
+    auditor.close()
+    writer = _writer(["kind", "subject", "message", "repairable"])
+    for issue in issues:
+        writer.writerow({"kind": issue.kind, "subject": issue.subject, "message": issue.message,
+                         "repairable": issue.canRepair()})
+    repaired = auditor.repair(issues) if args.repair else 0
+    print(f"{len(issues)} issues found, {repaired} repaired", file=sys.stderr)
+    return repaired > 0
+
+
+def cmd_deliver(registry: Registry, args) -> bool:
+    """Sends the events saved in the state file; the ones every endpoint accepted are dropped from it."""
+    before = len(registry.outbox)
+    dispatcher = WebhookDispatcher(registry.outbox, args.endpoints)
+    dispatcher.start(fromSeq=0)
+    dispatcher.stop(timeout=args.timeout)
+    for url, stats in dispatcher.getStats().items():
+        print(f"{url}: {stats['delivered']} delivered, {stats['failures']} failed attempts", file=sys.stderr)
+    print(f"{len(registry.outbox)} of {before} events still waiting", file=sys.stderr)
+    return len(registry.outbox) < before
+
+
+def cmd_dump(registry: Registry, args) -> bool:
+    with open(args.file, "w", encoding="utf-8") as fp:
+        count = dumpRegistry(registry, fp)
+    print(f"{count} records written to {args.file}", file=sys.stderr)
+    return False
+
+
+def cmd_restore(registry: Registry, args) -> Registry:
+    with open(args.file, encoding="utf-8") as fp:
+        return loadRegistry(fp)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m srs", description="Bulk registrar operations.")
+    parser.add_argument("--state", required=True, help="registry dump to load and update")
+    parser.add_argument("--sample", action="store_true", help="start from the demo catalog if --state is missing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in [
+        ("import-courses", cmd_import_courses, "CSV: courseNo,courseName,credits,prerequisites (';'-separated)"),
+        ("import-sections", cmd_import_sections,
+         "CSV: courseNo,sectionNo,dayOfWeek,timeOfDay,room,capacity[,professor]"),
+        ("import-students", cmd_import_students, "CSV: name,ssn,major,degree"),
+        ("import-professors", cmd_import_professors, "CSV: name,ssn,title,department"),
+        ("grades", cmd_grades, "CSV: ssn,sectionNo,grade"),
+    ]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("file")
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser("enroll", help="CSV: ssn,sectionNo[,op]")
+    command.add_argument("file")
+    command.add_argument("--workers", type=int, default=1, help="worker processes (sharded by course)")
+    command.add_argument("--batch-size", type=int, default=10000)
+    command.set_defaults(handler=cmd_enroll)
+
+    command = commands.add_parser("schedule", help="place sections into rooms and timeslots")
+    command.add_argument("--rooms", required=True, help="CSV: room,capacity")
+    command.add_argument("--sections", nargs="*", help="only re-solve these sections")
+    command.add_argument("--time-budget", type=float, default=10.0)
+    command.add_argument("--seed", type=int)
+    command.add_argument("--avoid-student-clashes", action="store_true",
+                         help="keep sections that share students in different slots (needs scipy)")
+    command.set_defaults(handler=cmd_schedule)
+
+    command = commands.add_parser("report", help="CSV report on stdout")
+    command.add_argument("kind", choices=["courses", "sections", "co-enrollment"])
+    command.add_argument("--limit", type=int, default=20, help="course pairs for the co-enrollment report")
+    command.set_defaults(handler=cmd_report)
+
+    command = commands.add_parser("export", help="stream every transcript or roster to a file")
+    command.add_argument("kind", choices=["transcripts", "rosters"])
+    command.add_argument("file")
+    command.add_argument("--format", choices=FORMATS, default="csv")
+    command.add_argument("--chunk-size", type=int, default=10000, help="rows held in memory at once")
+    command.add_argument("--department", help="only sections taught by this professor department")
+    command.set_defaults(handler=cmd_export)
+
+    command = commands.add_parser("close-semester", help="archive the active semester and start a new one")
+    command.add_argument("semester", help="name of the new semester")
+    command.add_argument("--archive", help="archive directory (remembered in the state file)")
+    command.set_defaults(handler=cmd_close_semester)
+
+    command = commands.add_parser("audit", help="check enrollment, ownership and transcript links")
+    command.add_argument("--repair", action="store_true", help="fix the issues that can be fixed")
+    command.set_defaults(handler=cmd_audit)
+
+    command = commands.add_parser("deliver", help="POST the events waiting in the state file to webhook endpoints")
+    command.add_argument("endpoints", nargs="+", metavar="url")
+    command.add_argument("--timeout", type=float, default=30.0, help="seconds to keep retrying before giving up")
+    command.set_defaults(handler=cmd_deliver)
+
+    command = commands.add_parser("dump", help="write the state to another file")
+    command.add_argument("file")
+    command.set_defaults(handler=cmd_dump)
+
+    command = commands.add_parser("restore", help="replace the state with a dump")
+    command.add_argument("file")
+    command.set_defaults(handler=cmd_restore)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if os.path.exists(args.state):
+        with open(args.state, encoding="utf-8") as fp:
+            registry = loadRegistry(fp)
+    else:
+        registry = sampleRegistry() if args.sample else Registry()
+
+    result = args.handler(registry, args)
+    if isinstance(result, Registry):
+        registry, result = result, True
+
+    if result or not os.path.exists(args.state):
+        tmp = args.state + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            dumpRegistry(registry, fp)
+        os.replace(tmp, args.state)
+    return 0
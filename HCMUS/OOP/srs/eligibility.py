@@ -0,0 +1,146 @@
+"""Materialized student-by-course eligibility."""
+from typing import List, Dict, Set
+
+from .models import Course, Student
+
+
+class EligibilityMatrix:
+    """Student-by-course eligibility bitsets.
+
+    Each course with prerequisites keeps a bytearray whose bit i is set when
+    the student at row i satisfies all of them. Courses without
+    prerequisites are open to everyone and keep no bits. Setting a bit is
+    O(1). A new student is only evaluated against courses that depend on
+    what their transcript already holds, which is nothing for a fresh
+    student. Posting a grade for a course only re-evaluates the courses that
+    depend on it.
+    """
+
+    def __init__(self):
+        self.__rows: Dict[str, int] = {}          # ssn -> bit index
+        self.__freeRows: List[int] = []
+        self.__students: Dict[int, 'Student'] = {}
+        self.__courses: Dict[str, 'Course'] = {}
+        self.__open: Set[str] = set()             # courses without prerequisites
+        self.__columns: Dict[str, bytearray] = {}  # courseNo -> eligibility bitset
+        self.__counts: Dict[str, int] = {}        # courseNo -> bits set in its column
+        self.__dependents: Dict[str, set] = {}    # courseNo -> courses requiring it
+
+    @classmethod
+    def build(cls, courses, students) -> 'EligibilityMatrix':
+        # courses first, so each student is evaluated once against the finished catalog
+        matrix = cls()
+        for course in courses:
+            matrix.addCourse(course)
+        for student in students:
+            matrix.addStudent(student)
+        return matrix
+
+    def addCourse(self, course: 'Course'):
+        courseNo = course.getCourseNo()
+        self.__courses[courseNo] = course
+        self.__dependents.setdefault(courseNo, set())
+        self.refreshCourse(course)
+
+    def removeCourse(self, course: 'Course'):
+        courseNo = course.getCourseNo()
+        self.__courses.pop(courseNo, None)
+        self.__open.discard(courseNo)
+        self.__columns.pop(courseNo, None)
+        self.__counts.pop(courseNo, None)
+        self.__dependents.pop(courseNo, None)
+        for dependents in self.__dependents.values():
+            dependents.discard(courseNo)
+
+    def refreshCourse(self, course: 'Course'):
+        """Recompute one column, e.g. after its prerequisites changed."""
+        courseNo = course.getCourseNo()
+        prerequisites = course.getPrerequisites()
+        for prereq in prerequisites:
+            self.__dependents.setdefault(prereq.getCourseNo(), set()).add(courseNo)
+        if not prerequisites:
+            self.__open.add(courseNo)
+            self.__columns.pop(courseNo, None)
+            self.__counts.pop(courseNo, None)
+            return
+
+        self.__open.discard(courseNo)
+        self.__columns[courseNo] = bytearray()
+        self.__counts[courseNo] = 0
+        for row, student in self.__students.items():
+            if course.checkPrerequisites(student)[0]:
+                self.__setBit(courseNo, row, True)
+
+    def addStudent(self, student: 'Student'):
+        if student.ssn in self.__rows:
+            return
+        row = self.__freeRows.pop() if self.__freeRows else len(self.__rows)
+        self.__rows[student.ssn] = row
+        self.__students[row] = student
+        # only courses whose prerequisites the transcript touches can be open to this student
+        candidates = set()
+        for courseNo in student.getTranscript().getEntries():
+            candidates.update(self.__dependents.get(courseNo, ()))
+        for courseNo in candidates:
+            if courseNo in self.__columns and self.__courses[courseNo].checkPrerequisites(student)[0]:
+                self.__setBit(courseNo, row, True)
+
+    def removeStudent(self, student: 'Student'):
+        row = self.__rows.pop(student.ssn, None)
+        if row is None:
+            return
+        del self.__students[row]
+        for courseNo in self.__columns:
+            self.__setBit(courseNo, row, False)
+        self.__freeRows.append(row)
+
+    def gradePosted(self, student: 'Student', course: 'Course'):
+        """Update the courses that list `course` as a prerequisite."""
+        row = self.__rows.get(student.ssn)
+        if row is None:
+            return
+        for courseNo in self.__dependents.get(course.getCourseNo(), ()):
+            if courseNo in self.__columns:
+                dependent = self.__courses[courseNo]
+                self.__setBit(courseNo, row, dependent.checkPrerequisites(student)[0])
+
+    def isEligible(self, student: 'Student', course: 'Course') -> bool:
+        courseNo = course.getCourseNo()
+        row = self.__rows.get(student.ssn)
+        if row is None or courseNo not in self.__courses:
+            return course.checkPrerequisites(student)[0]
+        if courseNo in self.__open:
+            return True
+        return self.__getBit(self.__columns[courseNo], row)
+
+    def countEligible(self, course: 'Course') -> int:
+        courseNo = course.getCourseNo()
+        if courseNo in self.__open:
+            return len(self.__rows)
+        return self.__counts.get(courseNo, 0)
+
+    def eligibleStudents(self, course: 'Course') -> List['Student']:
+        courseNo = course.getCourseNo()
+        if courseNo in self.__open:
+            return list(self.__students.values())
+        column = self.__columns.get(courseNo, bytearray())
+        return [student for row, student in self.__students.items() if self.__getBit(column, row)]
+
+    @staticmethod
+    def __getBit(column: bytearray, row: int) -> bool:
+        index = row >> 3
+        return index < len(column) and bool(column[index] & (1 << (row & 7)))
+
+    def __setBit(self, courseNo: str, row: int, value: bool):
+        column = self.__columns[courseNo]
+        index, mask = row >> 3, 1 << (row & 7)
+        if index >= len(column):
+            if not value:
+                return
+            column.extend(bytes(index + 1 - len(column)))
+        if value and not column[index] & mask:
+            column[index] |= mask
+            self.__counts[courseNo] += 1
+        elif not value and column[index] & mask:
+            column[index] &= ~mask & 0xFF
+            self.__counts[courseNo] -= 1
@@ -0,0 +1,96 @@
+"""Outbox of domain events (enrollments, drops, grades, deletions)."""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class DomainEvent:
+    def __init__(self, seq: int, kind: str, ssn: Optional[str], payload: Dict, timestamp: Optional[float] = None):
+        self.seq = seq
+        self.kind = kind
+        self.ssn = ssn          # the student the event is about, used for ordering
+        self.payload = payload
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def toDict(self) -> Dict:
+        return {"seq": self.seq, "kind": self.kind, "ssn": self.ssn, "timestamp": self.timestamp,
+                **self.payload}
+
+    def __str__(self) -> str:
+        return f"#{self.seq} {self.kind} {self.payload}"
+
+
+class Outbox:
+    """Append-only event log that is read in sequence order.
+
+    The Registry records an event in the same call that makes the change, so
+    the log never misses a committed change. Recording only appends to a
+    list. Delivery happens elsewhere (see webhooks.py) and never holds up the
+    caller.
+
+    Events stay until a consumer trims them after delivery; none is dropped
+    unseen. dumpRegistry saves the ones still here with the state, so events
+    recorded by a batch job are delivered by whoever loads the state next.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__events: List[DomainEvent] = []
+        self.__firstSeq = 1     # seq of self.__events[0]
+        self.__nextSeq = 1
+
+    def record(self, kind: str, ssn: Optional[str] = None, **payload) -> DomainEvent:
+        with self.__lock:
+            event = DomainEvent(self.__nextSeq, kind, ssn, payload)
+            self.__events.append(event)
+            self.__nextSeq += 1
+            return event
+
+    def recordMany(self, events: Iterable[Tuple[str, Optional[str], Dict]]) -> int:
+        """Records (kind, ssn, payload) events in order under one lock; returns the last seq."""
+        timestamp = time.time()
+        with self.__lock:
+            recorded = len(self.__events)
+            self.__events.extend(DomainEvent(seq, kind, ssn, payload, timestamp)
+                                 for seq, (kind, ssn, payload) in enumerate(events, self.__nextSeq))
+            self.__nextSeq += len(self.__events) - recorded
+            return self.__nextSeq - 1
+
+    def restore(self, lastSeq: int, events: Iterable[DomainEvent] = ()):
+        """Replaces the log with saved undelivered `events`; numbering continues after `lastSeq`."""
+        events = list(events)
+        firstSeq = events[0].seq if events else lastSeq + 1
+        # after() indexes by seq, so the saved events must be the unbroken tail of the log
+        if [event.seq for event in events] != list(range(firstSeq, lastSeq + 1)):
+            raise ValueError(f"Saved events are not numbered {firstSeq}..{lastSeq} without gaps")
+        with self.__lock:
+            self.__events = events
+            self.__firstSeq = firstSeq
+            self.__nextSeq = lastSeq + 1
+
+    def after(self, seq: int, limit: int = 1000) -> List[DomainEvent]:
+        """Up to `limit` events with a sequence number greater than `seq`."""
+        with self.__lock:
+            start = max(seq + 1 - self.__firstSeq, 0)
+            return self.__events[start:start + limit]
+
+    def trim(self, upto: int):
+        """Forgets events up to and including `upto` once every consumer has them."""
+        with self.__lock:
+            self.__trim(upto)
+
+    def __trim(self, upto: int):
+        drop = min(max(upto + 1 - self.__firstSeq, 0), len(self.__events))
+        del self.__events[:drop]
+        self.__firstSeq += drop
+
+    def lastSeq(self) -> int:
+        return self.__nextSeq - 1
+
+    def pending(self) -> List[DomainEvent]:
+        """Every event not trimmed yet, in sequence order."""
+        with self.__lock:
+            return list(self.__events)
+
+    def __len__(self):
+        return len(self.__events)
@@ -0,0 +1,16 @@
+"""Exceptions raised by the registration system."""
+
+
+class CourseSystemException(Exception):
+    """Base exception for course system errors."""
+    pass
+
+
+class EnrollmentException(CourseSystemException):
+    """Exception raised for enrollment-related errors."""
+    pass
+
+
+class SectionNotFoundException(CourseSystemException):
+    """Exception raised when a section is not found."""
+    pass
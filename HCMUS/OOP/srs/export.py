@@ -0,0 +1,121 @@
+"""Streaming transcript and roster export.
+
+Rows are produced by generators and written one chunk at a time, so memory is
+bounded by the chunk size rather than by the number of students. Parquet
+output needs pyarrow, which is imported only when that format is requested.
+"""
+import csv
+import json
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from .models import Section, Student
+
+TRANSCRIPT_FIELDS = ["ssn", "name", "courseNo", "courseName", "sectionNo", "credits", "grade"]
+ROSTER_FIELDS = ["sectionNo", "courseNo", "courseName", "ssn", "name", "major", "degree"]
+FORMATS = ["csv", "jsonl", "parquet"]
+
+# Parquet column types other than string, as (pyarrow type name, conversion of the row value)
+PARQUET_TYPES = {"credits": ("int32", int), "grade": ("float64", float)}
+
+
+def _inDepartment(section: Section, department: Optional[str]) -> bool:
+    # departments belong to professors, so a section is in the department of whoever teaches it
+    if department is None:
+        return True
+    professor = section.getProfessor()
+    return professor is not None and professor.getDepartment() == department
+
+
+def iterTranscriptRows(students: Iterable[Student], department: Optional[str] = None) -> Iterator[dict]:
+    for student in students:
+        for courseNo, entry in student.getTranscript().getEntries().items():
+            section = entry.getSection()
+            if not _inDepartment(section, department):
+                continue
+            course = section.getCourse()
+            yield {"ssn": student.ssn, "name": student.name, "courseNo": courseNo,
+                   "courseName": course.getCourseName() if course else "",
+                   "sectionNo": section.getSectionNo(),
+                   "credits": course.getCredits() if course else 0, "grade": entry.getGrade()}
+
+
+def iterRosterRows(sections: Iterable[Section], department: Optional[str] = None) -> Iterator[dict]:
+    for section in sections:
+        if not _inDepartment(section, department):
+            continue
+        course = section.getCourse()
+        for student in section.getStudents():
+            yield {"sectionNo": section.getSectionNo(), "courseNo": course.getCourseNo() if course else "",
+                   "courseName": course.getCourseName() if course else "", "ssn": student.ssn,
+                   "name": student.name, "major": student.getMajor(), "degree": student.getDegree()}
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    if size <= 0:
+        raise ValueError("Chunk size must be positive")
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def writeCsv(rows: Iterable[dict], fp: TextIO, fieldnames: List[str], chunkSize: int = 10000) -> int:
+    writer = csv.DictWriter(fp, fieldnames=fieldnames)
+    writer.writeheader()
+    count = 0
+    for chunk in chunked(rows, chunkSize):
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def writeJsonLines(rows: Iterable[dict], fp: TextIO, chunkSize: int = 10000) -> int:
+    count = 0
+    for chunk in chunked(rows, chunkSize):
+        fp.write("".join(json.dumps(row) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+def writeParquet(rows: Iterable[dict], path: str, fieldnames: List[str], chunkSize: int = 10000) -> int:
+    """Writes one Parquet row group per chunk; credits are integers, grades floats, the rest strings."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from None
+
+    types = {field: PARQUET_TYPES.get(field, ("string", str)) for field in fieldnames}
+    schema = pa.schema([(field, getattr(pa, typeName)()) for field, (typeName, _) in types.items()])
+    count = 0
+    writer = None
+    try:
+        for chunk in chunked(rows, chunkSize):
+            columns = {field: [convert(row[field]) for row in chunk] for field, (_, convert) in types.items()}
+            table = pa.Table.from_pydict(columns, schema=schema)
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table)
+            count += len(chunk)
+        if writer is None:
+            pq.write_table(schema.empty_table(), path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def exportRows(rows: Iterable[dict], fieldnames: List[str], path: str, fmt: str = "csv",
+               chunkSize: int = 10000) -> int:
+    """Writes `rows` to `path` in the given format and returns the row count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        return writeParquet(rows, path, fieldnames, chunkSize)
+    with open(path, "w", newline="", encoding="utf-8") as fp:
+        if fmt == "csv":
+            return writeCsv(rows, fp, fieldnames, chunkSize)
+        return writeJsonLines(rows, fp, chunkSize)
@@ -0,0 +1,88 @@
+"""Teaching indexes: sections by professor, by department and unstaffed."""
+from typing import Dict, List, Optional
+
+from .models import Section, Professor
+
+
+class TeachingIndex:
+    """Keeps sections grouped by who teaches them.
+
+    A section belongs to the department of its professor, since courses do
+    not carry a department. Queries return only the matching sections and do
+    not scan the catalog. The Registry keeps the index current when sections
+    are added, (re)assigned or deleted.
+    """
+
+    def __init__(self):
+        self.__byProfessor: Dict[str, Dict[str, Section]] = {}
+        self.__byDepartment: Dict[str, Dict[str, Section]] = {}
+        self.__unstaffed: Dict[str, Section] = {}
+        self.__credits: Dict[str, int] = {}
+        self.__professors: Dict[str, Professor] = {}
+
+    def addSection(self, section: Section):
+        professor = section.getProfessor()
+        if professor is None:
+            self.__unstaffed[section.getSectionNo()] = section
+        else:
+            self.__link(section, professor)
+
+    def removeSection(self, section: Section):
+        sectionNo = section.getSectionNo()
+        self.__unstaffed.pop(sectionNo, None)
+        professor = section.getProfessor()
+        if professor is not None:
+            self.__unlink(section, professor)
+
+    def assign(self, section: Section, previous: Optional[Professor]):
+        """Call after `section`'s professor changed from `previous`."""
+        if previous is not None:
+            self.__unlink(section, previous)
+        self.__unstaffed.pop(section.getSectionNo(), None)
+        self.addSection(section)
+
+    def addProfessor(self, professor: Professor):
+        self.__professors[professor.ssn] = professor
+        self.__byProfessor.setdefault(professor.ssn, {})
+        self.__credits.setdefault(professor.ssn, 0)
+
+    def removeProfessor(self, professor: Professor):
+        if self.__byProfessor.get(professor.ssn):
+            raise ValueError(f"Professor {professor.ssn} still teaches sections")
+        self.__professors.pop(professor.ssn, None)
+        self.__byProfessor.pop(professor.ssn, None)
+        self.__credits.pop(professor.ssn, None)
+
+    # queries
+    def sectionsOfProfessor(self, professor: Professor) -> List[Section]:
+        return list(self.__byProfessor.get(professor.ssn, {}).values())
+
+    def sectionsOfDepartment(self, department: str) -> List[Section]:
+        return list(self.__byDepartment.get(department, {}).values())
+
+    def unstaffedSections(self) -> List[Section]:
+        return list(self.__unstaffed.values())
+
+    def departments(self) -> List[str]:
+        return [department for department, sections in self.__byDepartment.items() if sections]
+
+    def teachingLoad(self, professor: Professor) -> tuple[int, int]:
+        """Returns (sections, credits) taught by the professor."""
+        return len(self.__byProfessor.get(professor.ssn, ())), self.__credits.get(professor.ssn, 0)
+
+    def teachingLoads(self) -> Dict[str, tuple[int, int]]:
+        return {ssn: (len(sections), self.__credits[ssn]) for ssn, sections in self.__byProfessor.items()}
+
+    def __link(self, section: Section, professor: Professor):
+        sectionNo = section.getSectionNo()
+        self.addProfessor(professor)
+        if sectionNo not in self.__byProfessor[professor.ssn]:
+            self.__byProfessor[professor.ssn][sectionNo] = section
+            self.__credits[professor.ssn] += section.getCourse().getCredits() if section.getCourse() else 0
+        self.__byDepartment.setdefault(professor.getDepartment(), {})[sectionNo] = section
+
+    def __unlink(self, section: Section, professor: Professor):
+        sectionNo = section.getSectionNo()
+        if self.__byProfessor.get(professor.ssn, {}).pop(sectionNo, None) is not None:
+            self.__credits[professor.ssn] -= section.getCourse().getCredits() if section.getCourse() else 0
+        self.__byDepartment.get(professor.getDepartment(), {}).pop(sectionNo, None)
@@ -0,0 +1,178 @@
+"""Sparse student-by-section enrollment matrix for co-enrollment analytics."""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .models import Section, Student
+
+
+def _scipy():
+    try:
+        import numpy as np
+        import scipy.sparse as sparse
+    except ImportError:
+        raise ImportError("Co-enrollment analytics require scipy (pip install scipy)") from None
+    return np, sparse
+
+
+class EnrollmentMatrix:
+    """Student-by-section 0/1 matrix kept in step with enroll and drop.
+
+    Updates only touch a set per section, so they need neither numpy nor
+    scipy. The CSR matrix is built on first use and kept until the next
+    update. The questions below are sparse products: A.T @ A counts the
+    students every pair of sections shares, and the same product over a
+    student-by-course matrix counts them per pair of courses.
+    """
+
+    def __init__(self):
+        self.__rows: Dict[str, int] = {}          # ssn -> row
+        self.__freeRows: List[int] = []
+        self.__columns: Dict[str, int] = {}       # sectionNo -> column
+        self.__freeColumns: List[int] = []
+        self.__sectionNos: Dict[int, str] = {}    # column -> sectionNo
+        self.__courseNos: Dict[int, str] = {}     # column -> courseNo
+        self.__enrolled: Dict[int, Set[int]] = {}  # column -> rows
+        self.__csr = None
+
+    @classmethod
+    def build(cls, students: Iterable[Student], sections: Iterable[Section]) -> 'EnrollmentMatrix':
+        matrix = cls()
+        for student in students:
+            matrix.addStudent(student)
+        for section in sections:
+            matrix.addSection(section)
+            for student in section.getStudents():
+                matrix.enrolled(student, section)
+        return matrix
+
+    def addStudent(self, student: Student):
+        if student.ssn not in self.__rows:
+            self.__rows[student.ssn] = self.__freeRows.pop() if self.__freeRows else len(self.__rows)
+            self.__csr = None
+
+    def removeStudent(self, student: Student):
+        row = self.__rows.pop(student.ssn, None)
+        if row is None:
+            return
+        for rows in self.__enrolled.values():
+            rows.discard(row)
+        self.__freeRows.append(row)
+        self.__csr = None
+
+    def addSection(self, section: Section):
+        sectionNo = section.getSectionNo()
+        if sectionNo in self.__columns:
+            return
+        column = self.__freeColumns.pop() if self.__freeColumns else len(self.__columns)
+        course = section.getCourse()
+        self.__columns[sectionNo] = column
+        self.__sectionNos[column] = sectionNo
+        self.__courseNos[column] = course.getCourseNo() if course else ""
+        self.__enrolled[column] = set()
+        self.__csr = None
+
+    def removeSection(self, section: Section):
+        column = self.__columns.pop(section.getSectionNo(), None)
+        if column is None:
+            return
+        del self.__sectionNos[column], self.__courseNos[column], self.__enrolled[column]
+        self.__freeColumns.append(column)
+        self.__csr = None
+
+    def enrolled(self, student: Student, section: Section):
+        self.__enrolled[self.__columns[section.getSectionNo()]].add(self.__rows[student.ssn])
+        self.__csr = None
+
+    def dropped(self, student: Student, section: Section):
+        column = self.__columns.get(section.getSectionNo())
+        row = self.__rows.get(student.ssn)
+        if column is not None and row is not None:
+            self.__enrolled[column].discard(row)
+            self.__csr = None
+
+    def rostersChanged(self, sections: Iterable[Section]):
+        """Re-reads the columns of sections whose rosters were replaced in bulk."""
+        rows = self.__rows
+        for section in sections:
+            column = self.__columns.get(section.getSectionNo())
+            if column is not None:
+                self.__enrolled[column] = {rows[student.ssn] for student in section.getStudents()}
+        self.__csr = None
+
+    def __len__(self):
+        """Number of enrollments (non-zero entries)."""
+        return sum(len(rows) for rows in self.__enrolled.values())
+
+    def toCsr(self):
+        """The matrix as scipy.sparse.csr_matrix; freed rows and columns are left empty."""
+        if self.__csr is None:
+            np, sparse = _scipy()
+            shape = (len(self.__rows) + len(self.__freeRows), len(self.__columns) + len(self.__freeColumns))
+            count = len(self)
+            rows = np.empty(count, dtype=np.int32)
+            columns = np.empty(count, dtype=np.int32)
+            start = 0
+            for column, members in self.__enrolled.items():
+                end = start + len(members)
+                rows[start:end] = np.fromiter(members, dtype=np.int32, count=len(members))
+                columns[start:end] = column
+                start = end
+            self.__csr = sparse.csr_matrix((np.ones(count, dtype=np.int32), (rows, columns)), shape=shape)
+        return self.__csr
+
+    def sectionOverlaps(self) -> Tuple[Dict[int, str], object]:
+        """(column -> sectionNo, sections x sections CSR of shared students).
+
+        The diagonal holds each section's enrollment.
+        """
+        matrix = self.toCsr()
+        return dict(self.__sectionNos), (matrix.T @ matrix).tocsr()
+
+    def __studentCourses(self):
+        np, sparse = _scipy()
+        courses = sorted(set(self.__courseNos.values()) - {""})
+        index = {courseNo: i for i, courseNo in enumerate(courses)}
+        matrix = self.toCsr()
+        columns = [c for c, courseNo in self.__courseNos.items() if courseNo in index]
+        toCourse = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int32),
+             (np.array(columns, dtype=np.int32), np.array([index[self.__courseNos[c]] for c in columns],
+                                                           dtype=np.int32))),
+            shape=(matrix.shape[1], len(courses)))
+        takes = (matrix @ toCourse).tocsr()
+        takes.data[:] = 1       # a student in two sections of a course still counts once
+        return courses, takes
+
+    def courseOverlaps(self) -> Tuple[List[str], object]:
+        """(courseNos, courses x courses CSR of students taking both); the diagonal is each course's headcount."""
+        courses, takes = self.__studentCourses()
+        return courses, (takes.T @ takes).tocsr()
+
+    def coEnrollment(self, courseA: str, courseB: str) -> int:
+        """How many students take both courses."""
+        courses, takes = self.__studentCourses()
+        if courseA not in courses or courseB not in courses:
+            return 0
+        takes = takes.tocsc()
+        return int(takes[:, courses.index(courseA)].multiply(takes[:, courses.index(courseB)]).sum())
+
+    def topPairs(self, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """Course pairs most often taken together, as (courseA, courseB, students)."""
+        np, _ = _scipy()
+        courses, overlaps = self.courseOverlaps()
+        pairs = overlaps.tocoo()
+        upper = pairs.row < pairs.col
+        rows, columns, counts = pairs.row[upper], pairs.col[upper], pairs.data[upper]
+        # courses are sorted, so ties fall back to course number order
+        top = np.lexsort((columns, rows, -counts))[:limit]
+        return [(courses[rows[i]], courses[columns[i]], int(counts[i])) for i in top]
+
+    def conflictGraph(self, minShared: int = 1) -> Dict[str, Set[str]]:
+        """Sections that share at least `minShared` students, so they should not share a timeslot."""
+        sectionNos, overlaps = self.sectionOverlaps()
+        pairs = overlaps.tocoo()
+        keep = (pairs.row != pairs.col) & (pairs.data >= minShared)
+        graph: Dict[str, Set[str]] = {}
+        for a, b in zip(pairs.row[keep].tolist(), pairs.col[keep].tolist()):
+            graph.setdefault(sectionNos[a], set()).add(sectionNos[b])
+        return graph
+
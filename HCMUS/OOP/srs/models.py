@@ -0,0 +1,471 @@
+"""Domain model of the student registration system: courses, sections, people and transcripts.
+
+Collections held by the model (rosters, schedules, prerequisites, transcript
+entries) are copy-on-write: a write replaces the tuple or dict, it never
+edits it. Getters can therefore hand out the stored value without copying,
+and whoever holds it keeps a stable view while enrollment goes on.
+"""
+import threading
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+TIMES_OF_DAY = ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM",
+                "1:00 PM", "2:00 PM", "3:00 PM", "4:00 PM"]
+
+_changeLock = threading.Lock()
+_changes = 0
+_trackers: List['ChangeTracker'] = []
+
+
+def markChanged(*owners):
+    """Records a write to the object graph, so cached snapshots know they are stale.
+
+    `owners` are the objects that were written. They are stamped with the new
+    change count, so a snapshot can keep its view of every object that was
+    not, and they are handed to every open ChangeTracker.
+    """
+    global _changes
+    with _changeLock:
+        _changes += 1
+        for owner in owners:
+            owner._version = _changes
+        for tracker in _trackers:
+            for owner in owners:
+                tracker._add(owner)
+
+
+class ChangeTracker:
+    """Collects the model objects written since the last drain().
+
+    It sees every write made through the model, whether or not it went
+    through the Registry. Call close() when done; until then every write is
+    kept, once per object.
+    """
+
+    def __init__(self):
+        self.__changed: Dict[int, object] = {}    # id -> object, so unhashable owners work too
+        with _changeLock:
+            _trackers.append(self)
+
+    def _add(self, owner):
+        # called by markChanged with the change lock held
+        self.__changed[id(owner)] = owner
+
+    def drain(self) -> List[object]:
+        """The objects written since the previous drain(), each once."""
+        with _changeLock:
+            changed, self.__changed = self.__changed, {}
+        return list(changed.values())
+
+    def close(self):
+        with _changeLock:
+            if self in _trackers:
+                _trackers.remove(self)
+
+
+def changeCount() -> int:
+    return _changes
+
+
+def versionOf(owner) -> int:
+    """The change count of the last write to `owner`, or 0 if it was never written."""
+    return getattr(owner, "_version", 0)
+
+
+class Course:
+    def __init__(self, courseNo: str, courseName: str, credits: int):
+        if not courseNo or not courseName:  # Dùng raise valueError để chặn dữ liệu sai
+            raise ValueError("Course number and course name cannot be empty")
+        if credits <= 0:
+            raise ValueError("Credits cannot be less than zero")
+
+        self.__courseNo = courseNo
+        self.__courseName = courseName
+        self.__credits = credits
+        self.__prerequisites: Tuple['Course', ...] = ()
+        self.__sections: Tuple['Section', ...] = ()
+
+    def scheduleOfSection(self, sectionNo: str, dayOfWeek: str, timeOfDay: str, room: str,
+                          seatingCapacity: int) -> 'Section':
+        if seatingCapacity <= 0:
+            raise ValueError("Seating capacity must be positive")
+
+        section = Section(sectionNo, dayOfWeek, timeOfDay, room, seatingCapacity)
+        section.setCourse(self)
+        self.__sections += (section,)
+        markChanged(self)
+        return section
+
+    def removeSection(self, section: 'Section') -> bool:
+        if section in self.__sections:
+            self.__sections = tuple(s for s in self.__sections if s is not section)
+            markChanged(self)
+            return True
+        return False
+
+    def addPrerequisites(self, prerequisite: 'Course'):
+        if prerequisite not in self.__prerequisites:
+            self.__prerequisites += (prerequisite,)
+            markChanged(self)
+
+    def hasPrerequisites(self) -> bool:
+        return len(self.__prerequisites) > 0
+
+    def checkPrerequisites(self, student: 'Student') -> tuple[bool, str]:
+        """Returns (satisfied, message) for the student's transcript."""
+        transcript = student.getTranscript()
+        for course in self.__prerequisites:
+            grade = transcript.getGrade(course.getCourseNo())
+            if grade is None:
+                return False, f"Missing prerequisite: {course.getCourseNo()}"
+            if float(grade) < 5.0:
+                return False, f"Low grade for prerequisite {course.getCourseNo()}: {grade}"
+        return True, ""
+
+    # getter
+    def getPrerequisites(self) -> Tuple['Course', ...]:
+        return self.__prerequisites
+
+    def getCourseNo(self) -> str:
+        return self.__courseNo
+
+    def getCourseName(self) -> str:
+        return self.__courseName
+
+    def getCredits(self) -> int:
+        return self.__credits
+
+    def getSections(self) -> Tuple['Section', ...]:
+        return self.__sections
+
+    # display dùng str cho streamlit sau này
+    def __str__(self) -> str:
+        return f"{self.__courseNo} - {self.__courseName} ({self.__credits} credits)"  
+
+
+class Section:
+    def __init__(self, sectionNo: str, dayOfWeek: str, timeOfDay: str, room: str, seatingCapacity: int):
+        if not sectionNo or not room:
+            raise ValueError("Section number and room cannot be empty")
+        if seatingCapacity <= 0:
+            raise ValueError("Seating capacity must be positive")
+
+        self.__sectionNo = sectionNo
+        self.__dayOfWeek = dayOfWeek
+        self.__timeOfDay = timeOfDay
+        self.__room = room
+        self.__seatingCapacity = seatingCapacity
+
+        self.__course: Optional['Course'] = None
+        self.__students: Tuple['Student', ...] = ()
+        self.__professor: Optional['Professor'] = None
+        # reentrant, so a caller holding it (see RegistrationCart.checkout) can still enroll and drop
+        self.__lock = threading.RLock()
+
+    def postGrade(self, student: 'Student', grade: str):
+        if student not in self.__students:
+            raise ValueError("Student not in the section")
+        transcript = student.getTranscript()
+        transcript.addEntry(self, grade)
+
+    def confirmSeatAvailability(self) -> bool:
+        return len(self.__students) < self.__seatingCapacity
+
+    def enroll(self, student: 'Student') -> tuple[bool, str]:
+        """Returns (success, message)"""
+        try:
+            with self.__lock:
+                if student in self.__students:
+                    return False, "Student already enrolled in this section"
+                if not self.confirmSeatAvailability():
+                    return False, "Section is full"
+                if self.__course and self.__course.hasPrerequisites():
+                    satisfied, message = self.__course.checkPrerequisites(student)
+                    if not satisfied:
+                        return False, message
+
+                self.__students += (student,)
+                student.attendSection(self)
+                markChanged(self)
+                return True, "Enrollment successful"
+
+        except Exception as e:
+            return False, str(e)
+
+    def restoreStudent(self, student: 'Student'):
+        """Links a saved enrollment back without checking seats or prerequisites."""
+        with self.__lock:
+            if student not in self.__students:
+                self.__students += (student,)
+                student.attendSection(self)
+                markChanged(self)
+
+    def restoreRoster(self, students: Iterable['Student']):
+        """Replaces the roster with one kept elsewhere (see ShardedEnrollment) and the students' side to match."""
+        with self.__lock:
+            before = set(self.__students)
+            self.__students = tuple(students)
+            left = [student for student in before.difference(self.__students) if student._leave(self)]
+            joined = [student for student in set(self.__students).difference(before) if student._attend(self)]
+            markChanged(self, *left, *joined)
+
+    def drop(self, student: 'Student') -> bool:
+        with self.__lock:
+            if student not in self.__students:
+                return False
+            self.__students = tuple(s for s in self.__students if s is not student)
+            student.dropSection(self)
+            markChanged(self)
+            return True
+
+    # getter & setter
+    def getSectionNo(self):
+        return self.__sectionNo
+
+    def getDayOfWeek(self):
+        return self.__dayOfWeek
+
+    def getTimeOfDay(self):
+        return self.__timeOfDay
+
+    def getRoom(self):
+        return self.__room
+
+    def getCourse(self):
+        return self.__course
+
+    def getCapacity(self):
+        return self.__seatingCapacity
+
+    def setDayOfWeek(self, dayOfWeek):
+        self.__dayOfWeek = dayOfWeek
+        markChanged(self)
+
+    def setTimeOfDay(self, timeOfDay):
+        self.__timeOfDay = timeOfDay
+        markChanged(self)
+
+    def setRoom(self, room):
+        if not room:
+            raise ValueError("Room cannot be empty")
+        self.__room = room
+        markChanged(self)
+
+    def setCourse(self, course):
+        self.__course = course
+        markChanged(self)
+
+    def getStudents(self) -> Tuple['Student', ...]:
+        return self.__students
+
+    def setProfessor(self, professor):
+        self.__professor = professor
+        markChanged(self)
+
+    def getProfessor(self):
+        return self.__professor
+
+    def getLock(self) -> threading.RLock:
+        """Held while the roster changes; hold it to check and change several sections together."""
+        return self.__lock
+
+    def getEnrolledCount(self) -> int:  
+        return len(self.__students)
+
+    def __str__(self) -> str:
+        course_name = self.__course.getCourseName() if self.__course else "Unknown"
+        return f"{self.__sectionNo} - {course_name}"
+
+
+class Person(ABC):
+    def __init__(self, name: str, ssn: str):
+        if not name or not ssn:
+            raise ValueError("Person name and SSN cannot be empty")
+        self.name = name
+        self.ssn = ssn
+
+    @abstractmethod
+    def display(self):
+        pass
+
+
+class Student(Person):
+    def __init__(self, name: str, ssn: str, major: str, degree: str):
+        super().__init__(name, ssn)
+        if not major or not degree:
+            raise ValueError("Student name and major and degree cannot be empty")
+        self.__major = major
+        self.__degree = degree
+        self.__sections: Tuple['Section', ...] = ()
+        self.__Transcript = Transcript(self)
+
+    # getter & seter
+    def getMajor(self) -> str:
+        return self.__major
+
+    def getDegree(self) -> str:
+        return self.__degree
+
+    def getSections(self) -> Tuple['Section', ...]:
+        return self.__sections
+
+    def setMajor(self, major):
+        self.__major = major
+        markChanged(self)
+
+    def setDegree(self, degree):
+        self.__degree = degree
+        markChanged(self)
+
+    def getTranscript(self):
+        return self.__Transcript
+
+    def attendSection(self, section: 'Section'):
+        if self._attend(section):
+            markChanged(self)
+
+    def dropSection(self, section):
+        if self._leave(section):
+            markChanged(self)
+            return True
+        return False
+
+    def _attend(self, section: 'Section') -> bool:
+        # attendSection without the stamp; Section.restoreRoster stamps all its students at once
+        if section in self.__sections:
+            return False
+        self.__sections += (section,)
+        return True
+
+    def _leave(self, section: 'Section') -> bool:
+        if section not in self.__sections:
+            return False
+        self.__sections = tuple(s for s in self.__sections if s is not section)
+        return True
+
+    def display(self):
+        pass
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ssn}) - {self.__major}, {self.__degree}"
+
+
+class Professor(Person):
+    def __init__(self, name: str, ssn: str, title: str, department: str):
+        super().__init__(name, ssn)
+        if not title or not department:
+            raise ValueError("Professor name and department cannot be empty")
+        self.__title = title
+        self.__department = department
+        self.__sections: Tuple['Section', ...] = ()
+
+    # getter & setter
+    def getTitle(self):
+        return self.__title
+
+    def setTitle(self, title):
+        self.__title = title
+        markChanged(self)
+
+    def getDepartment(self):
+        return self.__department
+
+    def setDepartment(self, department):
+        self.__department = department
+        markChanged(self)
+
+    def getSections(self) -> Tuple['Section', ...]:
+        return self.__sections
+
+    def agreeToTeach(self, section):
+        if section not in self.__sections:
+            self.__sections += (section,)
+            section.setProfessor(self)
+
+    def dropSection(self, section):
+        if section in self.__sections:
+            self.__sections = tuple(s for s in self.__sections if s is not section)
+            markChanged(self)
+            if section.getProfessor() is self:
+                section.setProfessor(None)
+            return True
+        return False
+
+    def display(self) -> None:
+        pass
+
+    def __str__(self) -> str:
+        return f"{self.__title} {self.name} - {self.__department}"
+
+
+class TranscriptEntry:
+    """One grade. Entries are never changed in place; a new grade or section replaces the entry."""
+
+    def __init__(self, section: 'Section', grade: str):
+        self.__section = section
+        self.__grade = grade
+
+    # getter
+    def getGrade(self):
+        return self.__grade
+
+    def getSection(self):
+        return self.__section
+
+
+class Transcript:
+    """Manager a student's academic transcript."""
+
+    def __init__(self, student: Optional['Student'] = None):
+        self.__student = student
+        self.__entries: Dict[str, TranscriptEntry] = {}
+
+    def getStudent(self) -> Optional['Student']:
+        return self.__student
+
+    def addEntry(self, section, grade: str):
+        entry = TranscriptEntry(section, grade)
+        course = section.getCourse()
+        if course:
+            courseNo = course.getCourseNo()
+            self.__entries = {**self.__entries, courseNo: entry}
+            markChanged(self)
+
+    def getGrade(self, courseNo):
+        te = self.__entries.get(courseNo)
+        if te is None:
+            return None
+        return te.getGrade()
+
+    def getEntries(self) -> Mapping[str, TranscriptEntry]:
+        """Read-only view of the entries by course number; later grades do not show up in it."""
+        return MappingProxyType(self.__entries)
+
+
+class ScheduleOfClasses:
+    """The sections offered in one semester.
+
+    `sections` is the Registry's dict, which only the Registry writes (see
+    Registry.addSection, deleteSection and closeSemester); this is a
+    read-only view of it with the semester's name.
+    """
+
+    def __init__(self, semester: str, sections: Optional[Dict[str, 'Section']] = None):
+        if not semester:
+            raise ValueError("Semester cannot be empty")
+        self.__semester = semester
+        self.__sections: Dict[str, 'Section'] = sections if sections is not None else {}
+
+    def getSemester(self) -> str:
+        return self.__semester
+
+    def getSections(self) -> List['Section']:
+        return list(self.__sections.values())
+
+    def __len__(self):
+        return len(self.__sections)
+
+    def __str__(self) -> str:
+        return f"{self.__semester} ({len(self.__sections)} sections)"
@@ -0,0 +1,100 @@
+"""Preference-based batch registration."""
+import random
+from typing import List, Dict, Optional, Callable
+
+from .eligibility import EligibilityMatrix
+from .models import Section, Student
+
+
+class RegistrationWindow:
+    """Queue of ranked section preferences allocated in one batch.
+
+    Students are ordered by priority and then by a seeded lottery. Seats are
+    handed out in rounds: each round every student gets at most one more
+    section, namely the best-ranked remaining preference that has a free seat,
+    whose prerequisites are met and whose course the student does not hold yet.
+    """
+
+    def __init__(self, maxPreferences: int = 10):
+        self.__maxPreferences = maxPreferences
+        self.__queue: Dict[str, tuple['Student', List['Section']]] = {}
+
+    def submitPreferences(self, student: 'Student', sections: List['Section']):
+        if not sections:
+            raise ValueError("At least one section preference is required")
+        if len(sections) > self.__maxPreferences:
+            raise ValueError(f"At most {self.__maxPreferences} preferences are allowed")
+        self.__queue[student.ssn] = (student, list(sections))
+
+    def withdraw(self, student: 'Student') -> bool:
+        return self.__queue.pop(student.ssn, None) is not None
+
+    def getPreferences(self) -> Dict[str, List['Section']]:
+        return {ssn: sections.copy() for ssn, (_, sections) in self.__queue.items()}
+
+    def __len__(self):
+        return len(self.__queue)
+
+    def allocate(self, seed: Optional[int] = None,
+                 priority: Optional[Callable[['Student'], int]] = None,
+                 eligibility: Optional['EligibilityMatrix'] = None) -> Dict[str, List[str]]:
+        """Enrolls the queued students and empties the queue.
+
+        Returns the section numbers each student was enrolled in.
+        """
+        lottery = random.Random(seed)
+        tickets = {ssn: lottery.random() for ssn in self.__queue}
+        order = sorted(self.__queue.values(),
+                       key=lambda item: (-(priority(item[0]) if priority else 0), tickets[item[0].ssn]))
+
+        freeSeats: Dict[str, int] = {}
+        heldCourses: Dict[str, set] = {}
+        cursors = {student.ssn: 0 for student, _ in order}
+        assigned: Dict[str, List['Section']] = {student.ssn: [] for student, _ in order}
+
+        for student, sections in order:
+            heldCourses[student.ssn] = {s.getCourse().getCourseNo() for s in student.getSections() if s.getCourse()}
+            for section in sections:
+                freeSeats.setdefault(section.getSectionNo(), section.getCapacity() - section.getEnrolledCount())
+
+        active = order
+        while active:
+            stillActive = []
+            for student, sections in active:
+                cursor = cursors[student.ssn]
+                while cursor < len(sections):
+                    section = sections[cursor]
+                    cursor += 1
+                    if self.__accepts(student, section, freeSeats, heldCourses[student.ssn], eligibility):
+                        freeSeats[section.getSectionNo()] -= 1
+                        if section.getCourse():
+                            heldCourses[student.ssn].add(section.getCourse().getCourseNo())
+                        assigned[student.ssn].append(section)
+                        break
+                cursors[student.ssn] = cursor
+                if cursor < len(sections):
+                    stillActive.append((student, sections))
+            active = stillActive
+
+        result: Dict[str, List[str]] = {}
+        for student, _ in order:
+            result[student.ssn] = []
+            for section in assigned[student.ssn]:
+                success, _ = section.enroll(student)
+                if success:
+                    result[student.ssn].append(section.getSectionNo())
+        self.__queue.clear()
+        return result
+
+    @staticmethod
+    def __accepts(student, section, freeSeats, heldCourses, eligibility) -> bool:
+        if freeSeats[section.getSectionNo()] <= 0:
+            return False
+        course = section.getCourse()
+        if course is None:
+            return student not in section.getStudents()
+        if course.getCourseNo() in heldCourses:
+            return False
+        if eligibility is not None:
+            return eligibility.isEligible(student, course)
+        return course.checkPrerequisites(student)[0]
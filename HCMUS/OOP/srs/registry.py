@@ -0,0 +1,413 @@
+"""Registrar operations shared by the Streamlit app and batch jobs."""
+import functools
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Iterable, Optional
+
+from .archive import ScheduleArchive
+from .cart import RegistrationCart
+from .eligibility import EligibilityMatrix
+from .events import Outbox
+from .exceptions import CourseSystemException, SectionNotFoundException
+from .indexes import TeachingIndex
+from .matrix import EnrollmentMatrix
+from .models import Course, Section, Student, Professor, ScheduleOfClasses, changeCount, markChanged
+from .registration import RegistrationWindow
+from .sharding import ShardedEnrollment
+from .snapshot import RegistrySnapshot
+
+
+def _writes(method):
+    """Runs a Registry mutation under the registry's write lock."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.writeLock:
+            self._Registry__writing += 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._Registry__writing -= 1
+    return locked
+
+
+class Registry:
+    """Holds the courses, students, professors and the active semester's sections.
+
+    `sections` backs the active ScheduleOfClasses, `schedule`, and only
+    methods here write to it. Past semesters live in the optional
+    ScheduleArchive and are only read back on demand.
+
+    Every mutation goes through a method here so that both sides of the
+    student/section link, the eligibility matrix, the enrollment matrix and
+    the teaching index stay in step, and so that each enrollment, drop, grade and deletion is
+    recorded in the outbox.
+
+    Mutations hold `writeLock`, so a snapshot that keeps colliding with
+    writers can wait for a quiet moment instead. Reports should read from
+    snapshot() rather than from the live objects.
+    """
+
+    def __init__(self, semester: str = "Current", archive: Optional[ScheduleArchive] = None):
+        self.courses: Dict[str, Course] = {}
+        self.sections: Dict[str, Section] = {}
+        self.schedule = ScheduleOfClasses(semester, self.sections)
+        self.archive = archive
+        self.students: Dict[str, Student] = {}
+        self.professors: Dict[str, Professor] = {}
+        self.eligibility = EligibilityMatrix()
+        self.teaching = TeachingIndex()
+        self.enrollment = EnrollmentMatrix()
+        self.outbox = Outbox()
+        self.writeLock = threading.RLock()
+        self.__writing = 0
+        self.__snapshot: Optional[RegistrySnapshot] = None
+
+    # lookups
+    def getCourse(self, courseNo: str) -> Course:
+        if courseNo not in self.courses:
+            raise CourseSystemException(f"Course {courseNo} not found")
+        return self.courses[courseNo]
+
+    def getSection(self, sectionNo: str) -> Section:
+        if sectionNo not in self.sections:
+            raise SectionNotFoundException(f"Section {sectionNo} not found")
+        return self.sections[sectionNo]
+
+    def getStudent(self, ssn: str) -> Student:
+        if ssn not in self.students:
+            raise CourseSystemException(f"Student {ssn} not found")
+        return self.students[ssn]
+
+    def getProfessor(self, ssn: str) -> Professor:
+        if ssn not in self.professors:
+            raise CourseSystemException(f"Professor {ssn} not found")
+        return self.professors[ssn]
+
+    # courses and sections
+    @_writes
+    def addCourse(self, courseNo: str, courseName: str, credits: int,
+                  prerequisites: Iterable[str] = ()) -> Course:
+        if courseNo in self.courses:
+            raise CourseSystemException("Course code already exists!")
+        course = Course(courseNo, courseName, credits)
+        for prereq_code in prerequisites:
+            course.addPrerequisites(self.getCourse(prereq_code))
+        self.courses[courseNo] = course
+        self.eligibility.addCourse(course)
+        markChanged()
+        return course
+
+    @_writes
+    def addPrerequisite(self, courseNo: str, prereqNo: str):
+        """Adds a prerequisite to an existing course; who may take it is recomputed right away."""
+        course, prerequisite = self.getCourse(courseNo), self.getCourse(prereqNo)
+        # a cycle would make the course impossible to take and the dump impossible to order
+        pending, seen = [prerequisite], set()
+        while pending:
+            current = pending.pop()
+            if current is course:
+                raise CourseSystemException(f"{courseNo} is already required before {prereqNo}")
+            if current.getCourseNo() not in seen:
+                seen.add(current.getCourseNo())
+                pending.extend(current.getPrerequisites())
+        course.addPrerequisites(prerequisite)
+        self.eligibility.refreshCourse(course)
+        markChanged()
+
+    @_writes
+    def addSection(self, courseNo: str, sectionNo: str, dayOfWeek: str, timeOfDay: str, room: str,
+                   seatingCapacity: int) -> Section:
+        if sectionNo in self.sections:
+            raise CourseSystemException("Section number already exists!")
+        section = self.getCourse(courseNo).scheduleOfSection(sectionNo, dayOfWeek, timeOfDay, room,
+                                                             seatingCapacity)
+        self.sections[sectionNo] = section
+        self.teaching.addSection(section)
+        self.enrollment.addSection(section)
+        markChanged()
+        return section
+
+    def dependentCourses(self, courseNo: str) -> List[str]:
+        """Courses that list `courseNo` as a prerequisite."""
+        course = self.getCourse(courseNo)
+        return [code for code, other in self.courses.items()
+                if code != courseNo and course in other.getPrerequisites()]
+
+    @_writes
+    def deleteCourse(self, courseNo: str):
+        dependents = self.dependentCourses(courseNo)
+        if dependents:
+            raise CourseSystemException(f"Course {courseNo} is a prerequisite for: {', '.join(dependents)}")
+        course = self.courses[courseNo]
+        for section in course.getSections():
+            self.deleteSection(section.getSectionNo())
+        del self.courses[courseNo]
+        self.eligibility.removeCourse(course)
+        markChanged()
+        self.outbox.record("course_deleted", courseNo=courseNo)
+
+    @_writes
+    def deleteSection(self, sectionNo: str):
+        section = self.getSection(sectionNo)
+        for student in section.getStudents():
+            section.drop(student)
+            self.outbox.record("dropped", student.ssn, sectionNo=sectionNo)
+        self.teaching.removeSection(section)
+        self.enrollment.removeSection(section)
+        if section.getProfessor():
+            section.getProfessor().dropSection(section)
+        if section.getCourse():
+            section.getCourse().removeSection(section)
+        del self.sections[sectionNo]
+        markChanged()
+        self.outbox.record("section_deleted", sectionNo=sectionNo)
+
+    @_writes
+    def applySchedule(self, placements: Dict[str, tuple]):
+        """Moves sections to the (dayOfWeek, timeOfDay, room) SectionScheduler.solve chose for them."""
+        # checked up front, so a bad placement leaves every section where it was
+        sections = {sectionNo: self.getSection(sectionNo) for sectionNo in placements}
+        for sectionNo, (day, tod, room) in placements.items():
+            if not room:
+                raise CourseSystemException(f"No room in the placement for {sectionNo}")
+        for sectionNo, (day, tod, room) in placements.items():
+            section = sections[sectionNo]
+            section.setDayOfWeek(day)
+            section.setTimeOfDay(tod)
+            section.setRoom(room)
+        self.outbox.recordMany(("section_rescheduled", None, {"sectionNo": sectionNo, "dayOfWeek": day,
+                                                               "timeOfDay": tod, "room": room})
+                               for sectionNo, (day, tod, room) in placements.items())
+
+    # people
+    @_writes
+    def addStudent(self, name: str, ssn: str, major: str, degree: str) -> Student:
+        if ssn in self.students:
+            raise CourseSystemException(f"Student ID {ssn} already exists!")
+        student = Student(name, ssn, major, degree)
+        self.students[ssn] = student
+        self.eligibility.addStudent(student)
+        self.enrollment.addStudent(student)
+        markChanged()
+        return student
+
+    @_writes
+    def deleteStudent(self, ssn: str):
+        student = self.getStudent(ssn)
+        for section in student.getSections():
+            section.drop(student)
+            self.outbox.record("dropped", ssn, sectionNo=section.getSectionNo())
+        del self.students[ssn]
+        self.eligibility.removeStudent(student)
+        self.enrollment.removeStudent(student)
+        markChanged()
+        self.outbox.record("student_deleted", ssn)
+
+    @_writes
+    def addProfessor(self, name: str, ssn: str, title: str, department: str) -> Professor:
+        if ssn in self.professors:
+            raise CourseSystemException(f"Professor ID {ssn} already exists!")
+        professor = Professor(name, ssn, title, department)
+        self.professors[ssn] = professor
+        self.teaching.addProfessor(professor)
+        markChanged()
+        return professor
+
+    @_writes
+    def deleteProfessor(self, ssn: str):
+        """Removes the professor; their sections become unstaffed."""
+        professor = self.getProfessor(ssn)
+        for section in professor.getSections():
+            self.unassignProfessor(section.getSectionNo())
+        self.teaching.removeProfessor(professor)
+        del self.professors[ssn]
+        markChanged()
+
+    @_writes
+    def assignProfessor(self, ssn: str, sectionNo: str):
+        professor = self.getProfessor(ssn)
+        section = self.getSection(sectionNo)
+        previous = section.getProfessor()
+        if previous is professor:
+            return
+        if previous is not None:
+            previous.dropSection(section)
+        professor.agreeToTeach(section)
+        self.teaching.assign(section, previous)
+
+    @_writes
+    def unassignProfessor(self, sectionNo: str):
+        section = self.getSection(sectionNo)
+        previous = section.getProfessor()
+        if previous is not None:
+            previous.dropSection(section)
+            self.teaching.assign(section, previous)
+
+    # enrollment
+    @_writes
+    def enroll(self, ssn: str, sectionNo: str) -> tuple[bool, str]:
+        section = self.getSection(sectionNo)
+        student = self.getStudent(ssn)
+        success, message = section.enroll(student)
+        if success:
+            self.enrollmentChanged("enroll", student, section)
+        return success, message
+
+    @_writes
+    def restoreEnrollment(self, ssn: str, sectionNo: str):
+        """Puts a saved enrollment back as it was.
+
+        The rules were checked when the student enrolled. A later regrade may
+        no longer satisfy them, but it does not undo the enrollment.
+        """
+        section = self.getSection(sectionNo)
+        student = self.getStudent(ssn)
+        section.restoreStudent(student)
+        self.enrollment.enrolled(student, section)
+
+    @_writes
+    def enrollAll(self, ssn: str, sectionNos: Iterable[str]) -> tuple[bool, str]:
+        """Enrolls in every section or in none of them."""
+        student = self.getStudent(ssn)
+        cart = RegistrationCart(student)
+        for sectionNo in sectionNos:
+            cart.add(self.getSection(sectionNo))
+        sections = cart.getSections()
+        success, message = cart.checkout()
+        if success:
+            for section in sections:
+                self.enrollmentChanged("enroll", student, section)
+        return success, message
+
+    @_writes
+    def allocate(self, window: RegistrationWindow, **options) -> Dict[str, List[str]]:
+        """Runs a registration window's batch allocation (see RegistrationWindow.allocate)."""
+        result = window.allocate(eligibility=self.eligibility, **options)
+        for ssn, sectionNos in result.items():
+            for sectionNo in sectionNos:
+                self.enrollmentChanged("enroll", self.students[ssn], self.sections[sectionNo])
+        return result
+
+    def shardedEnrollment(self, workers: Optional[int] = None) -> ShardedEnrollment:
+        """A worker pool for bulk enroll/drop whose accepted changes are recorded like enroll() and drop()."""
+        return ShardedEnrollment(self.sections, workers, self.students.values(), self.enrollmentsChanged, self.writing)
+
+    @_writes
+    def drop(self, ssn: str, sectionNo: str) -> bool:
+        section = self.getSection(sectionNo)
+        student = self.getStudent(ssn)
+        dropped = section.drop(student)
+        if dropped:
+            self.enrollmentChanged("drop", student, section)
+        return dropped
+
+    @_writes
+    def enrollmentChanged(self, op: str, student: Student, section: Section):
+        """Updates the enrollment matrix and the outbox after an accepted "enroll" or "drop"."""
+        if op == "enroll":
+            self.enrollment.enrolled(student, section)
+            self.outbox.record("enrolled", student.ssn, sectionNo=section.getSectionNo())
+        else:
+            self.enrollment.dropped(student, section)
+            self.outbox.record("dropped", student.ssn, sectionNo=section.getSectionNo())
+
+    @_writes
+    def enrollmentsChanged(self, changes: List[tuple]):
+        """enrollmentChanged for rosters replaced in bulk, given the accepted (op, ssn, sectionNo) in order."""
+        self.enrollment.rostersChanged([self.sections[sectionNo] for sectionNo in {change[2] for change in changes}])
+        kinds = {"enroll": "enrolled", "drop": "dropped"}
+        self.outbox.recordMany((kinds[op], ssn, {"sectionNo": sectionNo}) for op, ssn, sectionNo in changes)
+
+    @_writes
+    def postGrade(self, ssn: str, sectionNo: str, grade: str):
+        """Grades are numbers from 0 to 10; anything else is rejected before the transcript changes."""
+        try:
+            valid = 0.0 <= float(grade) <= 10.0
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise CourseSystemException(f"Grade must be a number from 0 to 10, got {grade!r}")
+        section = self.getSection(sectionNo)
+        student = self.getStudent(ssn)
+        section.postGrade(student, grade)
+        if section.getCourse():
+            self.eligibility.gradePosted(student, section.getCourse())
+        markChanged()
+        self.outbox.record("grade_posted", ssn, sectionNo=sectionNo, grade=grade)
+
+    # semesters
+    @_writes
+    def closeSemester(self, newSemester: str):
+        """Archives the active schedule and starts an empty one for `newSemester`.
+
+        Transcript entries of the closed term are pointed at archive stubs, and
+        the closed sections are released from students, professors and courses.
+        """
+        if self.archive is None:
+            raise CourseSystemException("No schedule archive is configured")
+        if newSemester == self.schedule.getSemester():
+            raise CourseSystemException(f"{newSemester} is already the active semester")
+        closed = self.schedule.getSemester()
+        stubs = self.archive.archive(self.schedule)
+
+        for student in self.students.values():
+            transcript = student.getTranscript()
+            for entry in transcript.getEntries().values():
+                section = entry.getSection()
+                if self.sections.get(section.getSectionNo()) is section:
+                    transcript.addEntry(stubs[section.getSectionNo()], entry.getGrade())
+
+        for section in list(self.sections.values()):
+            for student in section.getStudents():
+                student.dropSection(section)
+            self.teaching.removeSection(section)
+            self.enrollment.removeSection(section)
+            if section.getProfessor():
+                section.getProfessor().dropSection(section)
+            if section.getCourse():
+                section.getCourse().removeSection(section)
+
+        # cleared in place: callers may hold on to the dict
+        self.sections.clear()
+        self.schedule = ScheduleOfClasses(newSemester, self.sections)
+        markChanged()
+        self.outbox.record("semester_closed", semester=closed, nextSemester=newSemester)
+
+    # reads
+    def snapshot(self) -> RegistrySnapshot:
+        """Point-in-time view for reports, reused until the next write to the model.
+
+        A new snapshot keeps the previous one's views of the objects that were not written since.
+        """
+        if self.__snapshot is None or self.__snapshot.changeCount != changeCount():
+            self.__snapshot = RegistrySnapshot(self, previous=self.__snapshot)
+        return self.__snapshot
+
+    @contextmanager
+    def writing(self):
+        """Holds the write lock and counts as a write in progress, for changes made outside a Registry method."""
+        with self.writeLock:
+            self.__writing += 1
+            try:
+                yield
+            finally:
+                self.__writing -= 1
+
+    def writesInProgress(self) -> bool:
+        return self.__writing > 0
+
+
+def sampleRegistry() -> Registry:
+    """The demo catalog the Streamlit app starts with."""
+    registry = Registry("Fall 2026")
+    registry.addCourse("CS101", "Functional Programming", 4)
+    registry.addCourse("CS201", "Object-Oriented Programming", 4, prerequisites=["CS101"])
+
+    registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 101", 30)
+    registry.addSection("CS201", "CS201-A", "Tuesday", "10:00 AM", "Room 102", 25)
+    registry.addSection("CS201", "CS201-B", "Wednesday", "2:00 PM", "Room 103", 25)
+
+    registry.addProfessor("Dr. Smith", "P001", "Professor", "Computer Science")
+    for sectionNo in ["CS101-A", "CS201-A", "CS201-B"]:
+        registry.assignProfessor("P001", sectionNo)
+    return registry
@@ -0,0 +1,141 @@
+"""Automatic room and timeslot placement for sections."""
+import random
+import time
+from typing import List, Dict, Optional, Set
+
+from .models import DAYS_OF_WEEK, TIMES_OF_DAY, Section
+
+
+class SectionScheduler:
+    """Places sections into (day, time, room) slots without clashes.
+
+    Hard constraints: one section per room and slot, a room at least as large
+    as the section's seating capacity, and a professor teaches one section per
+    slot. Sections of the same course, and sections listed as conflicting
+    (for example because they share students, see
+    EnrollmentMatrix.conflictGraph), are spread over different slots when
+    possible. A greedy placement is repaired with min-conflicts local search
+    until no clash is left or the time budget runs out.
+    """
+
+    COURSE_CLASH_WEIGHT = 0.01
+    STUDENT_CLASH_WEIGHT = 0.1
+
+    def __init__(self, rooms: Dict[str, int], days: List[str] = None, times: List[str] = None,
+                 seed: Optional[int] = None):
+        if not rooms:
+            raise ValueError("At least one room is required")
+        # smallest rooms first so each section takes the tightest free fit
+        self.__rooms = sorted(rooms.items(), key=lambda item: item[1])
+        self.__slots = [(day, tod) for day in (days or DAYS_OF_WEEK) for tod in (times or TIMES_OF_DAY)]
+        self.__random = random.Random(seed)
+
+    def solve(self, sections: List['Section'], fixed: List['Section'] = (),
+              timeBudget: float = 2.0,
+              conflicts: Optional[Dict[str, Set[str]]] = None) -> tuple[Dict[str, tuple], List[str]]:
+        """Returns (placements, unplaced).
+
+        `placements` maps sectionNo to (day, time, room) for the sections in
+        `sections`. Sections in `fixed` keep their current placement and only
+        block slots, which is how a few changed sections are re-solved without
+        moving the rest of the catalog. `conflicts` maps a sectionNo to the
+        sections it should not share a slot with.
+        """
+        deadline = time.perf_counter() + timeBudget
+        self.__roomUse: Dict[tuple, set] = {}
+        self.__profUse: Dict[tuple, set] = {}
+        self.__courseUse: Dict[tuple, set] = {}
+        self.__slotUse: Dict[tuple, set] = {}
+        self.__conflicts = conflicts or {}
+        self.__placed: Dict[str, tuple] = {}
+
+        for section in fixed:
+            self.__place(section, ((section.getDayOfWeek(), section.getTimeOfDay()), section.getRoom()))
+
+        unplaced = []
+        movable = []
+        for section in sorted(sections, key=lambda s: s.getCapacity(), reverse=True):
+            if not any(capacity >= section.getCapacity() for _, capacity in self.__rooms):
+                unplaced.append(section.getSectionNo())
+                continue
+            movable.append(section)
+            self.__place(section, self.__bestPlacement(section))
+
+        # min-conflicts repair
+        while time.perf_counter() < deadline:
+            conflicted = [s for s in movable if self.__hardConflicts(s, self.__placed[s.getSectionNo()]) > 0]
+            if not conflicted:
+                break
+            section = self.__random.choice(conflicted)
+            self.__unplace(section)
+            if self.__random.random() < 0.1:
+                placement = self.__placementInSlot(section, self.__random.choice(self.__slots))
+            else:
+                placement = self.__bestPlacement(section)
+            self.__place(section, placement)
+
+        placements = {}
+        for section in movable:
+            placement = self.__placed[section.getSectionNo()]
+            if self.__hardConflicts(section, placement) > 0:
+                unplaced.append(section.getSectionNo())
+            else:
+                (day, tod), room = placement
+                placements[section.getSectionNo()] = (day, tod, room)
+        return placements, unplaced
+
+    def __bestPlacement(self, section):
+        best, bestCost = [], None
+        for slot in self.__slots:
+            placement = self.__placementInSlot(section, slot)
+            cost = self.__cost(section, placement)
+            if bestCost is None or cost < bestCost:
+                best, bestCost = [placement], cost
+            elif cost == bestCost:
+                best.append(placement)
+        return self.__random.choice(best)
+
+    def __placementInSlot(self, section, slot):
+        fitting = [room for room, capacity in self.__rooms if capacity >= section.getCapacity()]
+        for room in fitting:
+            if not self.__roomUse.get((slot, room)):
+                return slot, room
+        return slot, fitting[0]
+
+    def __cost(self, section, placement):
+        slot, _ = placement
+        course = section.getCourse()
+        courseClashes = len(self.__courseUse.get((slot, course.getCourseNo()), ())) if course else 0
+        studentClashes = len(self.__conflicts.get(section.getSectionNo(), set()) & self.__slotUse.get(slot, set()))
+        return (self.__hardConflicts(section, placement) + self.COURSE_CLASH_WEIGHT * courseClashes
+                + self.STUDENT_CLASH_WEIGHT * studentClashes)
+
+    def __hardConflicts(self, section, placement):
+        slot, room = placement
+        sectionNo = section.getSectionNo()
+        conflicts = len(self.__roomUse.get((slot, room), set()) - {sectionNo})
+        professor = section.getProfessor()
+        if professor:
+            conflicts += len(self.__profUse.get((slot, professor.ssn), set()) - {sectionNo})
+        return conflicts
+
+    def __keys(self, section, placement):
+        slot, room = placement
+        course = section.getCourse()
+        professor = section.getProfessor()
+        keys = [(self.__roomUse, (slot, room)), (self.__slotUse, slot)]
+        if professor:
+            keys.append((self.__profUse, (slot, professor.ssn)))
+        if course:
+            keys.append((self.__courseUse, (slot, course.getCourseNo())))
+        return keys
+
+    def __place(self, section, placement):
+        self.__placed[section.getSectionNo()] = placement
+        for index, key in self.__keys(section, placement):
+            index.setdefault(key, set()).add(section.getSectionNo())
+
+    def __unplace(self, section):
+        placement = self.__placed.pop(section.getSectionNo())
+        for index, key in self.__keys(section, placement):
+            index[key].discard(section.getSectionNo())
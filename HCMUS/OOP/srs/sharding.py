@@ -0,0 +1,236 @@
+"""Multi-process enrollment workers partitioned by course."""
+import os
+import pickle
+import zlib
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional
+
+from .exceptions import CourseSystemException
+from .models import Section, Student
+
+
+def _checkPrerequisites(prerequisites: List[str], grades: Dict[str, str]) -> tuple[bool, str]:
+    # same rules and messages as Course.checkPrerequisites, on plain data
+    for courseNo in prerequisites:
+        grade = grades.get(courseNo)
+        if grade is None:
+            return False, f"Missing prerequisite: {courseNo}"
+        if float(grade) < 5.0:
+            return False, f"Low grade for prerequisite {courseNo}: {grade}"
+    return True, ""
+
+
+_ENROLLED = (True, "Enrollment successful")
+_DROPPED = (True, "Drop successful")
+
+
+def _shardWorker(shard: int, inbox, outbox):
+    """Owns and validates the rosters of one shard as plain data."""
+    rosters: Dict[str, dict] = {}                 # sectionNo -> ssns, in enrollment order
+    capacities: Dict[str, int] = {}
+    courseOf: Dict[str, str] = {}                 # sectionNo -> courseNo
+    prerequisites: Dict[str, List[str]] = {}      # courseNo -> prerequisite courseNos
+    grades: Dict[str, Dict[str, str]] = {}        # ssn -> {courseNo: grade}, prerequisites only
+    owners: Dict[str, int] = {}                   # sectionNo -> shard, for every section
+    students = set()                              # every known ssn
+    changed = set()
+    accepted = []                                 # (request index, op, ssn, sectionNo) since the last sync
+    while True:
+        message = inbox.get()
+        if isinstance(message, bytes):
+            # batches are pickled once by the coordinator and sent to every shard as bytes
+            message = pickle.loads(message)
+        if message[0] == "stop":
+            break
+        if message[0] == "load":
+            sections, courses, transcripts, owners, students = message[1]
+            for sectionNo, courseNo, capacity, ssns in sections:
+                capacities[sectionNo] = capacity
+                courseOf[sectionNo] = courseNo
+                rosters[sectionNo] = dict.fromkeys(ssns)
+            prerequisites.update(courses)
+            grades.update(transcripts)
+            outbox.put([])
+            continue
+        if message[0] == "sync":
+            outbox.put(([(sectionNo, list(rosters[sectionNo])) for sectionNo in changed], accepted))
+            changed.clear()
+            accepted = []
+            continue
+
+        # every shard sees the whole batch and picks out its own sections; unknown sections go to shard 0
+        _, base, ops, ssns, sectionNos = message
+        rejected = {}
+        for position, sectionNo in enumerate(sectionNos):
+            if owners.get(sectionNo, 0) != shard:
+                continue
+            op, ssn = ops[position], ssns[position]
+            roster = rosters.get(sectionNo)
+            if roster is None:
+                rejected[position] = f"Section {sectionNo} not found"
+            elif ssn not in students:
+                rejected[position] = f"Student {ssn} not found"
+            elif op == "enroll":
+                if ssn in roster:
+                    rejected[position] = "Student already enrolled in this section"
+                elif len(roster) >= capacities[sectionNo]:
+                    rejected[position] = "Section is full"
+                else:
+                    satisfied, reason = _checkPrerequisites(prerequisites.get(courseOf[sectionNo], ()),
+                                                            grades.get(ssn, {}))
+                    if satisfied:
+                        roster[ssn] = None
+                        changed.add(sectionNo)
+                        accepted.append((base + position, op, ssn, sectionNo))
+                    else:
+                        rejected[position] = reason
+            elif op == "drop":
+                if ssn in roster:
+                    del roster[ssn]
+                    changed.add(sectionNo)
+                    accepted.append((base + position, op, ssn, sectionNo))
+                else:
+                    rejected[position] = "Student not in the section"
+            else:
+                rejected[position] = f"Unknown operation: {op}"
+        outbox.put(rejected)
+
+
+class ShardedEnrollment:
+    """Runs enroll/drop batches on a pool of worker processes.
+
+    Sections are partitioned by course, so every rule Section.enroll checks
+    (duplicate, seats, prerequisites) can be decided inside a single shard.
+    Each shard owns its rosters, validates its requests and logs what it
+    accepted. A batch is pickled once and sent to every shard, which picks
+    out its own rows, so submit() does no per-request work in this process.
+
+    The model catches up in sync(), which close() also calls: the rosters
+    are written back, which updates the students' side once per changed
+    (student, section) pair, and `onSync` receives the accepted changes as
+    (op, ssn, sectionNo) in request order (see
+    Registry.enrollmentsChanged). The update runs inside `guard()` if given
+    (Registry.writing).
+
+    `students` are the students requests may name; their grades feed the
+    prerequisite checks. While the pool is open, all enrollment changes
+    must go through it, and grades posted in the meantime are not seen by
+    the shards.
+    """
+
+    def __init__(self, sections: Dict[str, 'Section'], workers: Optional[int] = None,
+                 students: Iterable['Student'] = (),
+                 onSync: Optional[Callable[[List[tuple]], None]] = None,
+                 guard: Optional[Callable[[], ContextManager]] = None):
+        self.__sections = sections
+        self.__students: Dict[str, 'Student'] = {student.ssn: student for student in students}
+        self.__workerCount = workers or os.cpu_count() or 1
+        self.__onSync = onSync
+        self.__guard = guard or nullcontext
+        self.__workers = []
+        self.__submitted = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        # imported here so that `import srs` stays cheap for jobs that never fork
+        import multiprocessing
+        context = multiprocessing.get_context()
+        self.__workers = []
+        for shard in range(self.__workerCount):
+            inbox, outbox = context.Queue(), context.Queue()
+            process = context.Process(target=_shardWorker, args=(shard, inbox, outbox), daemon=True)
+            process.start()
+            self.__workers.append((process, inbox, outbox))
+
+        sections: List[list] = [[] for _ in self.__workers]
+        courses: List[dict] = [{} for _ in self.__workers]
+        needed: List[set] = [set() for _ in self.__workers]
+        owners: Dict[str, int] = {}
+        for sectionNo, section in self.__sections.items():
+            shard = owners[sectionNo] = self.shardOf(section)
+            course = section.getCourse()
+            courseNo = course.getCourseNo() if course else ""
+            if course and course.hasPrerequisites():
+                courses[shard][courseNo] = [p.getCourseNo() for p in course.getPrerequisites()]
+                needed[shard].update(courses[shard][courseNo])
+            sections[shard].append((sectionNo, courseNo, section.getCapacity(),
+                                    [s.ssn for s in section.getStudents()]))
+
+        # each shard gets only the grades its prerequisite checks need
+        transcripts: List[dict] = [{} for _ in self.__workers]
+        for student in self.__students.values():
+            entries = student.getTranscript().getEntries()
+            for shard, courseNos in enumerate(needed):
+                grades = {courseNo: entries[courseNo].getGrade() for courseNo in courseNos & entries.keys()}
+                if grades:
+                    transcripts[shard][student.ssn] = grades
+
+        ssns = set(self.__students)
+        for worker, load in zip(self.__workers, zip(sections, courses, transcripts)):
+            worker[1].put(("load", (*load, owners, ssns)))
+        for _, _, outbox in self.__workers:
+            outbox.get()
+
+    def sync(self):
+        """Brings the Section and Student objects up to date with the shards."""
+        for _, inbox, _ in self.__workers:
+            inbox.put(("sync",))
+        rosters, accepted = [], []
+        for _, _, outbox in self.__workers:
+            shardRosters, shardAccepted = outbox.get()
+            rosters += shardRosters
+            accepted += shardAccepted
+        if not accepted:
+            return
+        accepted.sort()
+
+        students, sections = self.__students, self.__sections
+        with self.__guard():
+            for sectionNo, ssns in rosters:
+                sections[sectionNo].restoreRoster([students[ssn] for ssn in ssns])
+            if self.__onSync is not None:
+                self.__onSync([change[1:] for change in accepted])
+
+    def close(self):
+        if not self.__workers:
+            return
+        self.sync()
+        for process, inbox, _ in self.__workers:
+            inbox.put(("stop",))
+        for process, _, _ in self.__workers:
+            process.join()
+        self.__workers = []
+
+    def shardOf(self, section: 'Section') -> int:
+        course = section.getCourse()
+        key = course.getCourseNo() if course else section.getSectionNo()
+        return zlib.crc32(key.encode()) % self.__workerCount
+
+    def submit(self, ops: List[str], ssns: List[str], sectionNos: List[str]) -> Dict[int, str]:
+        """Runs the requests given as parallel lists, op being "enroll" or "drop".
+
+        Returns {position: message} for the rejected ones; the others were accepted.
+        """
+        if not self.__workers:
+            raise CourseSystemException("Worker pool is not started")
+        batch = pickle.dumps(("batch", self.__submitted, ops, ssns, sectionNos), pickle.HIGHEST_PROTOCOL)
+        self.__submitted += len(ops)
+        for _, inbox, _ in self.__workers:
+            inbox.put(batch)
+        rejected: Dict[int, str] = {}
+        for _, _, outbox in self.__workers:
+            rejected.update(outbox.get())
+        return rejected
+
+    def process(self, requests: List[tuple]) -> List[tuple[bool, str]]:
+        """Runs (op, student, section) requests and returns (success, message) per request, in order."""
+        rejected = self.submit([op for op, _, _ in requests], [student.ssn for _, student, _ in requests],
+                               [section.getSectionNo() for _, _, section in requests])
+        return [(False, rejected[index]) if index in rejected else _ENROLLED if op == "enroll" else _DROPPED
+                for index, (op, _, _) in enumerate(requests)]
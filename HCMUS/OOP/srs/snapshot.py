@@ -0,0 +1,193 @@
+"""Immutable point-in-time views of a Registry for reports.
+
+A snapshot does not copy rosters, schedules or transcripts. The model's
+collections are copy-on-write (see models.py), so the views simply keep the
+tuples and mappings that were current when the snapshot was taken. Writers
+replace those values instead of editing them, and the snapshot keeps
+showing the old state for as long as a report holds on to it.
+
+Every view records the object it was read from and that object's version
+(see models.versionOf). A new snapshot reuses the previous snapshot's view
+of each object that is still the same object and has not been written
+since, so retaking one after a few
+enrollments costs a pass over the registry's dicts, not a copy of it.
+"""
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from .exceptions import CourseSystemException
+from .models import changeCount, versionOf
+
+
+class SectionView:
+    """A Section as it was when the snapshot was taken."""
+
+    def __init__(self, section):
+        # read before the fields: a write in between leaves the view marked stale
+        self.source = section
+        self.version = versionOf(section)
+        self.__sectionNo = section.getSectionNo()
+        self.__dayOfWeek = section.getDayOfWeek()
+        self.__timeOfDay = section.getTimeOfDay()
+        self.__room = section.getRoom()
+        self.__seatingCapacity = section.getCapacity()
+        self.__course = section.getCourse()
+        self.__professor = section.getProfessor()
+        self.__students = section.getStudents()
+
+    def getSectionNo(self):
+        return self.__sectionNo
+
+    def getDayOfWeek(self):
+        return self.__dayOfWeek
+
+    def getTimeOfDay(self):
+        return self.__timeOfDay
+
+    def getRoom(self):
+        return self.__room
+
+    def getCourse(self):
+        return self.__course
+
+    def getCapacity(self):
+        return self.__seatingCapacity
+
+    def getProfessor(self):
+        return self.__professor
+
+    def getStudents(self) -> Tuple:
+        return self.__students
+
+    def getEnrolledCount(self) -> int:
+        return len(self.__students)
+
+    def __str__(self) -> str:
+        course_name = self.__course.getCourseName() if self.__course else "Unknown"
+        return f"{self.__sectionNo} - {course_name}"
+
+
+class CourseView:
+    def __init__(self, course, sections: Tuple[SectionView, ...], eligible: int):
+        self.__course = course
+        self.__prerequisites = course.getPrerequisites()
+        self.__sections = sections
+        self.__eligible = eligible
+
+    def getCourseNo(self) -> str:
+        return self.__course.getCourseNo()
+
+    def getCourseName(self) -> str:
+        return self.__course.getCourseName()
+
+    def getCredits(self) -> int:
+        return self.__course.getCredits()
+
+    def getPrerequisites(self) -> Tuple:
+        return self.__prerequisites
+
+    def getSections(self) -> Tuple[SectionView, ...]:
+        return self.__sections
+
+    def getEligibleCount(self) -> int:
+        return self.__eligible
+
+    def __str__(self) -> str:
+        return str(self.__course)
+
+
+class StudentView:
+    def __init__(self, student):
+        self.source = student
+        self.version = versionOf(student)
+        self.transcriptVersion = versionOf(student.getTranscript())
+        self.name = student.name
+        self.ssn = student.ssn
+        self.__major = student.getMajor()
+        self.__degree = student.getDegree()
+        self.__sections = student.getSections()
+        self.__entries = student.getTranscript().getEntries()
+
+    def getMajor(self) -> str:
+        return self.__major
+
+    def getDegree(self) -> str:
+        return self.__degree
+
+    def getSections(self) -> Tuple:
+        return self.__sections
+
+    def getEntries(self) -> Mapping:
+        """Transcript entries by course number."""
+        return self.__entries
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ssn}) - {self.__major}, {self.__degree}"
+
+
+class RegistrySnapshot:
+    """Consistent read-only view of the courses, sections and students.
+
+    Taking one only reads references and does not wait for writers. If a
+    Registry write is in progress or lands while it is being taken, it
+    starts over, up to `attempts` times. After that it takes the registry's
+    write lock for one last pass. A write that bypasses the Registry during
+    that pass raises CourseSystemException rather than returning a torn view.
+    `changeCount` records which state it shows.
+
+    `previous` is an older snapshot of the same registry whose views are
+    reused for the objects that did not change.
+    """
+
+    def __init__(self, registry, attempts: int = 3, previous: Optional['RegistrySnapshot'] = None):
+        self.__previous = previous
+        for _ in range(attempts):
+            before = changeCount()
+            if registry.writesInProgress():
+                continue
+            self.__take(registry)
+            if changeCount() == before and not registry.writesInProgress():
+                break
+        else:
+            with registry.writeLock:
+                before = changeCount()
+                self.__take(registry)
+                if changeCount() != before:
+                    raise CourseSystemException("The model was changed outside the Registry during a snapshot")
+        self.changeCount = before
+        self.__previous = None
+
+    def __take(self, registry):
+        previous = self.__previous
+        oldSections = previous.sections if previous else {}
+        oldStudents = previous.students if previous else {}
+
+        # dict.copy() runs in C, so the loops neither race writers nor allocate a tuple per entry
+        self.semester = registry.schedule.getSemester()
+        sections = {}
+        for sectionNo, section in registry.sections.copy().items():
+            view = oldSections.get(sectionNo)
+            # a section deleted and re-added under the same number is a different object
+            sections[sectionNo] = view if view is not None and view.source is section \
+                and view.version == versionOf(section) else SectionView(section)
+        courses = {}
+        for courseNo, course in registry.courses.copy().items():
+            views = tuple(sections.get(s.getSectionNo()) or SectionView(s) for s in course.getSections())
+            courses[courseNo] = CourseView(course, views, registry.eligibility.countEligible(course))
+        students = {}
+        for ssn, student in registry.students.copy().items():
+            view = oldStudents.get(ssn)
+            if view is None or view.source is not student or view.version != versionOf(student) \
+                    or view.transcriptVersion != versionOf(student.getTranscript()):
+                view = StudentView(student)
+            students[ssn] = view
+
+        self.sections: Mapping[str, SectionView] = MappingProxyType(sections)
+        self.courses: Mapping[str, CourseView] = MappingProxyType(courses)
+        self.students: Mapping[str, StudentView] = MappingProxyType(students)
+
+    def getSection(self, sectionNo: str) -> Optional[SectionView]:
+        return self.sections.get(sectionNo)
+
+    def getStudent(self, ssn: str) -> Optional[StudentView]:
+        return self.students.get(ssn)
@@ -0,0 +1,121 @@
+"""Dump and restore a Registry as JSON Lines, one record per line."""
+import json
+from typing import Iterator, TextIO
+
+from .archive import ArchivedSection, ScheduleArchive
+from .events import DomainEvent
+from .registry import Registry
+
+
+def iterRecords(registry: Registry) -> Iterator[dict]:
+    """Records in restore order: prerequisites come before the courses that need them."""
+    emitted = set()
+    yield {"type": "schedule", "semester": registry.schedule.getSemester(),
+           "archive": registry.archive.getDirectory() if registry.archive else None}
+
+    def courseRecords(course):
+        if course.getCourseNo() in emitted:
+            return
+        for prereq in course.getPrerequisites():
+            yield from courseRecords(prereq)
+        emitted.add(course.getCourseNo())
+        yield {"type": "course", "courseNo": course.getCourseNo(), "courseName": course.getCourseName(),
+               "credits": course.getCredits(),
+               "prerequisites": [p.getCourseNo() for p in course.getPrerequisites()]}
+
+    for course in registry.courses.values():
+        yield from courseRecords(course)
+
+    for section in registry.sections.values():
+        course = section.getCourse()
+        yield {"type": "section", "courseNo": course.getCourseNo() if course else None,
+               "sectionNo": section.getSectionNo(), "dayOfWeek": section.getDayOfWeek(),
+               "timeOfDay": section.getTimeOfDay(), "room": section.getRoom(),
+               "capacity": section.getCapacity()}
+
+    for professor in registry.professors.values():
+        yield {"type": "professor", "name": professor.name, "ssn": professor.ssn, "title": professor.getTitle(),
+               "department": professor.getDepartment(),
+               "sections": [s.getSectionNo() for s in professor.getSections()
+                            if s.getSectionNo() in registry.sections]}
+
+    for student in registry.students.values():
+        yield {"type": "student", "name": student.name, "ssn": student.ssn, "major": student.getMajor(),
+               "degree": student.getDegree()}
+
+    for student in registry.students.values():
+        for courseNo, entry in student.getTranscript().getEntries().items():
+            section = entry.getSection()
+            record = {"type": "grade", "ssn": student.ssn, "sectionNo": section.getSectionNo(),
+                      "grade": entry.getGrade()}
+            if isinstance(section, ArchivedSection):
+                record["archived"] = section.toDict()
+            yield record
+
+    for student in registry.students.values():
+        for section in student.getSections():
+            yield {"type": "enrollment", "ssn": student.ssn, "sectionNo": section.getSectionNo()}
+
+    # undelivered events, then where numbering resumes
+    for event in registry.outbox.pending():
+        yield {"type": "event", "seq": event.seq, "kind": event.kind, "ssn": event.ssn,
+               "timestamp": event.timestamp, "payload": event.payload}
+    yield {"type": "outbox", "lastSeq": registry.outbox.lastSeq()}
+
+
+def dumpRegistry(registry: Registry, fp: TextIO) -> int:
+    count = 0
+    for record in iterRecords(registry):
+        fp.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+
+def loadRegistry(fp: TextIO) -> Registry:
+    """Rebuilds a Registry from dumpRegistry() output.
+
+    Enrollments are linked back as saved, without re-running the seat and
+    prerequisite checks, and without recording events. Events that were
+    not delivered when the dump was taken are put back in the outbox.
+    """
+    registry = Registry()
+    events = []
+    for line in fp:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record["type"]
+        if kind == "schedule":
+            archive = ScheduleArchive(record["archive"]) if record.get("archive") else None
+            registry = Registry(record["semester"], archive)
+        elif kind == "course":
+            registry.addCourse(record["courseNo"], record["courseName"], record["credits"],
+                               record["prerequisites"])
+        elif kind == "section":
+            registry.addSection(record["courseNo"], record["sectionNo"], record["dayOfWeek"],
+                                record["timeOfDay"], record["room"], record["capacity"])
+        elif kind == "professor":
+            registry.addProfessor(record["name"], record["ssn"], record["title"], record["department"])
+            for sectionNo in record["sections"]:
+                registry.assignProfessor(record["ssn"], sectionNo)
+        elif kind == "student":
+            registry.addStudent(record["name"], record["ssn"], record["major"], record["degree"])
+        elif kind == "grade":
+            student = registry.getStudent(record["ssn"])
+            if "archived" in record:
+                section = ArchivedSection.fromDict(record["archived"])
+            else:
+                section = registry.sections.get(record["sectionNo"])
+            if section is not None and section.getCourse():
+                student.getTranscript().addEntry(section, record["grade"])
+                registry.eligibility.gradePosted(student, section.getCourse())
+        elif kind == "enrollment":
+            registry.restoreEnrollment(record["ssn"], record["sectionNo"])
+        elif kind == "event":
+            events.append(DomainEvent(record["seq"], record["kind"], record["ssn"], record["payload"],
+                                      record["timestamp"]))
+        elif kind == "outbox":
+            registry.outbox.restore(record["lastSeq"], events)
+        else:
+            raise ValueError(f"Unknown record type: {kind}")
+    return registry
@@ -0,0 +1,163 @@
+"""Batched webhook delivery of outbox events, plus a local stand-in receiver.
+
+asyncio, urllib.request and http.server are imported where they are used,
+so that `import srs` does not pay for them in jobs that never deliver.
+"""
+import json
+import threading
+from typing import Dict, List, Optional
+
+from .events import DomainEvent, Outbox
+
+
+class WebhookDispatcher:
+    """Delivers outbox events to HTTP endpoints from a background thread.
+
+    Each endpoint has its own asyncio task and cursor. Events are POSTed as
+    `{"events": [...]}` in batches of up to `batchSize`, in sequence order. A
+    failed batch is retried with exponential backoff, and the cursor only
+    moves past it once it is accepted, so every student's events arrive in
+    order. The outbox is trimmed once all endpoints have an event.
+    """
+
+    def __init__(self, outbox: Outbox, endpoints: List[str], batchSize: int = 500,
+                 pollInterval: float = 0.2, timeout: float = 5.0, retryBase: float = 0.5,
+                 retryMax: float = 30.0):
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        self.__outbox = outbox
+        self.__endpoints = list(endpoints)
+        self.__batchSize = batchSize
+        self.__pollInterval = pollInterval
+        self.__timeout = timeout
+        self.__retryBase = retryBase
+        self.__retryMax = retryMax
+
+        self.__cursors: Dict[str, int] = {url: outbox.lastSeq() for url in self.__endpoints}
+        self.__delivered: Dict[str, int] = {url: 0 for url in self.__endpoints}
+        self.__failures: Dict[str, int] = {url: 0 for url in self.__endpoints}
+        self.__thread: Optional[threading.Thread] = None
+        self.__stopping = threading.Event()
+        self.__abort = threading.Event()
+
+    def start(self, fromSeq: Optional[int] = None):
+        """Starts delivering events recorded after `fromSeq` (default: from now on)."""
+        if self.__thread is not None:
+            return
+        if fromSeq is not None:
+            self.__cursors = {url: fromSeq for url in self.__endpoints}
+        self.__stopping.clear()
+        self.__abort.clear()
+        import asyncio
+        self.__thread = threading.Thread(target=lambda: asyncio.run(self.__main()), daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flushes pending events for up to `timeout` seconds, then gives up."""
+        if self.__thread is None:
+            return
+        self.__stopping.set()
+        self.__thread.join(timeout)
+        if self.__thread.is_alive():
+            self.__abort.set()
+            self.__thread.join()
+        self.__thread = None
+
+    def isRunning(self) -> bool:
+        return self.__thread is not None
+
+    def getStats(self) -> Dict[str, Dict[str, int]]:
+        last = self.__outbox.lastSeq()
+        return {url: {"delivered": self.__delivered[url], "failures": self.__failures[url],
+                      "lag": last - self.__cursors[url]} for url in self.__endpoints}
+
+    async def __main(self):
+        import asyncio
+        await asyncio.gather(*(self.__deliverTo(url) for url in self.__endpoints))
+
+    async def __deliverTo(self, url: str):
+        import asyncio
+        while not self.__abort.is_set():
+            batch = self.__outbox.after(self.__cursors[url], self.__batchSize)
+            if not batch:
+                if self.__stopping.is_set():
+                    return
+                await asyncio.sleep(self.__pollInterval)
+                continue
+
+            attempt = 0
+            while not await asyncio.to_thread(self.__post, url, batch):
+                self.__failures[url] += 1
+                # the backoff ends early when stop() gives up, so stopping never waits out retryMax
+                delay = min(self.__retryBase * 2 ** attempt, self.__retryMax)
+                if await asyncio.to_thread(self.__abort.wait, delay):
+                    return
+                attempt += 1
+
+            self.__cursors[url] = batch[-1].seq
+            self.__delivered[url] += len(batch)
+            self.__outbox.trim(min(self.__cursors.values()))
+
+    def __post(self, url: str, batch: List[DomainEvent]) -> bool:
+        import urllib.request
+        body = json.dumps({"events": [event.toDict() for event in batch]}).encode()
+        request = urllib.request.Request(url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.__timeout) as response:
+                return 200 <= response.status < 300
+        except Exception:
+            return False
+
+
+class LocalReceiver:
+    """Stand-in webhook endpoint on localhost that keeps what it receives.
+
+    `failFirst` makes the first N requests answer 503, to exercise retries.
+    """
+
+    def __init__(self, port: int = 0, failFirst: int = 0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        self.events: List[Dict] = []
+        self.batches = 0
+        self.__failFirst = failFirst
+        self.__lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(receiver.receive(body))
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.__thread: Optional[threading.Thread] = None
+
+    def receive(self, body: bytes) -> int:
+        """Handles one POST body and returns the HTTP status to answer with."""
+        with self.__lock:
+            if self.__failFirst > 0:
+                self.__failFirst -= 1
+                return 503
+            self.events.extend(json.loads(body)["events"])
+            self.batches += 1
+            return 204
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}/events"
+
+    def start(self) -> str:
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self.url
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
@@ -0,0 +1,48 @@
+"""IntegrityAuditor's incremental mode catches drift made outside the Registry."""
+import unittest
+
+from srs import IntegrityAuditor, Registry
+
+
+class AuditorTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.registry.addCourse("CS101", "Programming", 4)
+        self.registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", 30)
+        self.registry.addStudent("Alice", "S1", "CS", "BSc")
+        self.registry.addProfessor("Dr. Smith", "P1", "Professor", "CS")
+        self.registry.addProfessor("Dr. Jones", "P2", "Professor", "CS")
+        self.registry.assignProfessor("P1", "CS101-A")
+        self.auditor = IntegrityAuditor(self.registry)
+        self.addCleanup(self.auditor.close)
+
+    def kinds(self, issues):
+        return sorted(issue.kind for issue in issues)
+
+    def test_registry_changes_leave_nothing_to_report(self):
+        self.registry.enroll("S1", "CS101-A")
+        self.registry.assignProfessor("P2", "CS101-A")
+        self.assertEqual(self.auditor.auditIncremental(), [])
+
+    def test_incremental_sees_writes_that_bypass_the_registry(self):
+        section = self.registry.getSection("CS101-A")
+        self.registry.getStudent("S1").attendSection(section)
+        section.setProfessor(self.registry.getProfessor("P2"))
+        expected = ["one_sided_assignment", "one_sided_enrollment"]
+        self.assertEqual(self.kinds(self.auditor.auditIncremental()), expected)
+        self.assertEqual(self.kinds(self.auditor.auditFull()), expected)
+
+    def test_changes_are_reported_once(self):
+        self.registry.getStudent("S1").attendSection(self.registry.getSection("CS101-A"))
+        self.assertEqual(len(self.auditor.auditIncremental()), 1)
+        self.assertEqual(self.auditor.auditIncremental(), [])
+
+    def test_repair(self):
+        self.registry.getStudent("S1").attendSection(self.registry.getSection("CS101-A"))
+        issues = self.auditor.auditIncremental()
+        self.assertEqual(self.auditor.repair(issues), 1)
+        self.assertEqual(self.auditor.auditFull(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
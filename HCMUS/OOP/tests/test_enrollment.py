@@ -0,0 +1,96 @@
+"""Seats are never oversold, and a cart that fails leaves nothing behind."""
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from srs import Registry, RegistrationCart
+
+
+class CartTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.registry.addCourse("CS101", "Programming", 4)
+        self.registry.addCourse("MA101", "Calculus", 4)
+        self.registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", 30)
+        self.registry.addSection("MA101", "MA101-A", "Tuesday", "9:00 AM", "Room 2", 30)
+        self.registry.addStudent("Alice", "S1", "CS", "BSc")
+
+    def test_failed_checkout_rolls_back(self):
+        later = self.registry.getSection("MA101-A")
+        seq = self.registry.outbox.lastSeq()
+        # sections are enrolled in sectionNo order, so CS101-A is taken before this one fails
+        with mock.patch.object(later, "enroll", return_value=(False, "Section is closed")):
+            success, message = self.registry.enrollAll("S1", ["CS101-A", "MA101-A"])
+
+        self.assertFalse(success)
+        self.assertEqual(message, "MA101-A: Section is closed")
+        self.assertEqual(self.registry.getStudent("S1").getSections(), ())
+        self.assertEqual(self.registry.getSection("CS101-A").getStudents(), ())
+        self.assertEqual(len(self.registry.enrollment), 0)
+        self.assertEqual(self.registry.outbox.lastSeq(), seq)
+
+
+class RaceTest(unittest.TestCase):
+    CAPACITY = 10
+    ROUNDS = 1500
+
+    def test_single_enrolls_and_checkouts_never_oversell(self):
+        registry = Registry()
+        registry.addCourse("CS100", "Intro", 4)
+        registry.addCourse("CS101", "Programming", 4, ["CS100"])
+        registry.addCourse("MA101", "Calculus", 4)
+        registry.addSection("CS100", "CS100-A", "Friday", "9:00 AM", "Room 3", 100)
+        registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", self.CAPACITY)
+        registry.addSection("MA101", "MA101-A", "Tuesday", "9:00 AM", "Room 2", 100)
+        students = []
+        for i in range(4 * self.CAPACITY):
+            students.append(registry.addStudent(f"Student {i}", f"S{i:03d}", "CS", "BSc"))
+            # a prerequisite to check widens the window between the seat check and taking the seat
+            registry.enroll(f"S{i:03d}", "CS100-A")
+            registry.postGrade(f"S{i:03d}", "CS100-A", "8")
+        section, other = registry.getSection("CS101-A"), registry.getSection("MA101-A")
+
+        # switch threads as often as the interpreter allows, so the check-then-enroll windows are hit
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        start = threading.Barrier(len(students))
+        oversold = []
+
+        # the model level, below the Registry's write lock: only the section locks keep these apart
+        def single(student):
+            start.wait()
+            for _ in range(self.ROUNDS):
+                if section.enroll(student)[0]:
+                    oversold.append(section.getEnrolledCount() > self.CAPACITY)
+                    section.drop(student)
+
+        def checkout(student):
+            start.wait()
+            for _ in range(self.ROUNDS):
+                cart = RegistrationCart(student)
+                cart.add(section)
+                cart.add(other)
+                if cart.checkout()[0]:
+                    oversold.append(section.getEnrolledCount() > self.CAPACITY)
+                    section.drop(student)
+                    other.drop(student)
+
+        threads = [threading.Thread(target=single if i % 2 else checkout, args=(student,))
+                   for i, student in enumerate(students)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(oversold)
+        self.assertFalse(any(oversold))
+        # every enroll was undone, so lost updates would show up as leftovers on either side
+        self.assertEqual(section.getStudents(), ())
+        self.assertEqual(other.getStudents(), ())
+        self.assertEqual([s.ssn for s in students if section in s.getSections() or other in s.getSections()], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""`import srs` must stay cheap: standard library only, and nothing heavy from it.
+
+    python -m unittest discover -s tests      (from HCMUS/OOP)
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that only some features need; srs must import them where they are used
+HEAVY = ["streamlit", "pandas", "numpy", "scipy", "pyarrow", "asyncio", "concurrent.futures",
+         "http.server", "urllib.request", "multiprocessing"]
+
+# a cold import takes about 50 ms on a developer machine; the budget leaves room for slow CI
+BUDGET = 0.25
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import srs
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def _coldImport() -> dict:
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+class ImportTest(unittest.TestCase):
+    def test_no_heavy_modules(self):
+        self.assertEqual(_coldImport()["loaded"], [])
+
+    def test_time_budget(self):
+        # best of three, so one slow start on a busy machine does not fail the build
+        elapsed = min(_coldImport()["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, BUDGET, f"import srs took {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Registry mutations keep the derived indexes in step with the model."""
+import unittest
+
+from srs import CourseSystemException, Registry
+
+
+class RegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.registry.addCourse("CS101", "Programming", 4)
+        self.registry.addCourse("CS201", "Data Structures", 4)
+        self.registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", 30)
+        self.registry.addSection("CS201", "CS201-A", "Tuesday", "9:00 AM", "Room 1", 30)
+        self.registry.addStudent("Alice", "S1", "CS", "BSc")
+        self.registry.addStudent("Bob", "S2", "CS", "BSc")
+        self.registry.enroll("S1", "CS101-A")
+        self.registry.postGrade("S1", "CS101-A", "8")
+
+    def test_added_prerequisite_updates_eligibility(self):
+        course = self.registry.getCourse("CS201")
+        self.assertEqual(self.registry.eligibility.countEligible(course), 2)
+
+        self.registry.addPrerequisite("CS201", "CS101")
+        self.assertEqual([s.ssn for s in self.registry.eligibility.eligibleStudents(course)], ["S1"])
+        success, _ = self.registry.enroll("S2", "CS201-A")
+        self.assertFalse(success)
+
+    def test_post_grade_rejects_grades_that_are_not_0_to_10(self):
+        for grade in ("A+", "", "11", "-1", None):
+            with self.assertRaises(CourseSystemException):
+                self.registry.postGrade("S1", "CS101-A", grade)
+        entry = self.registry.getStudent("S1").getTranscript().getEntries()["CS101"]
+        self.assertEqual(entry.getGrade(), "8")
+
+    def test_apply_schedule_moves_sections_and_records_events(self):
+        seq = self.registry.outbox.lastSeq()
+        self.registry.applySchedule({"CS101-A": ("Friday", "1:00 PM", "Room 9")})
+        section = self.registry.getSection("CS101-A")
+        self.assertEqual((section.getDayOfWeek(), section.getTimeOfDay(), section.getRoom()),
+                         ("Friday", "1:00 PM", "Room 9"))
+        self.assertEqual([e.kind for e in self.registry.outbox.after(seq)], ["section_rescheduled"])
+
+    def test_apply_schedule_is_all_or_nothing(self):
+        with self.assertRaises(CourseSystemException):
+            self.registry.applySchedule({"CS101-A": ("Friday", "1:00 PM", "Room 9"),
+                                         "NOPE": ("Friday", "2:00 PM", "Room 9")})
+        self.assertEqual(self.registry.getSection("CS101-A").getDayOfWeek(), "Monday")
+
+    def test_prerequisite_cycle_is_rejected(self):
+        self.registry.addPrerequisite("CS201", "CS101")
+        with self.assertRaises(CourseSystemException):
+            self.registry.addPrerequisite("CS101", "CS201")
+        with self.assertRaises(CourseSystemException):
+            self.registry.addPrerequisite("CS101", "CS101")
+        self.assertEqual(self.registry.getCourse("CS101").getPrerequisites(), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
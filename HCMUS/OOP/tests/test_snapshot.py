@@ -0,0 +1,39 @@
+"""Registry.snapshot() reuses views only for objects that did not change."""
+import unittest
+
+from srs import Registry
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.registry.addCourse("CS101", "Programming", 4)
+        self.registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", 30)
+        self.registry.addStudent("Alice", "S1", "CS", "BSc")
+
+    def test_deleted_and_readded_student_is_not_reused(self):
+        self.registry.snapshot()
+        self.registry.deleteStudent("S1")
+        self.registry.addStudent("Bob", "S1", "Math", "BSc")
+        self.assertEqual(self.registry.snapshot().students["S1"].name, "Bob")
+
+    def test_deleted_and_readded_section_is_not_reused(self):
+        self.registry.snapshot()
+        self.registry.deleteSection("CS101-A")
+        self.registry.addSection("CS101", "CS101-A", "Friday", "1:00 PM", "Room 9", 10)
+        view = self.registry.snapshot().sections["CS101-A"]
+        self.assertEqual((view.getDayOfWeek(), view.getRoom(), view.getCapacity()), ("Friday", "Room 9", 10))
+
+    def test_unchanged_views_are_reused(self):
+        self.registry.addStudent("Carol", "S2", "CS", "BSc")
+        before = self.registry.snapshot()
+        self.registry.enroll("S1", "CS101-A")
+        after = self.registry.snapshot()
+        self.assertIs(after.students["S2"], before.students["S2"])
+        self.assertIsNot(after.students["S1"], before.students["S1"])
+        self.assertEqual(after.sections["CS101-A"].getEnrolledCount(), 1)
+        self.assertEqual(before.sections["CS101-A"].getEnrolledCount(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""dumpRegistry/loadRegistry keep what a batch job leaves behind."""
+import io
+import unittest
+
+from srs import Registry
+from srs.storage import dumpRegistry, loadRegistry
+
+
+def _roundTrip(registry: Registry) -> Registry:
+    buffer = io.StringIO()
+    dumpRegistry(registry, buffer)
+    buffer.seek(0)
+    return loadRegistry(buffer)
+
+
+class StorageTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.registry.addCourse("CS101", "Programming", 4)
+        self.registry.addSection("CS101", "CS101-A", "Monday", "9:00 AM", "Room 1", 30)
+        self.registry.addStudent("Alice", "S1", "CS", "BSc")
+        self.registry.addStudent("Bob", "S2", "CS", "BSc")
+
+    def test_restore_keeps_enrollments_a_regrade_no_longer_allows(self):
+        self.registry.addCourse("CS201", "Data Structures", 4, ["CS101"])
+        self.registry.addSection("CS201", "CS201-A", "Tuesday", "9:00 AM", "Room 1", 1)
+        self.registry.enroll("S1", "CS101-A")
+        self.registry.postGrade("S1", "CS101-A", "8")
+        self.registry.enroll("S1", "CS201-A")
+        self.registry.postGrade("S1", "CS101-A", "3")     # regraded below the pass mark after enrolling
+
+        restored = _roundTrip(self.registry)
+        section = restored.getSection("CS201-A")
+        self.assertEqual([s.ssn for s in section.getStudents()], ["S1"])
+        self.assertIn(section, restored.getStudent("S1").getSections())
+        self.assertEqual(len(restored.enrollment), len(self.registry.enrollment))
+
+    def test_undelivered_events_survive_a_restart(self):
+        self.registry.enroll("S1", "CS101-A")
+        self.registry.enroll("S2", "CS101-A")
+        self.registry.outbox.trim(1)    # the first one was delivered
+
+        restored = _roundTrip(self.registry)
+        self.assertEqual([(e.seq, e.kind, e.ssn, e.payload) for e in restored.outbox.pending()],
+                         [(2, "enrolled", "S2", {"sectionNo": "CS101-A"})])
+        # numbering carries on, so consumers never see a sequence number twice
+        self.assertEqual(restored.outbox.record("dropped", "S2").seq, 3)
+
+    def test_numbering_resumes_when_everything_was_delivered(self):
+        self.registry.enroll("S1", "CS101-A")
+        self.registry.outbox.trim(self.registry.outbox.lastSeq())
+
+        restored = _roundTrip(self.registry)
+        self.assertEqual(len(restored.outbox), 0)
+        self.assertEqual(restored.outbox.after(0), [])
+        self.assertEqual(restored.outbox.record("dropped", "S1").seq, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()